@@ -1,8 +1,11 @@
 import argparse
+import os
 import sys
+import tempfile
 import yaml
 from pathlib import Path
 from tzMCP.gui_bits.config_manager import ConfigManager, Config
+from tzMCP.paths import config_dir
 
 def parse_args():
     parser = argparse.ArgumentParser(description="tzMCP CLI Media Proxy")
@@ -24,7 +27,12 @@ def parse_args():
     parser.add_argument('--log-to-file', action='store_true', help='Enable file logging')
     parser.add_argument('--log-level', type=str, choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], help='Set log level')
     parser.add_argument('--dedup', action='store_true', help='Enable persistent deduplication')
+    parser.add_argument('--shared-dedup', action='store_true', help='Share one dedup index with every proxy saving to the same save dir')
     parser.add_argument('--no-auto-reload', dest='auto_reload', action='store_false', help='Disable config auto-reload')
+    parser.add_argument('--tls-passthrough', action='store_true', help='Tunnel blocked and never-productive hosts without TLS interception')
+    parser.add_argument('--serve-from-archive', action='store_true', help='Answer fresh repeat requests from already saved files')
+    parser.add_argument('--write-rate', type=float, help='Limit disk writes of saved media to this many MB/s (0 = unlimited)')
+    parser.add_argument('--domain-write-rate', type=float, help='Limit disk writes per source domain to this many MB/s (0 = unlimited)')
 
     return parser.parse_args()
 
@@ -63,11 +71,36 @@ def build_config(args) -> Config:
         config.log_level = args.log_level
     if args.dedup:
         config.enable_persistent_dedup = True
+    if args.shared_dedup:
+        config.shared_dedup = True
     if args.auto_reload is not None:
         config.auto_reload_config = args.auto_reload
+    if args.tls_passthrough:
+        config.tls_passthrough["enabled"] = True
+    if args.serve_from_archive:
+        config.serve_from_archive = True
+    if args.write_rate is not None:
+        config.write_rate_limit["global_mb_s"] = args.write_rate
+        config.write_rate_limit["enabled"] = True
+    if args.domain_write_rate is not None:
+        config.write_rate_limit["domain_mb_s"] = args.domain_write_rate
+        config.write_rate_limit["enabled"] = True
 
     return config
 
+def write_session_config(config: Config) -> Path:
+    """Write the merged config (file plus flags) to a private YAML file for the addon.
+
+    The addon loads its config from YAML in running(), so flags applied only
+    to this process's config would never reach it.
+    """
+    config_dir().mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(prefix="cli-session-", suffix=".yaml", dir=config_dir())
+    os.close(fd)
+    path = Path(name)
+    ConfigManager(path).save_config(config)
+    return path
+
 def main():
     args = parse_args()
     config = build_config(args)
@@ -76,15 +109,21 @@ def main():
     from tzMCP.save_media_utils import config_provider
     config_provider.set_config(config)
 
-    # Start mitmdump with this config
-    from tzMCP.save_media import MediaSaver
+    # Start mitmdump with this config.  The addon module is loaded once, by
+    # mitmdump itself via -s; importing it here would initialise it twice.
     from mitmproxy.tools.main import mitmdump
-    # This will behave like mitmproxy's -s entry point:
-    mitmdump([
-        "--listen-host", "127.0.0.1",
-        "--listen-port", str(config.proxy_port),
-        "-s", str(Path(__file__).parent / "save_media.py"),
-    ])
+    from tzMCP.save_media import CONFIG_OPTION
+    session = write_session_config(config)
+    try:
+        # This will behave like mitmproxy's -s entry point:
+        mitmdump([
+            "--listen-host", "127.0.0.1",
+            "--listen-port", str(config.proxy_port),
+            "-s", str(Path(__file__).parent / "save_media.py"),
+            "--set", f"{CONFIG_OPTION}={session}",
+        ])
+    finally:
+        session.unlink(missing_ok=True)
 
 if __name__ == "__main__":
     main()
@@ -3,7 +3,6 @@ import logging
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from threading import Thread
-import requests
 from tzMCP.save_media_utils.config_provider import get_config
 from tzMCP.paths import logs_dir
 
@@ -14,6 +13,8 @@ log_gui = logging.getLogger("tzMCP.gui")
 
 def send_log_to_gui(entry):
     def _post():
+        # requests is slow to import; defer it to the first GUI log post.
+        import requests  # pylint: disable=import-outside-toplevel
         try:
             requests.post("http://localhost:5001", json=entry, timeout=0.1)
         except requests.exceptions.RequestException:
@@ -7,6 +7,7 @@ from tzMCP.gui_bits.proxy_control import ProxyController
 from tzMCP.gui_bits.proxy_tab import ProxyTab
 from tzMCP.gui_bits.browser_tab import BrowserTab
 from tzMCP.gui_bits.config_tab import ConfigTab
+from tzMCP.gui_bits.gallery_tab import GalleryTab
 from tzMCP.gui_bits.status_bar import StatusBar
 from tzMCP.gui_bits.log_server import start_gui_log_server
 from tzMCP.gui_bits.browser_launcher import cleanup_browsers
@@ -14,7 +15,6 @@ from tzMCP.common_utils.log_config import setup_logging, log_gui
 from tzMCP.common_utils.cleanup_profiles import clean_old_profiles
 from tzMCP.common_utils.cleanup_logs import clean_old_logs
 from tzMCP.paths import config_dir, logs_dir, profiles_dir
-setup_logging()
 
 class MainApp(tk.Tk):
     """Main application window, orchestrating all tabs and status bar."""
@@ -40,6 +40,7 @@ class MainApp(tk.Tk):
         self.proxy_controller = ProxyController(
             proxy_executable_path=str(Path(__file__).parent / "save_media.py"),
             proxy_port=self.config.proxy_port,
+            workers=self.config.proxy_workers,
         )
         
         # Setup the GUI http logging server
@@ -58,8 +59,9 @@ class MainApp(tk.Tk):
                 new_config = self.config_manager.load_config()
                 selected_tab.reload_config(new_config)
                 self.config = new_config
-                if self.proxy_controller.process is None:
+                if not self.proxy_controller.is_running():
                     self.proxy_controller.proxy_port = new_config.proxy_port
+                    self.proxy_controller.workers = new_config.proxy_workers
             except Exception as e:
                 log_gui.exception(
                     "Could not reload the configuration. Check the configuration values "
@@ -67,6 +69,10 @@ class MainApp(tk.Tk):
                 )
                 from tkinter import messagebox
                 messagebox.showerror("Error", f"Failed to reload config: {e}")
+        elif isinstance(selected_tab, GalleryTab):
+            self.config = self.config_manager.load_config()
+            selected_tab.set_save_dir(self.config.save_dir)
+            selected_tab.refresh()
 
     def report_callback_exception(self, exc, val, tb):
         """Report unexpected Tk callback failures to the console with a traceback."""
@@ -101,11 +107,13 @@ class MainApp(tk.Tk):
         config_tab = ConfigTab(notebook, self.config_manager, self.config)
         notebook.add(config_tab, text="Capture Rules")
         notebook.add(self.proxy_tab, text="Activity")
+        self.gallery_tab = GalleryTab(notebook, self.config.save_dir)
+        notebook.add(self.gallery_tab, text="Gallery")
 
     def _on_close(self):
         # stop the proxy if it’s still running and log it
         try:
-            if self.proxy_controller.process and self.proxy_controller.process.poll() is None:
+            if self.proxy_controller.is_running():
                 self.proxy_controller.stop_proxy()
                 self.proxy_tab.log.config(state='normal')
                 self.proxy_tab.log.insert('end', 'Proxy stopped on exit.\n')
@@ -113,12 +121,14 @@ class MainApp(tk.Tk):
         except Exception:
             pass
         cleanup_browsers()
+        self.gallery_tab.close()
         self.destroy()
 
     def run(self):
         self.mainloop()
 
 def main():
+    setup_logging()
     try:
         MainApp().run()
     except Exception:
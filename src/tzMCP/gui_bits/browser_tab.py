@@ -7,6 +7,7 @@ from tzMCP.paths import config_dir
 from tzMCP.common_utils.log_config import log_gui
 
 CONFIG_PATH = config_dir() / "browser_paths.yaml"
+POOL_STATS_INTERVAL_MS = 2000
 
 class BrowserTab(ttk.Frame):
     """Guided, safety-first capture session setup and browser launcher."""
@@ -109,6 +110,7 @@ class BrowserTab(ttk.Frame):
             if self.status_bar:
                 self.status_bar.set_state("running")
             self._append_activity("Proxy started successfully.")
+            self._refresh_pool_stats()
             self._update_launch_state()
         except Exception as exc:  # pylint: disable=broad-exception-caught
             log_gui.exception("Could not start the capture proxy.")
@@ -125,14 +127,26 @@ class BrowserTab(ttk.Frame):
             self.proxy_state.config(text="Stopped — start this before launching a browser.")
             if self.status_bar:
                 self.status_bar.set_state("stopped")
+                self.status_bar.set_detail("")
             self._append_activity("Proxy stopped successfully.")
             self._update_launch_state()
         except Exception as exc:  # pylint: disable=broad-exception-caught
             log_gui.exception("Could not stop the capture proxy.")
             self._append_activity(f"Failed to stop proxy: {exc}", "red")
 
+    def _refresh_pool_stats(self):
+        """Show aggregated worker-pool counters in the status bar while the pool runs."""
+        stats = self.proxy_controller.stats()
+        if not stats or not self.status_bar:
+            return
+        self.status_bar.set_detail(
+            f"{stats['healthy']}/{stats['workers']} workers healthy, "
+            f"{stats['active']} open / {stats['total']} connections, {stats['restarts']} restarts"
+        )
+        self.after(POOL_STATS_INTERVAL_MS, self._refresh_pool_stats)
+
     def _update_launch_state(self):
-        proxy_running = self.proxy_controller.process is not None and self.proxy_controller.process.poll() is None
+        proxy_running = self.proxy_controller.is_running()
         self.launch_btn.config(state="normal" if self.safe_browser_acknowledged.get() and proxy_running else "disabled")
 
     def _load_browser_paths(self):
@@ -2,13 +2,20 @@ from pathlib import Path
 from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Any, Optional
 import yaml
-from tzMCP.save_media_utils.mime_categories import MIME_GROUPS
+from tzMCP.save_media_utils.mime_categories import MIME_GROUP_NAMES
 from tzMCP.paths import data_dir, config_dir
 
+MAX_PROXY_WORKERS = 32
+MAX_DEDUP_SHARDS = 64
+DURABILITY_MODES = ("none", "batched", "strict")
+OVER_BUDGET_MODES = ("spill", "passthrough")
+EVICT_MODES = ("age", "lru", "none")
+
 
 @dataclass
 class Config:
     proxy_port: int = 8888
+    proxy_workers: int = 1
     save_dir: Path = field(default_factory=lambda: data_dir() / "cache")
     allowed_mime_groups: list[str] = field(default_factory=list)
     whitelist: List[str] = field(default_factory=list)
@@ -28,7 +35,73 @@ class Config:
     log_to_file: bool = False
     log_level: str = "INFO"
     enable_persistent_dedup: bool = False
+    shared_dedup: bool = False
+    dedup_shards: int = 1
+    dedup_retention: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": False,
+        "max_age_days": 365,
+        "max_rows": 0,
+        "by": "last_seen"
+    })
     auto_reload_config: bool = True
+    tls_passthrough: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": False,
+        "min_flows": 25,
+        "reprobe_hours": 24
+    })
+    serve_from_archive: bool = False
+    media_catalog: bool = True
+    pack_storage: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": False,
+        "max_object_kb": 256,
+        "segment_mb": 1024
+    })
+    save_queue: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": False,
+        "spool": False
+    })
+    durability: Dict[str, Any] = field(default_factory=lambda: {
+        "mode": "none",
+        "batch_files": 64,
+        "batch_ms": 200
+    })
+    memory_budget: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": True,
+        "max_mb": 512,
+        "large_mb": 8,
+        "over_budget": "spill"
+    })
+    save_scheduler: Dict[str, Any] = field(default_factory=lambda: {
+        "quantum_kb": 1024,
+        "classes": [
+            {"name": "small_images", "groups": ["image"], "max_kb": 512, "weight": 8},
+            {"name": "images", "groups": ["image"], "max_kb": 0, "weight": 4},
+            {"name": "video_audio", "groups": ["video", "audio"], "max_kb": 0, "weight": 1},
+            {"name": "other", "groups": [], "max_kb": 0, "weight": 2},
+        ]
+    })
+    write_rate_limit: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": False,
+        "global_mb_s": 0,
+        "domain_mb_s": 0,
+        "burst_s": 1.0
+    })
+    storage_quota: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": False,
+        "max_gb": 0,
+        "max_percent": 0,
+        "min_free_mb": 1024,
+        "evict": "age"
+    })
+    overload: Dict[str, Any] = field(default_factory=lambda: {
+        "enabled": False,
+        "queue_mb": 256,
+        "queue_files": 1000,
+        "degrade_at": 0.5,
+        "passthrough_at": 1.0,
+        "shed_mime_groups": ["video", "audio"],
+        "skip_stages": ["pixel_dimensions"]
+    })
 
 
 class ConfigManager:
@@ -55,6 +128,18 @@ class ConfigManager:
         if not 1 <= config.proxy_port <= 65535:
             raise ValueError("Invalid proxy_port: must be an integer from 1 to 65535")
 
+        # Worker pool size: one mitmdump per core is the useful ceiling.
+        try:
+            config.proxy_workers = min(MAX_PROXY_WORKERS, max(1, int(config.proxy_workers)))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid proxy_workers: must be an integer from 1 to {MAX_PROXY_WORKERS}") from exc
+
+        # Dedup shards: 1 keeps every digest in the main database file.
+        try:
+            config.dedup_shards = min(MAX_DEDUP_SHARDS, max(1, int(config.dedup_shards)))
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid dedup_shards: must be an integer from 1 to {MAX_DEDUP_SHARDS}") from exc
+
         # Ensure save_dir is absolute and writable
         if not config.save_dir.is_absolute():
             config.save_dir = config.save_dir.resolve()
@@ -65,7 +150,7 @@ class ConfigManager:
 
         # Validate MIME groups
         before = set(config.allowed_mime_groups)
-        config.allowed_mime_groups = [g for g in before if g in MIME_GROUPS]
+        config.allowed_mime_groups = [g for g in before if g in MIME_GROUP_NAMES]
         dropped = before - set(config.allowed_mime_groups)
         if dropped:
             msg = f"Ignored invalid MIME groups in config: {', '.join(sorted(dropped))}"
@@ -85,6 +170,92 @@ class ConfigManager:
         fpd["max_width"] = max(fpd["min_width"], fpd["max_width"])
         fpd["max_height"] = max(fpd["min_height"], fpd["max_height"])
 
+        # TLS passthrough: a host needs at least one rejected flow to qualify
+        tls = config.tls_passthrough
+        tls["enabled"] = bool(tls.get("enabled", False))
+        tls["min_flows"] = max(1, int(tls.get("min_flows", 25)))
+        tls["reprobe_hours"] = max(0.0, float(tls.get("reprobe_hours", 24)))
+
+        # Dedup retention: 0 disables a limit; "by" picks LRU or FIFO expiry
+        ret = config.dedup_retention
+        ret["enabled"] = bool(ret.get("enabled", False))
+        ret["max_age_days"] = max(0.0, float(ret.get("max_age_days", 0)))
+        ret["max_rows"] = max(0, int(ret.get("max_rows", 0)))
+        if ret.get("by") not in ("last_seen", "first_seen"):
+            ret["by"] = "last_seen"
+
+        # Pack storage: objects up to max_object_kb go into segments of segment_mb
+        packs = config.pack_storage
+        packs["enabled"] = bool(packs.get("enabled", False))
+        packs["max_object_kb"] = max(1, int(packs.get("max_object_kb", 256)))
+        packs["segment_mb"] = max(1, int(packs.get("segment_mb", 1024)))
+
+        # Save queue: write on a background thread, journaled in save_dir/.spool.
+        # Unjournaled queued saves die with a killed worker, so the queue follows the spool unless set.
+        sq = config.save_queue
+        sq["spool"] = bool(sq.get("spool", False))
+        sq["enabled"] = bool(sq.get("enabled", sq["spool"]))
+
+        # Durability: none | batched (group fsync every batch_files or batch_ms) | strict
+        dur = config.durability
+        dur["mode"] = str(dur.get("mode", "none")).lower()
+        if dur["mode"] not in DURABILITY_MODES:
+            dur["mode"] = "none"
+        dur["batch_files"] = max(1, int(dur.get("batch_files", 64)))
+        dur["batch_ms"] = max(1, int(dur.get("batch_ms", 200)))
+
+        # Memory budget: in-flight and queued bodies share max_mb; large bodies over it spill or pass through
+        mem = config.memory_budget
+        mem["enabled"] = bool(mem.get("enabled", True))
+        mem["max_mb"] = max(1, int(mem.get("max_mb", 512)))
+        mem["large_mb"] = max(1, int(mem.get("large_mb", 8)))
+        mem.pop("unknown_length_mb", None)     # Unknown-length bodies are now metered chunk by chunk.
+        mem["over_budget"] = str(mem.get("over_budget", "spill")).lower()
+        if mem["over_budget"] not in OVER_BUDGET_MODES:
+            mem["over_budget"] = "spill"
+
+        # Save scheduler: first matching class wins; weights share disk bandwidth, domains share a class equally
+        sched = config.save_scheduler
+        sched["quantum_kb"] = max(1, int(sched.get("quantum_kb", 1024)))
+        classes = []
+        for i, cls in enumerate(sched.get("classes") or []):
+            if not isinstance(cls, dict):
+                continue
+            classes.append({
+                "name": str(cls.get("name") or f"class{i}"),
+                "groups": [g for g in cls.get("groups") or [] if g in MIME_GROUP_NAMES],
+                "max_kb": max(0, int(cls.get("max_kb", 0))),
+                "weight": max(1, int(cls.get("weight", 1))),
+            })
+        sched["classes"] = classes or Config().save_scheduler["classes"]
+
+        # Write rate limit: token buckets in MB/s for all saves and per source domain (0 = unlimited)
+        rate = config.write_rate_limit
+        rate["enabled"] = bool(rate.get("enabled", False))
+        rate["global_mb_s"] = max(0.0, float(rate.get("global_mb_s", 0)))
+        rate["domain_mb_s"] = max(0.0, float(rate.get("domain_mb_s", 0)))
+        rate["burst_s"] = max(0.1, float(rate.get("burst_s", 1.0)))
+
+        # Storage quota: max_gb and/or max_percent of the disk (0 = none), evicting by age | lru | none
+        quota = config.storage_quota
+        quota["enabled"] = bool(quota.get("enabled", False))
+        quota["max_gb"] = max(0.0, float(quota.get("max_gb", 0)))
+        quota["max_percent"] = min(max(0.0, float(quota.get("max_percent", 0))), 100.0)
+        quota["min_free_mb"] = max(0, int(quota.get("min_free_mb", 1024)))
+        quota["evict"] = str(quota.get("evict", "age")).lower()
+        if quota["evict"] not in EVICT_MODES:
+            quota["evict"] = "age"
+
+        # Overload: degrade at degrade_at of queue/memory capacity, pass everything through at passthrough_at
+        ovl = config.overload
+        ovl["enabled"] = bool(ovl.get("enabled", False))
+        ovl["queue_mb"] = max(1, int(ovl.get("queue_mb", 256)))
+        ovl["queue_files"] = max(1, int(ovl.get("queue_files", 1000)))
+        ovl["degrade_at"] = min(max(0.01, float(ovl.get("degrade_at", 0.5))), 1.0)
+        ovl["passthrough_at"] = max(ovl["degrade_at"], float(ovl.get("passthrough_at", 1.0)))
+        ovl["shed_mime_groups"] = [g for g in ovl.get("shed_mime_groups", ["video", "audio"]) if g in MIME_GROUP_NAMES]
+        ovl["skip_stages"] = [str(s) for s in ovl.get("skip_stages", ["pixel_dimensions"])]
+
         # Log level normalization
         config.log_level = config.log_level.upper()
         if config.log_level not in ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]:
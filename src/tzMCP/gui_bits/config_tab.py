@@ -1,13 +1,13 @@
 # pylint: disable=line-too-long
 import tkinter as tk
+from dataclasses import replace
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
-from tzMCP.gui_bits.config_manager import ConfigManager, Config, MIME_GROUPS
+from tzMCP.gui_bits.config_manager import ConfigManager, Config, MIME_GROUP_NAMES, MAX_PROXY_WORKERS
 from tzMCP.paths import logs_dir, profiles_dir
 from tzMCP.common_utils.cleanup_logs import clean_old_logs
 from tzMCP.common_utils.cleanup_profiles import clean_old_profiles
-from tzMCP.common_utils.log_config import setup_logging, log_gui
-setup_logging()
+from tzMCP.common_utils.log_config import log_gui
 
 class ConfigTab(ttk.Frame):     # pylint: disable=too-many-ancestors,too-many-instance-attributes
     """Config tab for the GUI."""
@@ -34,11 +34,16 @@ class ConfigTab(ttk.Frame):     # pylint: disable=too-many-ancestors,too-many-in
         tk.Label(proxy_frame, text="Proxy Port:").grid(row=1, column=0, sticky='w', padx=5, pady=2)
         self.proxy_port = tk.IntVar(value=self.config.proxy_port)
         tk.Entry(proxy_frame, textvariable=self.proxy_port, width=10).grid(row=1, column=1, sticky='w', padx=5, pady=2)
+        workers_frame = ttk.Frame(proxy_frame)
+        workers_frame.grid(row=1, column=2, sticky='w', padx=5, pady=2)
+        tk.Label(workers_frame, text="Workers:").grid(row=0, column=0, padx=2)
+        self.proxy_workers = tk.IntVar(value=self.config.proxy_workers)
+        tk.Spinbox(workers_frame, from_=1, to=MAX_PROXY_WORKERS, textvariable=self.proxy_workers, width=4).grid(row=0, column=1, padx=2)
 
         tk.Label(proxy_frame, text="Allowed MIME Groups:").grid(row=2, column=0, sticky='nw', padx=5, pady=2)
         mime_frame = ttk.Frame(proxy_frame)
         mime_frame.grid(row=2, column=1, columnspan=2, sticky='ew', padx=5, pady=2)
-        for i, group in enumerate(MIME_GROUPS.keys()):
+        for i, group in enumerate(MIME_GROUP_NAMES):
             var = tk.BooleanVar(value=group in self.config.allowed_mime_groups)
             cb = tk.Checkbutton(mime_frame, text=group.capitalize(), variable=var)
             cb.grid(row=0, column=i, sticky='w')
@@ -97,8 +102,14 @@ class ConfigTab(ttk.Frame):     # pylint: disable=too-many-ancestors,too-many-in
         flag_frame.grid(row=2, column=0, columnspan=3, sticky="ew", padx=10, pady=10)
         self.auto_reload_config = tk.BooleanVar(value=self.config.auto_reload_config)
         self.enable_persistent_dedup = tk.BooleanVar(value=self.config.enable_persistent_dedup)
+        self.tls_passthrough = tk.BooleanVar(value=self.config.tls_passthrough.get("enabled", False))
         tk.Checkbutton(flag_frame, text="Auto Reload Config", variable=self.auto_reload_config).grid(row=0, column=0, sticky='w', padx=5)
         tk.Checkbutton(flag_frame, text="Enable Persistent Deduplication", variable=self.enable_persistent_dedup).grid(row=0, column=1, sticky='w', padx=5)
+        self.serve_from_archive = tk.BooleanVar(value=self.config.serve_from_archive)
+        tk.Checkbutton(flag_frame, text="Skip Decrypting Hosts That Never Yield Media", variable=self.tls_passthrough).grid(row=1, column=0, sticky='w', padx=5)
+        tk.Checkbutton(flag_frame, text="Answer Repeat Requests From Saved Files", variable=self.serve_from_archive).grid(row=1, column=1, sticky='w', padx=5)
+        self.shared_dedup = tk.BooleanVar(value=self.config.shared_dedup)
+        tk.Checkbutton(flag_frame, text="Share Deduplication With Other Proxies Using This Save Dir", variable=self.shared_dedup).grid(row=2, column=0, columnspan=2, sticky='w', padx=5)
 
         # -------------------------
         # Save and Manual Cleanup
@@ -135,6 +146,7 @@ class ConfigTab(ttk.Frame):     # pylint: disable=too-many-ancestors,too-many-in
         self.config = config
         self.save_dir_var.set(str(config.save_dir))
         self.proxy_port.set(config.proxy_port)
+        self.proxy_workers.set(config.proxy_workers)
         for group, var in self.mime_group_vars.items():
             var.set(group in config.allowed_mime_groups)
         self.whitelist_box.delete("1.0", tk.END)
@@ -151,13 +163,19 @@ class ConfigTab(ttk.Frame):     # pylint: disable=too-many-ancestors,too-many-in
         self.log_level.set(config.log_level)
         self.auto_reload_config.set(config.auto_reload_config)
         self.enable_persistent_dedup.set(config.enable_persistent_dedup)
+        self.tls_passthrough.set(config.tls_passthrough.get("enabled", False))
+        self.serve_from_archive.set(config.serve_from_archive)
+        self.shared_dedup.set(config.shared_dedup)
 
     def _save(self):
         """Save the config"""
         try:
             selected_mime_groups = [group for group, var in self.mime_group_vars.items() if var.get()]
-            new_cfg = Config(
+            # Start from the loaded config so settings without a widget survive a save.
+            new_cfg = replace(
+                self.config,
                 proxy_port=self.proxy_port.get(),
+                proxy_workers=self.proxy_workers.get(),
                 save_dir=Path(self.save_dir_var.get()),
                 whitelist=[line.strip() for line in self.whitelist_box.get("1.0", tk.END).splitlines() if line.strip()],
                 blacklist=[line.strip() for line in self.blacklist_box.get("1.0", tk.END).splitlines() if line.strip()],
@@ -177,7 +195,10 @@ class ConfigTab(ttk.Frame):     # pylint: disable=too-many-ancestors,too-many-in
                 auto_reload_config=self.auto_reload_config.get(),
                 log_to_file=self.log_to_file.get(),
                 log_level=self.log_level.get(),
-                enable_persistent_dedup=self.enable_persistent_dedup.get()
+                enable_persistent_dedup=self.enable_persistent_dedup.get(),
+                tls_passthrough={**self.config.tls_passthrough, "enabled": self.tls_passthrough.get()},
+                serve_from_archive=self.serve_from_archive.get(),
+                shared_dedup=self.shared_dedup.get(),
             )
             self.config_manager._validate_config(new_cfg)  # pylint: disable=protected-access
             self.config_manager.save_config(new_cfg)
@@ -0,0 +1,403 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Gallery tab: browse saved media from the catalog.
+
+The grid is virtualized: only the rows inside the viewport are drawn, and
+catalog rows are fetched a page at a time as they scroll into view, so a
+catalog of hundreds of thousands of files costs the same as a few hundred.
+Catalog pages and thumbnails (from ``ThumbnailCache``) are loaded on worker
+threads and handed to Tk through a queue polled from the event loop, so the
+UI thread never waits on SQLite or the disk.
+"""
+import base64
+import mimetypes
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+from collections import OrderedDict
+from pathlib import Path
+from tkinter import ttk
+from tzMCP.common_utils.log_config import log_gui
+from tzMCP.gui_bits.thumbnails import NO_THUMBNAIL, THUMB_SIZE, ThumbnailCache, thumbnail_key
+from tzMCP.paths import thumbnails_dir
+from tzMCP.save_media_utils.pack_store import parse_ref, read_saved
+from tzMCP.save_media_utils.catalog import CATALOG_NAME, CatalogEntry, MediaCatalog, catalog_path
+
+PAGE_SIZE = 200
+MAX_PAGES = 50
+CELL_PAD = 8
+CELL_SIZE = THUMB_SIZE + CELL_PAD * 2
+POLL_MS = 30
+WHEEL_PIXELS = CELL_SIZE // 2
+TYPE_FILTERS = {"All": None, "Images": "image/", "Videos": "video/", "Audio": "audio/"}
+
+
+class CatalogPager:
+    """Random access to a filtered catalog snapshot, fetched in cached pages on a loader thread.
+
+    Pages are read by keyset on ``(saved_at, id)``, continuing from the
+    nearest page boundary already known, so a page deep in the catalog is an
+    index seek rather than an OFFSET scan.  ``entry`` never touches SQLite:
+    a page that is not cached yet is queued for the loader, which calls
+    ``on_loaded`` (from its own thread) once the page or the count is in.
+    """
+
+    def __init__(self, catalog: MediaCatalog, page_size: int = PAGE_SIZE, max_pages: int = MAX_PAGES,
+                 on_loaded=None):
+        self.catalog = catalog
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.on_loaded = on_loaded
+        self._pages: OrderedDict[int, list[CatalogEntry]] = OrderedDict()
+        self._bounds: dict[int, tuple] = {}      # Page -> key of its last row (kept when the page is dropped).
+        self._wanted: set[int] = set()
+        self._requests: queue.LifoQueue = queue.LifoQueue()   # Newest first: what is on screen now.
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._thread = threading.Thread(target=self._load_loop, name="tzMCP-gallery-pages", daemon=True)
+        self._thread.start()
+        self.set_filter()
+
+    def set_filter(self, host: str | None = None, mime: str | None = None):
+        """Apply filters and take a new snapshot (files saved later appear after the next call)."""
+        with self._lock:
+            self.host, self.mime = host or None, mime or None
+            self.until = time.time()
+            self._generation += 1
+            self._pages.clear()
+            self._bounds.clear()
+            self._wanted.clear()
+            self.count = 0
+            self.counted = False
+            self._requests.put((self._generation, None))
+
+    def entry(self, index: int) -> CatalogEntry | None:
+        """The entry at ``index``, or None while its page is loading (or past the end)."""
+        if not 0 <= index < self.count:
+            return None
+        page_no = index // self.page_size
+        with self._lock:
+            page = self._pages.get(page_no)
+            if page is None:
+                if page_no not in self._wanted:
+                    self._wanted.add(page_no)
+                    self._requests.put((self._generation, page_no))
+                return None
+            self._pages.move_to_end(page_no)
+        offset = index - page_no * self.page_size
+        return page[offset] if offset < len(page) else None
+
+    def _start_key(self, page_no: int) -> tuple | None:
+        """Key of the row just before ``page_no``, from the nearest known boundary (loader thread)."""
+        if page_no == 0:
+            return None
+        with self._lock:
+            known = max((p for p in self._bounds if p < page_no), default=-1)
+            after = self._bounds.get(known)
+        if known == page_no - 1:
+            return after
+        # Skip the unknown pages in between through the index only.
+        skip = (page_no - 1 - known) * self.page_size - 1
+        return self.catalog.key_at(self.host, self.mime, self.until, after, skip)
+
+    def _load_loop(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            generation, page_no = request
+            if generation != self._generation:
+                continue
+            try:
+                if page_no is None:
+                    result = self.catalog.count(self.host, self.mime, until=self.until)
+                else:
+                    start = self._start_key(page_no)
+                    result = self.catalog.page(self.host, self.mime, self.until, start, self.page_size)
+            except Exception:
+                log_gui.exception("Could not read the media catalog.")
+                with self._lock:
+                    self._wanted.discard(page_no)
+                continue
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                if page_no is None:
+                    self.count, self.counted = result, True
+                else:
+                    entries, last_key = result
+                    self._wanted.discard(page_no)
+                    self._pages[page_no] = entries
+                    if start is not None:
+                        self._bounds[page_no - 1] = start
+                    if last_key is not None:
+                        self._bounds[page_no] = last_key
+                    while len(self._pages) > self.max_pages:
+                        self._pages.popitem(last=False)
+            if self.on_loaded:
+                self.on_loaded()
+
+    def close(self):
+        """Stop the loader (before closing the catalog)."""
+        self._requests.put(None)
+        self._thread.join()
+
+
+def open_file(path: str, mime: str | None = None):
+    """Open ``path`` with the operating system's default application.
+
+    Packed objects are copied to a temporary file (named for ``mime``) first.
+    """
+    if parse_ref(path) is not None:
+        suffix = mimetypes.guess_extension(mime or "") or ""
+        with tempfile.NamedTemporaryFile("wb", suffix=suffix, delete=False, prefix="tzmcp-") as tmp:
+            tmp.write(read_saved(path))
+        path = tmp.name
+    if sys.platform == "win32":
+        os.startfile(path)  # pylint: disable=no-member
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+
+class GalleryTab(ttk.Frame):
+    """Virtualized thumbnail grid over the saved-media catalog."""
+
+    def __init__(self, master, save_dir: Path):
+        super().__init__(master)
+        self.save_dir = Path(save_dir)
+        self.catalog: MediaCatalog | None = None
+        self.pager: CatalogPager | None = None
+        self.thumbs = ThumbnailCache(thumbnails_dir())
+        self._results: queue.Queue = queue.Queue()
+        self._photos: dict[str, tk.PhotoImage] = {}
+        self._top = 0            # Pixel offset of the viewport into the full grid.
+        self._selected: int | None = None
+        self._redraw_pending = False
+        self.host_filter = tk.StringVar()
+        self.type_filter = tk.StringVar(value="All")
+        self._build_widgets()
+        self.after(POLL_MS, self._poll_results)
+
+    def _build_widgets(self):
+        bar = ttk.Frame(self, padding=(10, 8))
+        bar.grid(row=0, column=0, columnspan=2, sticky="ew")
+        ttk.Label(bar, text="Host:").pack(side="left")
+        host = ttk.Entry(bar, textvariable=self.host_filter, width=28)
+        host.pack(side="left", padx=(4, 12))
+        host.bind("<Return>", lambda _e: self.refresh())
+        ttk.Label(bar, text="Type:").pack(side="left")
+        types = ttk.Combobox(bar, textvariable=self.type_filter, values=list(TYPE_FILTERS),
+                             state="readonly", width=8)
+        types.pack(side="left", padx=(4, 12))
+        types.bind("<<ComboboxSelected>>", lambda _e: self.refresh())
+        ttk.Button(bar, text="Refresh", command=self.refresh).pack(side="left")
+        self.count_label = ttk.Label(bar, text="")
+        self.count_label.pack(side="right")
+
+        self.canvas = tk.Canvas(self, background="#20242a", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.detail = ttk.Label(self, text="", anchor="w", padding=(10, 4))
+        self.detail.grid(row=2, column=0, columnspan=2, sticky="ew")
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda _e: self._schedule_redraw())
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_pixels(-WHEEL_PIXELS if e.delta > 0 else WHEEL_PIXELS))
+        self.canvas.bind("<Button-4>", lambda _e: self._scroll_pixels(-WHEEL_PIXELS))
+        self.canvas.bind("<Button-5>", lambda _e: self._scroll_pixels(WHEEL_PIXELS))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Double-Button-1>", self._on_double_click)
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+    def set_save_dir(self, save_dir: Path):
+        """Point the gallery at another save directory (reopens the catalog on next refresh)."""
+        if Path(save_dir) != self.save_dir:
+            self._close_catalog()
+            self.save_dir = Path(save_dir)
+
+    def refresh(self):
+        """(Re)load the catalog snapshot with the current filters."""
+        if self.catalog is None:
+            if not self.save_dir.is_dir():
+                self.count_label.config(text=f"Nothing saved yet in {self.save_dir}")
+                return
+            try:
+                self.catalog = MediaCatalog(catalog_path(self.save_dir))
+                self.pager = CatalogPager(self.catalog, on_loaded=lambda: self._results.put(None))
+            except Exception as e:
+                log_gui.exception(f"Could not open the media catalog {CATALOG_NAME} in {self.save_dir}.")
+                self.count_label.config(text=f"Catalog unavailable: {e}")
+                return
+        self.pager.set_filter(self.host_filter.get().strip(), TYPE_FILTERS.get(self.type_filter.get()))
+        self.count_label.config(text="Counting…")
+        self._top = 0
+        self._selected = None
+        self.detail.config(text="")
+        self._schedule_redraw()
+
+    def _close_catalog(self):
+        if self.pager is not None:
+            self.pager.close()
+        if self.catalog is not None:
+            self.catalog.close()
+        self.catalog = self.pager = None
+
+    def close(self):
+        self._close_catalog()
+        self.thumbs.close()
+
+    # ------------------------------------------------------------------
+    # Geometry and scrolling
+    # ------------------------------------------------------------------
+    def _columns(self) -> int:
+        return max(1, self.canvas.winfo_width() // CELL_SIZE)
+
+    def _content_height(self) -> int:
+        count = self.pager.count if self.pager else 0
+        return -(-count // self._columns()) * CELL_SIZE
+
+    def _clamp_top(self, top: int) -> int:
+        return max(0, min(top, self._content_height() - self.canvas.winfo_height()))
+
+    def _scroll_pixels(self, delta: int):
+        self._top = self._clamp_top(self._top + delta)
+        self._schedule_redraw()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._top = self._clamp_top(int(float(amount) * self._content_height()))
+        elif unit == "pages":
+            self._top = self._clamp_top(self._top + int(amount) * self.canvas.winfo_height())
+        else:
+            self._top = self._clamp_top(self._top + int(amount) * CELL_SIZE)
+        self._schedule_redraw()
+
+    def _index_at(self, x: int, y: int) -> int | None:
+        col = x // CELL_SIZE
+        if col >= self._columns():
+            return None
+        index = (self._top + y) // CELL_SIZE * self._columns() + col
+        return index if self.pager and index < self.pager.count else None
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+    def _schedule_redraw(self):
+        # Coalesce bursts of scroll events and thumbnail arrivals into one redraw.
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        self.canvas.delete("cell")
+        height = max(1, self._content_height())
+        view = self.canvas.winfo_height()
+        self.scrollbar.set(self._top / height, min(1.0, (self._top + view) / height))
+        if not self.pager:
+            return
+
+        columns = self._columns()
+        first_row = self._top // CELL_SIZE
+        last_row = (self._top + view) // CELL_SIZE
+        visible = {}
+        for row in range(first_row, last_row + 1):
+            for col in range(columns):
+                index = row * columns + col
+                if index >= self.pager.count:
+                    break
+                x, y = col * CELL_SIZE, row * CELL_SIZE - self._top
+                entry = self.pager.entry(index)
+                if entry is None:
+                    self._draw_placeholder(x, y, "…")    # Its page is still loading.
+                else:
+                    visible[self._draw_cell(index, entry, x, y)] = entry
+
+        # Forget images and queued renders for cells that scrolled away.
+        for key in list(self._photos):
+            if key not in visible:
+                del self._photos[key]
+        self.thumbs.cancel_except(visible)
+
+    def _draw_cell(self, index: int, entry: CatalogEntry, x: int, y: int) -> str:
+        key = thumbnail_key(entry.digest, entry.path)
+        cx, cy = x + CELL_SIZE // 2, y + CELL_SIZE // 2
+        if index == self._selected:
+            self.canvas.create_rectangle(x + 2, y + 2, x + CELL_SIZE - 2, y + CELL_SIZE - 2,
+                                         outline="#4caf50", width=2, tags="cell")
+        data = self.thumbs.get(key)
+        if data is None:
+            self.thumbs.request(key, entry.path, lambda k, d: self._results.put(k))
+        photo = self._photo(key, data) if data else None
+        if photo is not None:
+            self.canvas.create_image(cx, cy, image=photo, tags="cell")
+        else:
+            self._draw_placeholder(x, y, (entry.mime or "?").split("/")[-1] if data == NO_THUMBNAIL else "…")
+        return key
+
+    def _draw_placeholder(self, x: int, y: int, label: str):
+        cx, cy = x + CELL_SIZE // 2, y + CELL_SIZE // 2
+        half = THUMB_SIZE // 2
+        self.canvas.create_rectangle(cx - half, cy - half, cx + half, cy + half,
+                                     outline="#3b424c", fill="#2a2f36", tags="cell")
+        self.canvas.create_text(cx, cy, text=label, fill="#9aa3ad", tags="cell")
+
+    def _photo(self, key: str, data: bytes) -> tk.PhotoImage | None:
+        photo = self._photos.get(key)
+        if photo is None:
+            try:
+                photo = tk.PhotoImage(data=base64.b64encode(data).decode("ascii"))
+            except tk.TclError:
+                return None
+            self._photos[key] = photo
+        return photo
+
+    def _poll_results(self):
+        arrived = False
+        try:
+            while True:
+                self._results.get_nowait()      # A thumbnail key, or None for a catalog page or count.
+                arrived = True
+        except queue.Empty:
+            pass
+        if arrived:
+            if self.pager and self.pager.counted:
+                self.count_label.config(text=f"{self.pager.count:,} files")
+            self._schedule_redraw()
+        self.after(POLL_MS, self._poll_results)
+
+    # ------------------------------------------------------------------
+    # Interaction
+    # ------------------------------------------------------------------
+    def _on_click(self, event):
+        index = self._index_at(event.x, event.y)
+        self._selected = index
+        entry = self.pager.entry(index) if index is not None else None
+        if entry:
+            dims = f"{entry.width}×{entry.height}  " if entry.width else ""
+            saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.saved_at))
+            self.detail.config(text=f"{saved}  {entry.host}  {entry.mime}  {dims}{entry.size:,} bytes  {entry.path}")
+        else:
+            self.detail.config(text="")
+        self._schedule_redraw()
+
+    def _on_double_click(self, event):
+        index = self._index_at(event.x, event.y)
+        entry = self.pager.entry(index) if index is not None else None
+        if entry is None:
+            return
+        try:
+            open_file(entry.path, entry.mime)
+        except Exception:
+            log_gui.exception(f"Could not open {entry.path}. It may have been moved or deleted.")
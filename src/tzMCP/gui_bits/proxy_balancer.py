@@ -0,0 +1,187 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+TCP front end for a pool of mitmdump workers.
+
+mitmdump cannot share a listening socket, so each worker listens on its own
+loopback port and this balancer owns the public proxy port.  Every client
+connection is pinned to the healthy worker with the fewest open connections
+and bytes are relayed unchanged (TLS interception still happens in the
+worker); either side may half-close and the other keeps talking.  Workers
+start out unknown rather than down, and a client that arrives while none
+answers (the pool is still starting) is retried for ``CONNECT_PATIENCE``
+seconds.  A health loop probes each worker and asks the controller to
+restart any whose process has died.
+"""
+import asyncio
+import threading
+from dataclasses import dataclass
+from tzMCP.common_utils.log_config import log_gui
+
+RELAY_CHUNK = 64 * 1024
+HEALTH_INTERVAL = 2.0
+CONNECT_TIMEOUT = 1.0
+CONNECT_PATIENCE = 5.0
+CONNECT_RETRY = 0.1
+
+
+@dataclass
+class Backend:
+    port: int
+    healthy: bool | None = None     # None until the first probe or connection says otherwise.
+    active: int = 0
+    total: int = 0
+    restarts: int = 0
+
+
+class TcpBalancer:
+    """Least-connections TCP relay from ``listen_port`` to worker ports, run on its own thread."""
+
+    def __init__(self, listen_port: int, backend_ports: list[int], check_worker=None,
+                 listen_host: str = "127.0.0.1"):
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.backends = [Backend(port) for port in backend_ports]
+        # check_worker(port) -> bool: restarts the worker if its process died; True if it was restarted.
+        self.check_worker = check_worker
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._error: BaseException | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self):
+        """Bind the listener and start relaying; raises if the port cannot be bound."""
+        self._thread = threading.Thread(target=self._run, name="tzMCP-balancer", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error:
+            raise self._error
+
+    def stop(self):
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.listen_host, self.listen_port))
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            self._loop.close()
+            return
+        health = self._loop.create_task(self._health_loop())
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            health.cancel()
+            self._server.close()
+            for task in asyncio.all_tasks(self._loop):
+                task.cancel()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    def pick(self) -> Backend | None:
+        """The healthy (or not yet probed) backend with the fewest open connections (None if all are down)."""
+        candidates = [b for b in self.backends if b.healthy is not False]
+        return min(candidates, key=lambda b: b.active) if candidates else None
+
+    async def _connect(self):
+        """``(backend, reader, writer)`` for the best worker that accepts, or None after ``CONNECT_PATIENCE``."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + CONNECT_PATIENCE
+        while True:
+            # Workers marked down are tried last: the probe that marked them may already be stale.
+            for backend in sorted(self.backends, key=lambda b: (b.healthy is False, b.active)):
+                try:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection("127.0.0.1", backend.port), CONNECT_TIMEOUT)
+                except (OSError, asyncio.TimeoutError):
+                    backend.healthy = False
+                    continue
+                backend.healthy = True
+                return backend, reader, writer
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(CONNECT_RETRY)
+
+    async def _handle(self, client_reader, client_writer):
+        upstream = await self._connect()
+        if upstream is None:
+            client_writer.close()
+            return
+        backend, up_reader, up_writer = upstream
+
+        backend.active += 1
+        backend.total += 1
+        try:
+            await asyncio.gather(self._relay(client_reader, up_writer),
+                                 self._relay(up_reader, client_writer))
+        finally:
+            backend.active -= 1
+            up_writer.close()
+            client_writer.close()
+
+    @staticmethod
+    async def _relay(reader, writer):
+        """Copy until EOF, then half-close ``writer`` so the reply direction stays open."""
+        try:
+            while data := await reader.read(RELAY_CHUNK):
+                writer.write(data)
+                await writer.drain()
+            if writer.can_write_eof():
+                writer.write_eof()
+                return
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        writer.close()     # A reset (or a transport without half-close) tears down both directions.
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+    async def _probe(self, backend: Backend) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", backend.port), CONNECT_TIMEOUT)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    async def _health_loop(self):
+        while True:
+            for backend in self.backends:
+                if self.check_worker:
+                    try:
+                        restarted = await asyncio.to_thread(self.check_worker, backend.port)
+                    except Exception as e:
+                        log_gui.error(f"Could not restart proxy worker on port {backend.port}: {e}")
+                        restarted = False
+                    if restarted:
+                        backend.restarts += 1
+                was_healthy = backend.healthy
+                backend.healthy = await self._probe(backend)
+                if was_healthy and not backend.healthy:
+                    log_gui.warning(f"Proxy worker on port {backend.port} stopped answering; routing around it.")
+            await asyncio.sleep(HEALTH_INTERVAL)
+
+    def stats(self) -> dict:
+        """Aggregate pool counters for display."""
+        return {
+            "workers": len(self.backends),
+            "healthy": sum(b.healthy is True for b in self.backends),
+            "active": sum(b.active for b in self.backends),
+            "total": sum(b.total for b in self.backends),
+            "restarts": sum(b.restarts for b in self.backends),
+        }
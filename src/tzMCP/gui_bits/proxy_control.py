@@ -2,20 +2,44 @@ import os
 import subprocess
 import socket
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 import threading
+from tzMCP.gui_bits.proxy_balancer import TcpBalancer
+
+# A worker that keeps dying is restarted after 2 s, then 4 s, 8 s ... up to a minute;
+# one that stayed up for WORKER_STABLE_AFTER seconds is restarted at once.
+RESTART_BACKOFF = 2.0
+RESTART_BACKOFF_MAX = 60.0
+WORKER_STABLE_AFTER = 60.0
+
+def _free_loopback_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
 
 
 class ProxyController:
-    """Launch and manage a mitmdump process running the save_media.py addon."""
+    """Launch and manage mitmdump processes running the save_media.py addon.
+
+    With ``workers`` > 1 the controller starts that many mitmdump processes on
+    private loopback ports and a ``TcpBalancer`` on ``proxy_port`` in front of
+    them.  Workers read the same config file, so config changes reach all of
+    them through their own file watchers.
+    """
 
-    def __init__(self, proxy_executable_path: str, proxy_port: int = 8080, gui_queue=None):
+    def __init__(self, proxy_executable_path: str, proxy_port: int = 8080, gui_queue=None, workers: int = 1):
         print(f"Proxy controller initialized")
         print(f"proxy_executable_path: {proxy_executable_path}")
         self.proxy_executable_path = proxy_executable_path  # path to save_media.py
         self.proxy_port = proxy_port
+        self.workers = workers
         self.process: Optional[subprocess.Popen] = None
+        self.worker_processes: dict[int, subprocess.Popen] = {}
+        self._backoff: dict[int, tuple[float, float]] = {}   # port -> (last launch, delay before the next)
+        self.balancer: Optional[TcpBalancer] = None
+        self._workers_lock = threading.Lock()
         self.gui_queue = gui_queue  # <-- ADD THIS LINE
 
     # ------------------------------------------------------------------
@@ -39,6 +63,13 @@ class ProxyController:
         if self._is_port_in_use():
             raise RuntimeError(f"Port {self.proxy_port} is already in use.")
 
+        if self.workers > 1:
+            self._start_pool()
+        else:
+            self.process = self._launch(self.proxy_port)
+
+    def _launch(self, port: int) -> subprocess.Popen:
+        """Start one mitmdump process listening on ``port``."""
         script_path = Path(self.proxy_executable_path).resolve()
         print(f"Script path: {script_path}")
         if not script_path.exists():
@@ -53,12 +84,12 @@ class ProxyController:
             # "--set", "console_eventlog=false", # suppress INFO flood
             "--set", "console_eventlog_verbosity=info",  # Control mitmdump log output level to term
             "--listen-host", "127.0.0.1",                # Only allow local connection
-            "--listen-port", str(self.proxy_port),
+            "--listen-port", str(port),
             "--set", "http2=true",                       # Force HTTP/2 to be more browser like.
             "-s", str(script_path),
         ]
         print("[DEBUG] Launching proxy:", " ".join(cmd))
-        self.process = subprocess.Popen(
+        process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
@@ -68,25 +99,83 @@ class ProxyController:
             cwd=str(script_path.parent),
             env=env, 
         )
-        threading.Thread(target=self._drain_stdout, daemon=True).start()
+        threading.Thread(target=self._drain_stdout, args=(process,), daemon=True).start()
+        return process
+
+    def _start_pool(self) -> None:
+        """Start ``workers`` mitmdump processes behind a balancer on ``proxy_port``."""
+        ports = [_free_loopback_port() for _ in range(self.workers)]
+        with self._workers_lock:
+            for port in ports:
+                self.worker_processes[port] = self._launch(port)
+                self._backoff[port] = (time.monotonic(), 0.0)
+        self.balancer = TcpBalancer(self.proxy_port, ports, check_worker=self._ensure_worker)
+        try:
+            self.balancer.start()
+        except OSError:
+            self.balancer = None
+            self.stop_proxy()
+            raise
+        # Keep ``process`` pointing at a live worker so existing "is it running" checks hold.
+        self.process = self.worker_processes[ports[0]]
+
+    def _ensure_worker(self, port: int) -> bool:
+        """Restart the worker on ``port`` if its process has exited and its backoff has passed.
+
+        True if it was restarted.
+        """
+        with self._workers_lock:
+            process = self.worker_processes.get(port)
+            if process is None or process.poll() is None:
+                return False
+            now = time.monotonic()
+            launched_at, delay = self._backoff.get(port, (now - WORKER_STABLE_AFTER, 0.0))
+            if now - launched_at >= WORKER_STABLE_AFTER:
+                delay = 0.0
+            elif now < launched_at + delay:
+                return False
+            print(f"[WARNING] Proxy worker on port {port} exited ({process.returncode}); restarting.")
+            self.worker_processes[port] = self._launch(port)
+            self._backoff[port] = (now, min(max(delay * 2, RESTART_BACKOFF), RESTART_BACKOFF_MAX))
+            return True
+
+    def is_running(self) -> bool:
+        """True while the single proxy process, or the worker pool, is up."""
+        if self.balancer is not None:
+            return True
+        return self.process is not None and self.process.poll() is None
+
+    def stats(self) -> dict:
+        """Pool counters from the balancer (empty in single-process mode)."""
+        return self.balancer.stats() if self.balancer else {}
 
-    def _drain_stdout(self):
-        if not self.process or not self.process.stdout:
+    def _drain_stdout(self, process: subprocess.Popen):
+        if not process or not process.stdout:
             return
         
-        for line in self.process.stdout:
+        for line in process.stdout:
             # mirror everything to the parent shell (optional)
             print(line, end="")
 
     def stop_proxy(self) -> None:
-        """Gracefully terminate the mitmdump subprocess."""
-        if self.process and self.process.poll() is None:
-            self.process.terminate()
-            try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-                self.process.wait()
+        """Gracefully terminate the mitmdump subprocess(es) and the balancer."""
+        if self.balancer:
+            self.balancer.stop()
+            self.balancer = None
+        with self._workers_lock:
+            processes = list(self.worker_processes.values()) or [self.process]
+            self.worker_processes.clear()
+            self._backoff.clear()
+        for process in processes:
+            if process and process.poll() is None:
+                process.terminate()
+        for process in processes:
+            if process and process.returncode is None:
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
         self.process = None
 
     def _mirror_stdout(self):
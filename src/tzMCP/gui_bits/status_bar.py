@@ -12,6 +12,7 @@ class StatusBar(tk.Label):
     def __init__(self, parent):
         super().__init__(parent, bd=1, relief='sunken', anchor='w')
         self.state = 'stopped'
+        self.detail = ''
         self._update()
 
     def set_state(self, state: str):
@@ -19,7 +20,13 @@ class StatusBar(tk.Label):
         self.state = state
         self._update()
 
+    def set_detail(self, detail: str):
+        """Show extra text (e.g. worker pool counters) after the state."""
+        self.detail = detail
+        self._update()
+
     def _update(self):
         color = STATUS_COLORS.get(self.state, STATUS_COLORS['error'])
         text = self.state.capitalize()
-        self.config(text=f"Status: {text}", bg=color)
+        suffix = f" — {self.detail}" if self.detail else ""
+        self.config(text=f"Status: {text}{suffix}", bg=color)
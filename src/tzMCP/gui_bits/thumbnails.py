@@ -0,0 +1,129 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Thumbnail cache for the gallery tab.
+
+Thumbnails are rendered on demand by a small thread pool and stored as PNG
+files under ``thumbnails_dir()`` keyed by content digest, so identical files
+share one thumbnail and later sessions never re-decode the original.  The
+most recently used thumbnails are also kept in memory; the GUI thread only
+ever reads that tier and never touches the disk or decodes images itself.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_gui
+from tzMCP.save_media_utils.pack_store import parse_ref, read_saved
+
+THUMB_SIZE = 128
+MEMORY_ITEMS = 1024
+RENDER_WORKERS = 4
+
+# Memory-tier marker for files that are not decodable images (videos, audio, ...).
+NO_THUMBNAIL = b""
+
+
+def thumbnail_key(digest: str | None, path: str) -> str:
+    """Cache key for a saved file: its content digest, or a hash of its path."""
+    return digest or hashlib.sha1(path.encode("utf-8")).hexdigest()
+
+
+def render_thumbnail(source: Path | str, size: int = THUMB_SIZE) -> bytes | None:
+    """PNG bytes of ``source`` (a file or pack reference) scaled to fit ``size``×``size``; None if not an image."""
+    try:
+        from PIL import Image
+        fp = BytesIO(read_saved(str(source))) if parse_ref(str(source)) else source
+        with Image.open(fp) as img:
+            img.draft("RGB", (size, size))   # Let JPEG decode at reduced scale.
+            img.thumbnail((size, size))
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            buf = BytesIO()
+            img.save(buf, "PNG")
+            return buf.getvalue()
+    except Exception:
+        return None
+
+
+class ThumbnailCache:
+    """Disk-backed thumbnails with an LRU memory tier and background rendering."""
+
+    def __init__(self, cache_dir: Path, size: int = THUMB_SIZE, workers: int = RENDER_WORKERS,
+                 memory_items: int = MEMORY_ITEMS):
+        self.cache_dir = Path(cache_dir)
+        self.size = size
+        self.memory_items = memory_items
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._pending: dict = {}   # key -> (future, [callbacks])
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tzMCP-thumb")
+
+    def disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}-{self.size}.png"
+
+    def get(self, key: str) -> bytes | None:
+        """Thumbnail from memory only; ``NO_THUMBNAIL`` for non-images, None if not loaded yet."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    def request(self, key: str, source: Path | str, callback):
+        """Load or render ``key`` in the background, then call ``callback(key, data)`` from a worker thread."""
+        data = self.get(key)
+        if data is not None:
+            callback(key, data)
+            return
+        with self._lock:
+            if key in self._pending:
+                self._pending[key][1].append(callback)
+                return
+            # Submitted under the lock, so _finish cannot pop the entry before it exists.
+            self._pending[key] = (self._pool.submit(self._load, key, source), [callback])
+
+    def cancel_except(self, keys):
+        """Drop queued requests for anything not in ``keys`` (e.g. cells scrolled out of view)."""
+        keep = set(keys)
+        with self._lock:
+            for key, (future, _) in list(self._pending.items()):
+                if key not in keep and future.cancel():
+                    del self._pending[key]
+
+    def _load(self, key: str, source: Path | str):
+        data = None
+        try:
+            path = self.disk_path(key)
+            try:
+                data = path.read_bytes()
+            except OSError:
+                data = render_thumbnail(source, self.size)
+                if data is not None:
+                    self._write(path, data)
+        except Exception as e:
+            log_gui.debug(f"Thumbnail for {source} failed: {e}")
+        finally:
+            self._finish(key, NO_THUMBNAIL if data is None else data)
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _finish(self, key: str, data: bytes):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+            _, callbacks = self._pending.pop(key, (None, []))
+        for callback in callbacks:
+            callback(key, data)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -39,3 +39,7 @@ def logs_dir() -> Path:
 
 def profiles_dir() -> Path:
     return data_dir() / "profiles"
+
+
+def thumbnails_dir() -> Path:
+    return data_dir() / "thumbnails"
@@ -1,62 +1,208 @@
-# pylint: disable=logging-fstring-interpolation,redefined-outer-name,broad-exception-caught,line-too-long
+# pylint: disable=logging-fstring-interpolation,redefined-outer-name,broad-exception-caught,line-too-long,import-outside-toplevel
 """
 Script to build an addon for mitmproxy
 """
-import os
+from __future__ import annotations
+
+from collections import deque
 from pathlib import Path
-from time import perf_counter
+from time import perf_counter, time
 from threading import Timer
-from mitmproxy import http
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from typing import TYPE_CHECKING
 from tzMCP.gui_bits.config_manager import ConfigManager, Config
 from tzMCP.save_media_utils import config_provider
-from tzMCP.save_media_utils.mime_categories import IMAGE_TYPES
+from tzMCP.save_media_utils.admission import (
+    MemoryBudget, MeteredBody, SpillFile, BUDGET_KEY, SHED_KEY, SPILL, MB, clear_stale_spills, expected_size,
+    map_file, release_spill
+)
+from tzMCP.save_media_utils.catalog import CatalogEntry, MediaCatalog, catalog_path
+from tzMCP.save_media_utils.host_policy import HostVerdicts, VERDICT_KEY
+from tzMCP.save_media_utils.mime_categories import mime_group
+from tzMCP.save_media_utils.overload import Backpressure, NORMAL, SATURATED
+from tzMCP.save_media_utils.durability import Durability
+from tzMCP.save_media_utils.pack_store import PackWriter, pack_dir, packed_refs
+from tzMCP.save_media_utils.http_cache import ArchiveCache, CACHE_KEY, bypasses_cache, cached_response
+from tzMCP.save_media_utils.pipeline import CheckPipeline, FlowContext
+from tzMCP.save_media_utils.rate_limit import WriteThrottle
+from tzMCP.save_media_utils.save_queue import SaveJob, SaveWriter
+from tzMCP.save_media_utils.scheduler import SaveScheduler
+from tzMCP.save_media_utils.spool import SpoolJournal, spool_dir
+from tzMCP.save_media_utils.storage_quota import StorageManager
+from tzMCP.save_media_utils.tls_passthrough import HostStats, passthrough_patterns
+from tzMCP.save_media_utils.url_memo import UrlMemo, MEMO_KEY, SAVED, DUPLICATE
 from tzMCP.save_media_utils.save_media_utils import (
-    log_duration, safe_filename, is_valid_image, is_mime_type_allowed,
-    is_file_size_out_of_bounds, is_domain_blocked_by_whitelist,
-    is_domain_blacklisted, is_image_size_out_of_bounds, does_header_match_size,
-    is_directory_traversal_attempted, atomic_save, detect_mime_and_extension
+    log_duration, is_directory_traversal_attempted, atomic_save, find_saved_copy, image_dimensions
 )
 from tzMCP.common_utils.log_config import setup_logging, log_proxy
-from tzMCP.save_media_utils.hash_tracker import init_hash_db, shutdown_hash_db, is_duplicate
+from tzMCP.save_media_utils.hash_tracker import (
+    init_hash_db, shutdown_hash_db, is_duplicate, load_url_memo, store_url_memo,
+    load_http_cache, store_http_cache, config_db_path, compact_hash_db
+)
 from tzMCP.paths import config_dir, logs_dir
 
-class ConfigChangeHandler(FileSystemEventHandler):
-    """Watchdog event handler class"""
-    def __init__(self, callback):
-        """Init and accept the callback function."""
-        self.callback = callback
+if TYPE_CHECKING:
+    from mitmproxy import http
+
+# mitmproxy option naming the YAML config to use instead of the app's own (set by tzMCP-cli).
+CONFIG_OPTION = "tzmcp_config"
+
+# Persist the URL memo after this many new verdicts (and on shutdown).
+MEMO_FLUSH_EVERY = 500
+
+# Dedup retention runs shortly after startup, then on this interval.
+COMPACT_FIRST_DELAY = 60
+COMPACT_INTERVAL = 6 * 60 * 60
+
+# How often stale TLS passthrough hosts are looked for (seconds).
+PASSTHROUGH_REVIEW_EVERY = 10 * 60
+
+# What _capture did with a response besides SAVED / DUPLICATE. Only filter
+# verdicts, saves and duplicates say anything about a host (TLS passthrough).
+FILTERED = "filtered"
+SHED = "shed"
+REFUSED = "refused"
 
-    def on_any_event(self, event):
-        """Process ANY change int the target directory."""
-        log_proxy.debug(f"[watchdog] Event: {event.event_type} → {event.src_path}")
-        if not event.is_directory and event.src_path.endswith("media_proxy_config.yaml"):
-            self.callback()
 
 class MediaSaver:
     """Media Server Addon for mitmproxy"""
     def __init__(self):
-        # Setup Pathing
+        # Construction is side-effect free; mitmproxy may import this script
+        # more than once, so startup work happens in running().
         self.config_path = config_dir() / "media_proxy_config.yaml"
         self.log_path = logs_dir()
-
-        # Setup Config Manager
-        self.cfg_manager = ConfigManager(self.config_path)
+        self.cfg_manager = None
         self.config = Config()   # Start with empty config
         self._reload_timer = None
+        self._compact_timer = None
         self._observer = None
+        self._started = False
+        self.pipeline = CheckPipeline.default()
+        self.host_verdicts = HostVerdicts()
+        self.host_stats = HostStats(self.log_path / "host_stats.json")
+        self.url_memo = UrlMemo()
+        self.archive_cache = ArchiveCache()
+        self.catalog: MediaCatalog | None = None
+        self.packs: PackWriter | None = None
+        self.durability: Durability | None = None
+        self.writer: SaveWriter | None = None
+        self.throttle: WriteThrottle | None = None     # Paces the writer thread chunk by chunk.
+        self.journal: SpoolJournal | None = None
+        self.budget: MemoryBudget | None = None
+        self.backpressure: Backpressure | None = None
+        self.storage: StorageManager | None = None
+        self._spills: dict[str, SpillFile] = {}   # flow.id -> body being teed to disk
+        self._metered: dict[str, MeteredBody] = {}   # flow.id -> body of unknown length being buffered
+        self._replayed_spills: set[str] = set()   # Spill files held by replayed jobs
+        self._saved = deque()        # (job, path) finished by the writer thread
+        self._packed_refs = None     # digest -> pack ref, built on first replay
+        self._passthrough_dirty = False
+        self._passthrough_review_at = float("inf")   # Set once passthrough patterns are applied.
+        self._base_ignore_hosts = []
+        self._base_allow_hosts = []
+
+    def load(self, loader):
+        loader.add_option(CONFIG_OPTION, str, "", "YAML config file for tzMCP (default: the app's config file)")
+
+    def configure(self, updated):
+        """Pick up ``--set tzmcp_config=<path>``; mitmproxy calls this before running()."""
+        from mitmproxy import ctx
+        if CONFIG_OPTION in updated and getattr(ctx.options, CONFIG_OPTION):
+            self.config_path = Path(getattr(ctx.options, CONFIG_OPTION)).resolve()
+
+    def running(self):
+        """Called by mitmproxy once the proxy is up; runs startup exactly once."""
+        if self._started:
+            return
+        self._started = True
+        self.cfg_manager = ConfigManager(self.config_path)
         self._load_config()
         setup_logging()
         self._start_watcher()    # Setup Watchdog to monitor the config file for updates.
-        init_hash_db(self.config.enable_persistent_dedup)  # Setup DB to managed Dedupe hashse
+        db_path = config_db_path(self.config)  # Setup DB to managed Dedupe hashse
+        init_hash_db(db_path is not None, db_path, self.config.dedup_shards)
+        self.url_memo.load_rows(load_url_memo(self.url_memo.max_entries))
+        self.archive_cache.load_rows(load_http_cache(self.archive_cache.max_entries))
+        self.host_stats.load(self.config)
+        if self.config.media_catalog:
+            self.catalog = MediaCatalog(catalog_path(self.config.save_dir))
+        self.durability = Durability.from_config(self.config.durability)
+        if self.config.pack_storage["enabled"]:
+            self.packs = PackWriter(pack_dir(self.config.save_dir), self.config.pack_storage["segment_mb"] * 1024 * 1024,
+                                    self.durability)
+        if self.config.storage_quota["enabled"]:
+            self.storage = StorageManager.from_config(
+                self.config.save_dir, self.config.storage_quota,
+                on_evicted=lambda paths: self.catalog.forget(paths) if self.catalog else None,
+                saved_files=self.catalog.paths if self.catalog else None,
+            ).start()
+        self._start_budget()
+        self._start_writer()
+        if self.budget:
+            # Replayed jobs are queued by now, so any spill file they do not hold is left over from a crash.
+            clear_stale_spills(spool_dir(self.config.save_dir), self._replayed_spills)
+        if self.config.overload["enabled"]:
+            self.backpressure = Backpressure.from_config(self.config.overload, self._pressure)
+        self._schedule_compaction(COMPACT_FIRST_DELAY)
+        self._start_passthrough()
         log_proxy.info(f"MediaSaver addon initialized → {self.config.save_dir}")
 
+    def _start_writer(self):
+        """Queue saves to a writer thread, journaled in the spool, and replay what a crash left behind."""
+        settings = self.config.save_queue
+        if not settings["enabled"]:
+            return
+        if settings["spool"]:
+            self.journal = SpoolJournal(spool_dir(self.config.save_dir), self.durability)
+        if self.config.write_rate_limit["enabled"]:
+            self.throttle = WriteThrottle.from_config(self.config.write_rate_limit)
+        scheduler = SaveScheduler.from_config(self.config.save_scheduler, self.throttle.ready if self.throttle else None)
+        self.writer = SaveWriter(self._write_job, self.journal, lambda job, path: self._saved.append((job, path)),
+                                 scheduler)
+        # Journals left by an earlier run are replayed even after the spool was switched off.
+        journal = self.journal or SpoolJournal(spool_dir(self.config.save_dir))
+        if journal.directory.is_dir():
+            replayed = journal.replay_orphans(self._replay)
+            if replayed:
+                log_proxy.info(f"♻ Replaying {replayed} spooled save(s) from an earlier run.")
+
+    def _replay(self, meta: dict, body: bytes):
+        try:
+            job = SaveJob.from_meta(meta, body)
+        except OSError as e:
+            log_proxy.error(f"❌ Spooled save of {meta['save_path']} lost its spill file: {e}")
+            return
+        if job.spill:
+            self._replayed_spills.add(job.spill)
+        elif self.budget and self.budget.in_use() + job.size > self.budget.ceiling:
+            self.writer.drain()     # Keep the replayed backlog within the memory budget.
+        self.writer.submit(job)
+
+    def _start_budget(self):
+        """Cap the bytes held by in-flight and queued bodies."""
+        settings = self.config.memory_budget
+        if not settings["enabled"]:
+            return
+        self.budget = MemoryBudget(settings["max_mb"] * MB, settings["large_mb"] * MB,
+                                   lambda: self.writer.pending_memory if self.writer else 0)
+
+    def _pressure(self) -> float:
+        """Load on the save path: the fullest of save queue (bytes, files) and memory budget."""
+        settings = self.config.overload
+        loads = [0.0]
+        if self.writer:
+            loads.append(self.writer.pending_bytes / (settings["queue_mb"] * MB))
+            loads.append(self.writer.pending / settings["queue_files"])
+        if self.budget:
+            loads.append(self.budget.in_use() / self.budget.ceiling)
+        return max(loads)
+
     def _load_config(self):
         """Load configs from the config file if possible."""
         try:
             self.config: Config = self.cfg_manager.load_config()  # Load config from file and store locally
             config_provider.set_config(self.config)               # Share with other files in real time.
+            self.host_verdicts.clear()                            # load_config() updates in place.
+            self._passthrough_dirty = True                        # Applied on the event loop.
             log_proxy.info("MediaServer: 🔄 Reloaded config")
         except Exception as e:
             log_proxy.error(f"Failed to load config: {e}")
@@ -68,15 +214,76 @@ class MediaSaver:
             log_proxy.error(f"⚠ Cannot watch config; file does not exist: {self.config_path}")
             return
         try:
-            event_handler = ConfigChangeHandler(self._on_config_change)
-            observer = Observer()
-            observer.schedule(event_handler, str(self.config_path.parent), recursive=False)
-            observer.daemon = True
-            observer.start()
-            self._observer = observer  # Store if you ever need to stop it
+            from tzMCP.save_media_utils.config_watcher import start_config_watcher
+            self._observer = start_config_watcher(self.config_path, self._on_config_change)
         except Exception as e:
             log_proxy.error(f"⚠ Failed to start config watcher: {e}")
 
+    def _start_passthrough(self):
+        """Remember the user's own ignore/allow patterns, then add generated ones."""
+        from mitmproxy import ctx
+        self._base_ignore_hosts = list(ctx.options.ignore_hosts)
+        self._base_allow_hosts = list(ctx.options.allow_hosts)
+        self._apply_passthrough()
+
+    def _apply_passthrough(self):
+        """Push generated passthrough patterns into the running proxy.
+
+        mitmproxy recompiles ignore_hosts/allow_hosts on update, so the change
+        takes effect from the next connection.  Must run on the event loop.
+        """
+        from mitmproxy import ctx
+        self._passthrough_dirty = False
+        self._passthrough_review_at = time() + PASSTHROUGH_REVIEW_EVERY
+        self.host_stats.sync(self.config)
+        settings = getattr(self.config, "tls_passthrough", {}) or {}
+        self.host_stats.expire(settings.get("reprobe_hours", 0) * 3600)
+        ignore, allow = passthrough_patterns(self.config, self.host_stats)
+        ctx.options.update(
+            ignore_hosts=self._base_ignore_hosts + ignore,
+            allow_hosts=self._base_allow_hosts + allow,
+        )
+        self.host_stats.save()
+        if ignore or allow:
+            log_proxy.info(f"🔀 TLS passthrough: {len(ignore)} ignore pattern(s), {len(allow)} allow pattern(s).")
+
+    def _record_host(self, host: str, outcome: str):
+        """Feed the passthrough statistics; flag a refresh when a host changes status.
+
+        Shed and refused responses say nothing about the host's media, so they
+        are not counted; a duplicate shows it serves media we keep.
+        """
+        settings = getattr(self.config, "tls_passthrough", {}) or {}
+        if not settings.get("enabled") or outcome not in (SAVED, DUPLICATE, FILTERED):
+            return
+        if self.host_stats.record(host, outcome != FILTERED, settings.get("min_flows", 25)):
+            self._passthrough_dirty = True
+
+    def _flush_url_memo(self, wait: bool = False):
+        """Persist URL memo and archive-cache entries changed since the last flush.
+
+        Unless ``wait`` is set the rows are only queued to the database's
+        writer thread, so the event loop never waits on the commit.
+        """
+        store_url_memo(self.url_memo.take_dirty(), keep=self.url_memo.max_entries, wait=wait)
+        store_http_cache(self.archive_cache.take_dirty(), keep=self.archive_cache.max_entries, wait=wait)
+
+    def _schedule_compaction(self, delay: float):
+        """Run dedup retention on a timer thread, off the request path."""
+        self._compact_timer = Timer(delay, self._compact)
+        self._compact_timer.daemon = True
+        self._compact_timer.start()
+
+    def _compact(self):
+        retention = self.config.dedup_retention
+        if retention.get("enabled"):
+            try:
+                compact_hash_db(retention["max_age_days"], retention["max_rows"], retention["by"])
+            except Exception as e:
+                log_proxy.error(f"❌ Dedup compaction failed: {e}")
+        if self._started:
+            self._schedule_compaction(COMPACT_INTERVAL)
+
     def _on_config_change(self):
         """Prevent operations from triggering multiple operations/loads in a short time."""
         if self._reload_timer and self._reload_timer.is_alive():
@@ -90,48 +297,349 @@ class MediaSaver:
         log_proxy.info("🔄 Config reloaded via debounced watcher.")
 
     def done(self):
-        """Called when mitmproxy shuts down."""
-        if hasattr(self, "_observer") and self._observer:
+        """Called when mitmproxy shuts down or unloads this script."""
+        if self._reload_timer:
+            self._reload_timer.cancel()
+        if self._compact_timer:
+            self._compact_timer.cancel()
+        if self._observer:
             self._observer.stop()
             self._observer.join()
-            shutdown_hash_db()
+            self._observer = None
             log_proxy.info("🛑 Config watcher stopped cleanly.")
+        if self._started:
+            if self.writer:
+                self.writer.close()          # Finish queued saves first.
+                log_proxy.info(f"🗂 Saves written per priority class: {self.writer.scheduler.stats()['served']}")
+                if self.throttle:
+                    log_proxy.info(f"🐢 Write rate limit: {self.throttle.stats()}")
+                self.writer = None
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+            self._apply_saved()
+            for spill in self._spills.values():
+                spill.discard()
+            self._spills.clear()
+            if self.budget:
+                stats = self.budget.stats()
+                log_proxy.info(f"🧮 Memory budget: peak {stats['peak'] // MB} MB of {stats['ceiling'] // MB} MB, "
+                               f"{stats['refused']} large response(s) not buffered.")
+            if self.backpressure:
+                stats = self.backpressure.stats()
+                log_proxy.info(f"🚦 Overload: entered {stats['events']} time(s), shed {stats['shed']}.")
+            self._flush_url_memo(wait=True)
+            shutdown_hash_db()
+            if self.storage:
+                log_proxy.info(f"💾 Storage: {self.storage.stats()}")
+                self.storage.close()          # Before the catalog it reports evictions to.
+                self.storage = None
+            if self.catalog:
+                self.catalog.close()
+                self.catalog = None
+            if self.packs:
+                self.packs.close()
+                self.packs = None
+            if self.durability:
+                self.durability.close()     # Final group fsync.
+                self.durability = None
+            self.host_stats.save()
+            self._started = False
+
+    def request(self, flow: http.HTTPFlow):
+        """Decide host-only rules before the response exists."""
+        self._apply_saved()
+        if self._passthrough_dirty or time() >= self._passthrough_review_at:
+            self._apply_passthrough()
+        verdict = self.host_verdicts.verdict(flow.request.pretty_host)
+        if verdict:
+            flow.metadata[VERDICT_KEY] = verdict
+        elif self.config.serve_from_archive:
+            self._serve_from_archive(flow)
+
+    def _serve_from_archive(self, flow: http.HTTPFlow):
+        """Answer the request from a saved file when a fresh copy is indexed."""
+        if bypasses_cache(flow.request.method, flow.request.headers):
+            return
+        entry = self.archive_cache.lookup(flow.request.pretty_url)
+        reply = cached_response(entry, flow.request.headers) if entry else None
+        if reply is None:
+            return
+        from mitmproxy import http as mitm_http
+        status, body, headers = reply
+        flow.response = mitm_http.Response.make(status, body, headers)
+        flow.metadata[CACHE_KEY] = True
+        self.archive_cache.hits += 1
+        log_proxy.info(f"📦 Served from archive ({status}): {flow.request.pretty_url}")
+
+    def responseheaders(self, flow: http.HTTPFlow):
+        """Stream bodies we will not process straight through instead of buffering them."""
+        if flow.metadata.get(VERDICT_KEY) or flow.metadata.get(CACHE_KEY):
+            flow.response.stream = True
+            return
+        entry = self.url_memo.lookup(flow.request.pretty_url, flow.response.headers)
+        if entry:
+            log_proxy.info(f"⏭ Skipped repeat fetch ({entry.verdict} before, validators unchanged): {flow.request.pretty_url}")
+            flow.metadata[MEMO_KEY] = entry.verdict
+            flow.response.stream = True
+            return
+        if self.backpressure and self._shed_early(flow):
+            return
+        if self.budget:
+            self._admit(flow)
+
+    def _shed_early(self, flow: http.HTTPFlow) -> bool:
+        """Under load, pass a response through unsaved before its body is buffered."""
+        level = self.backpressure.level()
+        if level == NORMAL:
+            return False
+        if level == SATURATED:
+            reason = "passthrough"
+        else:
+            group = mime_group(flow.response.headers.get("Content-Type", "").split(";")[0].strip().lower())
+            if not self.backpressure.sheds_group(group):
+                return False
+            reason = f"mime:{group}"
+        self.backpressure.shed(reason)
+        flow.metadata[SHED_KEY] = f"overload ({reason})"
+        flow.response.stream = True
+        log_proxy.debug(f"⏭ Overloaded ({level}), passing through unsaved: {flow.request.pretty_url}")
+        return True
+
+    def _admit(self, flow: http.HTTPFlow):
+        """Reserve memory for buffering the body, or decide how to take it without buffering."""
+        settings = self.config.memory_budget
+        size = expected_size(flow.response.headers)
+        size_filter = self.config.filter_file_size
+        max_bytes = size_filter["max_bytes"] if size_filter.get("enabled") else None
+        if max_bytes is not None and size is not None and size > max_bytes:
+            flow.metadata[SHED_KEY] = "over max_bytes"     # Would be rejected anyway; never buffer it.
+            flow.response.stream = True
+            return
+        encoding = flow.response.headers.get("Content-Encoding", "identity").lower()
+        # Streamed chunks are still encoded, so only identity bodies can be checked from disk.
+        can_spill = settings["over_budget"] == SPILL and encoding == "identity"
+        if size is None:
+            # Unknown length: buffer it ourselves so every chunk is charged to the budget as it arrives.
+            spill_to = (lambda: self._spill(flow, max_bytes)) if can_spill else None
+            self._metered[flow.id] = flow.response.stream = MeteredBody(self.budget, max_bytes, spill_to)
+            return
+        if self.budget.try_reserve(size):
+            flow.metadata[BUDGET_KEY] = size
+            return
+        if can_spill:
+            self._spill(flow, max_bytes)
+            log_proxy.info(f"💽 Over memory budget, spilling {size} B to disk: {flow.request.pretty_url}")
+        else:
+            flow.metadata[SHED_KEY] = "over memory budget"
+            flow.response.stream = True
+            log_proxy.warning(f"⏭ Over memory budget, passing {size} B through unsaved: {flow.request.pretty_url}")
+
+    def _spill(self, flow: http.HTTPFlow, max_bytes: int | None) -> SpillFile:
+        """Tee the rest of the flow's body to a spill file instead of memory."""
+        spill = SpillFile(spool_dir(self.config.save_dir), max_bytes)
+        self._spills[flow.id] = spill
+        if flow.id not in self._metered:
+            flow.response.stream = spill
+        return spill
+
+    def _release(self, flow: http.HTTPFlow):
+        """Return the flow's reservation and drop any spill file nobody took over."""
+        reserved = flow.metadata.pop(BUDGET_KEY, 0)
+        if reserved and self.budget:
+            self.budget.release(reserved)
+        metered = self._metered.pop(flow.id, None)
+        if metered:
+            metered.release()
+        spill = self._spills.pop(flow.id, None)
+        if spill:
+            spill.discard()
+
+    def error(self, flow: http.HTTPFlow):
+        """A flow failed before its response completed."""
+        self._release(flow)
 
     def response(self, flow: http.HTTPFlow):
         """Process a response from a user request."""
+        self._apply_saved()
+        if (flow.metadata.get(VERDICT_KEY) or flow.metadata.get(MEMO_KEY) or flow.metadata.get(CACHE_KEY)
+                or flow.metadata.get(SHED_KEY)):
+            return
         start_total = perf_counter()
+        try:
+            ctx = self._flow_context(flow)
+        finally:
+            # The body is in hand: its reservation must not count against its own overload check,
+            # and it is counted again by the save queue once submitted.
+            self._release(flow)
+        if ctx is None:
+            return
+        log_proxy.info(f"Received: {ctx.label}, {ctx.size} bytes")
+        self._record_host(ctx.host, self._capture(ctx))
+        if self.url_memo.unsaved + self.archive_cache.unsaved >= MEMO_FLUSH_EVERY and self._started:
+            self._flush_url_memo()
+        log_duration("response()", start_total)
 
-        # Determine response details if possible.
+    def _flow_context(self, flow: http.HTTPFlow) -> FlowContext | None:
+        """Context over the buffered body, or over the spill file it was streamed to (None if unusable)."""
+        metered = self._metered.pop(flow.id, None)
+        spill = self._spills.pop(flow.id, None)
         content = flow.response.content
-        url = flow.request.pretty_url
-        size = len(content)
-        clean_url = url.split("?", 1)[0]
-        basename = os.path.basename(clean_url)
-        mime_type, ext = detect_mime_and_extension(content, fallback_url=url)
-        fname = safe_filename(basename, ext, fallback_url=url)
-        log_proxy.info(f"Received: {fname} → {mime_type}, {size} bytes")
+        if metered and not spill:
+            content = self._metered_content(flow, metered)
+            metered.release()
+            if content is None:
+                return None
+        if spill:
+            if not spill.usable:
+                log_proxy.info(f"⏭ Spilled body incomplete or over max_bytes: {flow.request.pretty_url}")
+                spill.discard()
+                return None
+            content = map_file(spill.path)
+        ctx = FlowContext(
+            url=flow.request.pretty_url,
+            content=content,
+            content_length=flow.response.headers.get("Content-Length"),
+            headers=flow.response.headers,
+            request_headers=flow.request.headers,
+            spill=str(spill.path) if spill else "",
+        )
+        if spill:
+            ctx.digest = spill.digest     # Hashed while streaming.
+        return ctx
 
-        # These are ordered to try to get the fastest to fail done first.
-        if (not does_header_match_size(flow.response.headers.get("Content-Length"), size, url) or
-            is_file_size_out_of_bounds(size, fname) or
-            not is_mime_type_allowed(mime_type, fname) or
-            is_domain_blocked_by_whitelist(url, fname) or
-            is_domain_blacklisted(url, fname)):
-            return
-
-        if mime_type in IMAGE_TYPES:
-            if is_valid_image(content) and is_image_size_out_of_bounds(content, fname):
-                return
+    def _metered_content(self, flow: http.HTTPFlow, metered: MeteredBody) -> bytes | None:
+        """The decoded body a ``MeteredBody`` collected, or None if the capture was given up."""
+        if metered.abandoned or not metered.complete:
+            log_proxy.info(f"⏭ Unknown-length body {metered.abandoned or 'incomplete'}: {flow.request.pretty_url}")
+            return None
+        content = metered.content
+        encoding = flow.response.headers.get("Content-Encoding", "identity").lower()
+        if encoding != "identity":
+            from mitmproxy.net.encoding import decode
+            try:
+                content = decode(content, encoding)
+            except ValueError as e:
+                log_proxy.info(f"⏭ Could not decode {encoding} body of {flow.request.pretty_url}: {e}")
+                return None
+        return content
 
-        if is_duplicate(content):
-            log_proxy.info(f"⏭ Skipped duplicate content (SHA256 matched): {fname}")
-            return
+    def _capture(self, ctx: FlowContext) -> str:
+        """Run the checks and save (or queue) the body; return the outcome (SAVED when accepted)."""
+        spill = ctx.spill
+        skip = self._overload_skips(ctx)
+        # Stages run cheapest-per-rejection first and stop at the first veto.
+        outcome = SHED if skip is None else FILTERED if self.pipeline.rejects(ctx, skip) else None
+        if outcome is None and is_duplicate(ctx.content, ctx.digest):
+            log_proxy.info(f"⏭ Skipped duplicate content (SHA256 matched): {ctx.fname}")
+            self.url_memo.remember(ctx.url, ctx.headers, DUPLICATE)
+            outcome = DUPLICATE
+        if outcome is None and self.storage and not self.storage.admit(ctx.size):
+            outcome = REFUSED
+        if outcome:
+            if spill:
+                release_spill(ctx.content, spill)
+            return outcome
 
-        save_path = (self.config.save_dir / fname).resolve()
+        save_path = (self.config.save_dir / ctx.fname).resolve()
         if not is_directory_traversal_attempted(save_path):
             self.config.save_dir.mkdir(parents=True, exist_ok=True)
 
-        atomic_save(content, save_path, size)
-        log_duration("response()", start_total)
+        job = SaveJob(save_path, ctx.content, ctx.safe_url, ctx.host, ctx.mime_type, ctx.digest, ctx=ctx, spill=spill)
+        if self.writer:
+            self.writer.submit(job)
+            return SAVED
+        final_path = self._write_job(job)
+        if spill:
+            release_spill(job.content, spill)
+        if final_path is None:
+            return REFUSED
+        self._remember_saved(job, final_path)
+        return SAVED
+
+    def _overload_skips(self, ctx: FlowContext) -> frozenset | None:
+        """Check stages to skip under the current load; None when the response is shed outright."""
+        if not self.backpressure:
+            return frozenset()
+        level = self.backpressure.level()
+        if level == NORMAL:
+            return frozenset()
+        if level == SATURATED:
+            self.backpressure.shed("passthrough")
+            return None
+        group = mime_group(ctx.mime_type)
+        if self.backpressure.sheds_group(group):
+            self.backpressure.shed(f"mime:{group}")
+            log_proxy.info(f"⏭ Overloaded, shed {group} response: {ctx.fname}")
+            return None
+        for stage in self.backpressure.skip_stages:
+            self.backpressure.shed(f"skipped:{stage}")
+        return self.backpressure.skip_stages
+
+    def _write_job(self, job: SaveJob) -> str | None:
+        """Store one job and catalog it; runs on the save writer thread when saves are queued."""
+        existing = self._already_saved(job) if job.replayed else None
+        if existing:
+            log_proxy.info(f"⏭ Spooled save already on disk: {existing}")
+            final_path = existing
+        else:
+            final_path = self._store(job)
+            if final_path and self.storage:
+                self.storage.added(job.size)
+        if final_path and self.catalog and not existing:
+            dims = job.ctx.dimensions if job.ctx else (
+                image_dimensions(job.content) if job.mime.startswith("image/") else None)
+            width, height = dims or (None, None)
+            self.catalog.record(CatalogEntry(final_path, job.digest, job.url, job.host, job.mime,
+                                             job.size, width, height, time()))
+        if final_path and job.spill and self.writer:
+            release_spill(job.content, job.spill)   # Kept on failure: the spool replays from it.
+        return final_path
+
+    def _already_saved(self, job: SaveJob) -> str | None:
+        """For a replayed job, where an earlier run already stored the same content (spool idempotency)."""
+        existing = find_saved_copy(job.save_path, job.digest, job.size)
+        if existing:
+            return str(existing)
+        if self.packs:
+            if self._packed_refs is None:
+                self._packed_refs = packed_refs(pack_dir(self.config.save_dir))
+            return self._packed_refs.get(job.digest)
+        return None
+
+    def _store(self, job: SaveJob) -> str | None:
+        """Append small bodies to the pack segment, write the rest as files; return where it went."""
+        pace = (lambda nbytes: self.throttle.acquire(job, nbytes)) if self.throttle else None
+        packing = self.config.pack_storage
+        if self.packs and packing["enabled"] and job.size <= packing["max_object_kb"] * 1024:
+            if pace:
+                pace(job.size)
+            try:
+                ref = self.packs.append(job.save_path.name, job.content, job.url, job.mime, job.digest)
+            except OSError as e:
+                log_proxy.error(f"❌ OS error while packing: {e}")
+                return None
+            log_proxy.info(f"📦 Packed → {ref} ({job.size} B)")
+            return ref
+        final_path = atomic_save(job.content, job.save_path, job.size, self.durability, pace)
+        return str(final_path) if final_path else None
+
+    def _remember_saved(self, job: SaveJob, final_path: str):
+        """Index a finished save for repeat-fetch skipping and archive serving (event loop only)."""
+        ctx = job.ctx
+        if ctx is None:
+            return
+        self.url_memo.remember(ctx.url, ctx.headers, SAVED, final_path)
+        self.archive_cache.store(ctx.url, final_path, ctx.headers.get("Content-Type") or ctx.mime_type,
+                                 ctx.request_headers, ctx.headers)
+
+    def _apply_saved(self):
+        """Fold saves finished by the writer thread into the in-memory indexes."""
+        while self._saved:
+            self._remember_saved(*self._saved.popleft())
+
+def make_addons() -> list:
+    """Build the addon list for this script; instances stay inert until running()."""
+    return [MediaSaver()]
 
-addons = [MediaSaver()]
+addons = make_addons()
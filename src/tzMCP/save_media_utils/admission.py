@@ -0,0 +1,234 @@
+"""
+Admission control for response bodies held in memory.
+
+mitmproxy buffers a whole response before the ``response`` hook runs, so a
+burst of parallel video streams can grow the proxy by gigabytes.  Each
+body we intend to buffer reserves its Content-Length in a process-wide
+``MemoryBudget``; in-memory bodies waiting in the save queue count too.
+Once the budget is spent, new *large* responses are not buffered: they are
+either streamed straight through uncaptured (``passthrough``) or teed to a
+``SpillFile`` on disk as they stream (``spill``) and checked from there.
+Small responses are always admitted, so a full budget never blocks
+ordinary browsing.
+
+A body without a Content-Length (chunked video, HLS) cannot be sized up
+front, so it is streamed through a ``MeteredBody`` that reserves each chunk
+as it arrives and moves to a spill file (or gives up) the moment the
+budget cannot take the next one.
+"""
+import hashlib
+import mmap
+import os
+import threading
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+BUDGET_KEY = "tzmcp_budget"     # flow.metadata: bytes reserved for this flow
+SHED_KEY = "tzmcp_shed"         # flow.metadata: why the body was passed through uncaptured
+
+SPILL, PASSTHROUGH = "spill", "passthrough"
+MB = 1024 * 1024
+SPILL_PREFIX = "spill-"
+SPILL_SUFFIX = ".part"
+STALE_SPILL_SECONDS = 60 * 60
+
+
+def expected_size(headers) -> int | None:
+    """Body size announced by Content-Length; None when it is missing or invalid."""
+    try:
+        return max(0, int(headers.get("Content-Length")))
+    except (TypeError, ValueError):
+        return None
+
+
+def map_file(path: Path):
+    """Read-only memory map of a whole file (page cache, not process heap); ``b""`` if it is empty."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def release_spill(content, path: Path | str):
+    """Unmap a spilled body and delete its file (unmapped first: Windows cannot delete mapped files)."""
+    if isinstance(content, mmap.mmap):
+        content.close()
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def clear_stale_spills(directory: Path, keep=(), max_age: float = STALE_SPILL_SECONDS) -> int:
+    """Delete spill files left by earlier runs (not in ``keep`` and untouched for ``max_age`` seconds)."""
+    keep = {str(p) for p in keep}
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in Path(directory).glob(f"{SPILL_PREFIX}*{SPILL_SUFFIX}"):
+        try:
+            if str(path) not in keep and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class MemoryBudget:
+    """Bytes reserved by in-flight bodies plus bytes waiting to be saved, against a ceiling."""
+
+    def __init__(self, ceiling: int, large: int, queued=lambda: 0):
+        self.ceiling = ceiling
+        self.large = large
+        self.queued = queued          # Callable: bytes held by the save queue.
+        self.reserved = 0
+        self.peak = 0
+        self.admitted = 0
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    def in_use(self) -> int:
+        return self.reserved + self.queued()
+
+    def try_reserve(self, size: int) -> bool:
+        """Reserve ``size`` bytes; large bodies are refused when they would exceed the ceiling."""
+        with self._lock:
+            used = self.reserved + self.queued()
+            if size >= self.large and used + size > self.ceiling:
+                self.refused += 1
+                return False
+            self.reserved += size
+            self.admitted += 1
+            self.peak = max(self.peak, used + size)
+            return True
+
+    def try_grow(self, size: int) -> bool:
+        """Reserve ``size`` more bytes for a body already being buffered, only if the ceiling allows it."""
+        with self._lock:
+            used = self.reserved + self.queued()
+            if used + size > self.ceiling:
+                self.refused += 1
+                return False
+            self.reserved += size
+            self.peak = max(self.peak, used + size)
+            return True
+
+    def release(self, size: int):
+        with self._lock:
+            self.reserved = max(0, self.reserved - size)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"reserved": self.reserved, "queued": self.queued(), "ceiling": self.ceiling,
+                    "peak": self.peak, "admitted": self.admitted, "refused": self.refused}
+
+
+class SpillFile:
+    """A streamed body teed to disk chunk by chunk, hashed on the way.
+
+    Used as ``flow.response.stream``: mitmproxy calls it with every chunk
+    and forwards what it returns, then once more with ``b""`` at the end.
+    Writing stops (and the capture is abandoned) past ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int | None = None):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._file = NamedTemporaryFile("wb", delete=False, dir=directory, prefix=SPILL_PREFIX, suffix=SPILL_SUFFIX)
+        self.path = Path(self._file.name)
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.overflowed = False
+        self.complete = False
+        self._sha256 = hashlib.sha256()
+
+    def __call__(self, chunk: bytes) -> bytes:
+        if not chunk:
+            self._close()
+            self.complete = True
+        elif not self.overflowed:
+            if self.max_bytes is not None and self.size + len(chunk) > self.max_bytes:
+                self.overflowed = True
+                self._close()
+                self.discard()
+            else:
+                self._file.write(chunk)
+                self._sha256.update(chunk)
+                self.size += len(chunk)
+        return chunk
+
+    def _close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    @property
+    def usable(self) -> bool:
+        """True once the whole body arrived within ``max_bytes``."""
+        return self.complete and not self.overflowed
+
+    @property
+    def digest(self) -> str:
+        return self._sha256.hexdigest()
+
+    def discard(self):
+        self._close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class MeteredBody:
+    """A body of unknown length buffered in memory chunk by chunk against the budget.
+
+    Used as ``flow.response.stream`` like ``SpillFile``.  When the budget
+    cannot take the next chunk the body moves to the spill file ``spill_to()``
+    returns, or is given up (``abandoned``) when there is none; either way
+    the client still receives every chunk.
+    """
+
+    def __init__(self, budget: MemoryBudget, max_bytes: int | None = None, spill_to=None):
+        self.budget = budget
+        self.max_bytes = max_bytes
+        self.spill_to = spill_to
+        self.spill: SpillFile | None = None
+        self.reserved = 0
+        self.abandoned = ""       # Why the capture was given up.
+        self.complete = False
+        self._chunks: list[bytes] = []
+
+    def __call__(self, chunk: bytes) -> bytes:
+        if self.spill:
+            return self.spill(chunk)
+        if not chunk:
+            self.complete = True
+        elif self.abandoned:
+            pass
+        elif self.max_bytes is not None and self.reserved + len(chunk) > self.max_bytes:
+            self._give_up("over max_bytes")
+        elif self.budget.try_grow(len(chunk)):
+            self.reserved += len(chunk)
+            self._chunks.append(chunk)
+        elif self.spill_to:
+            self.spill = self.spill_to()
+            for kept in self._chunks:
+                self.spill(kept)
+            self.release()
+            self.spill(chunk)
+        else:
+            self._give_up("over memory budget")
+        return chunk
+
+    def _give_up(self, reason: str):
+        self.abandoned = reason
+        self.release()
+
+    @property
+    def content(self) -> bytes:
+        return b"".join(self._chunks)
+
+    def release(self):
+        """Drop the buffered chunks and return their reservation."""
+        self._chunks = []
+        self.budget.release(self.reserved)
+        self.reserved = 0
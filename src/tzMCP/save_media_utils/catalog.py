@@ -0,0 +1,197 @@
+"""
+Catalog of saved media.
+
+Every successful save appends one row (path, digest, URL, host, MIME, size,
+pixel dimensions, time) to ``<save_dir>/.tzmcp_catalog.sqlite``.  Rows are
+queued to the catalog's writer thread and group-committed, so recording
+never waits on disk.  Indexes on host, MIME and time let tools and the GUI
+answer "what came from this domain today" without scanning the directory.
+
+    tzMCP-catalog --host example.com --since 1d
+"""
+import argparse
+import sqlite3
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from tzMCP.gui_bits.config_manager import ConfigManager
+from tzMCP.save_media_utils.pack_store import REF_SEP, SEGMENT_SUFFIX
+from tzMCP.save_media_utils.sqlite_worker import SqliteWorker
+
+CATALOG_NAME = ".tzmcp_catalog.sqlite"
+
+CATALOG_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS media ("
+    "id INTEGER PRIMARY KEY, path TEXT NOT NULL, digest TEXT, url TEXT, host TEXT, mime TEXT, "
+    "size INTEGER, width INTEGER, height INTEGER, saved_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS media_host ON media (host, saved_at)",
+    "CREATE INDEX IF NOT EXISTS media_mime ON media (mime, saved_at)",
+    "CREATE INDEX IF NOT EXISTS media_saved_at ON media (saved_at)",
+    "CREATE INDEX IF NOT EXISTS media_digest ON media (digest)",
+    "CREATE INDEX IF NOT EXISTS media_path ON media (path)",
+)
+
+
+@dataclass
+class CatalogEntry:
+    path: str
+    digest: str | None
+    url: str
+    host: str
+    mime: str
+    size: int
+    width: int | None
+    height: int | None
+    saved_at: float
+
+
+_COLUMNS = ", ".join(f.name for f in fields(CatalogEntry))
+
+
+def catalog_path(save_dir: Path) -> Path:
+    return Path(save_dir) / CATALOG_NAME
+
+
+class MediaCatalog(SqliteWorker):
+    """Append-mostly table of saved files with indexed lookups."""
+    thread_name = "tzMCP-catalog-writer"
+
+    def init_schema(self, conn: sqlite3.Connection):
+        for statement in CATALOG_SCHEMA:
+            conn.execute(statement)
+
+    def record(self, entry: CatalogEntry):
+        """Queue ``entry`` for insertion; returns immediately."""
+        row = tuple(getattr(entry, f.name) for f in fields(CatalogEntry))
+        self.submit(lambda conn: conn.execute(
+            f"INSERT INTO media ({_COLUMNS}) VALUES ({', '.join('?' * len(row))})", row))
+
+    def forget(self, paths: list[str]):
+        """Queue removal of the rows for deleted files; a pack segment path drops every member in it."""
+        files = [(path,) for path in paths]
+        # Members are "<segment>#<offset>:<size>": an index range from "<segment>#" up to the next character.
+        segments = [(f"{path}{REF_SEP}", f"{path}{chr(ord(REF_SEP) + 1)}")
+                    for path in paths if path.endswith(SEGMENT_SUFFIX)]
+
+        def delete(conn):
+            conn.executemany("DELETE FROM media WHERE path = ?", files)
+            conn.executemany("DELETE FROM media WHERE path >= ? AND path < ?", segments)
+        self.submit(delete)
+
+    def paths(self) -> list[str]:
+        """Every distinct saved path (files and pack member references)."""
+        return self.read(lambda conn: [path for (path,) in conn.execute("SELECT DISTINCT path FROM media")])
+
+    def flush(self):
+        """Wait until every queued entry is committed."""
+        self.write(lambda conn: None)
+
+    @staticmethod
+    def _where(host, mime, since, until) -> tuple[str, list]:
+        clauses, args = [], []
+        if host:
+            clauses.append("(host = ? OR host LIKE ?)")
+            args += [host.lower(), f"%.{host.lower()}"]
+        if mime:
+            if mime.endswith("/"):
+                clauses.append("mime LIKE ?")
+                args.append(f"{mime}%")
+            else:
+                clauses.append("mime = ?")
+                args.append(mime)
+        if since is not None:
+            clauses.append("saved_at >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("saved_at < ?")
+            args.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def query(self, host: str | None = None, mime: str | None = None, since: float | None = None,
+              until: float | None = None, limit: int = 100, offset: int = 0) -> list[CatalogEntry]:
+        """Newest-first entries matching every given filter.
+
+        ``host`` also matches subdomains; a ``mime`` ending in ``/`` (``image/``)
+        matches the whole top-level type.
+        """
+        where, args = self._where(host, mime, since, until)
+        rows = self.read(lambda conn: conn.execute(
+            f"SELECT {_COLUMNS} FROM media{where} ORDER BY saved_at DESC, id DESC LIMIT ? OFFSET ?",
+            (*args, limit, offset)).fetchall())
+        return [CatalogEntry(*row) for row in rows]
+
+    def page(self, host: str | None = None, mime: str | None = None, until: float | None = None,
+             after: tuple | None = None, limit: int = 100) -> tuple[list[CatalogEntry], tuple | None]:
+        """Newest-first entries that come after the ``(saved_at, id)`` key ``after``, and the key of the last one.
+
+        Keyset pagination: however deep the page, SQLite seeks to it in the
+        index instead of stepping over every earlier row as OFFSET does.
+        """
+        where, args = self._after(*self._where(host, mime, None, until), after)
+        rows = self.read(lambda conn: conn.execute(
+            f"SELECT {_COLUMNS}, id FROM media{where} ORDER BY saved_at DESC, id DESC LIMIT ?",
+            (*args, limit)).fetchall())
+        return [CatalogEntry(*row[:-1]) for row in rows], ((rows[-1][-2], rows[-1][-1]) if rows else None)
+
+    def key_at(self, host: str | None = None, mime: str | None = None, until: float | None = None,
+               after: tuple | None = None, offset: int = 0) -> tuple | None:
+        """The ``(saved_at, id)`` key ``offset`` rows past ``after``; reads only index entries."""
+        where, args = self._after(*self._where(host, mime, None, until), after)
+        return self.read(lambda conn: conn.execute(
+            f"SELECT saved_at, id FROM media{where} ORDER BY saved_at DESC, id DESC LIMIT 1 OFFSET ?",
+            (*args, offset)).fetchone())
+
+    @staticmethod
+    def _after(where: str, args: list, after: tuple | None) -> tuple[str, list]:
+        if after is None:
+            return where, args
+        return f"{where} {'AND' if where else 'WHERE'} (saved_at, id) < (?, ?)", [*args, *after]
+
+    def count(self, host: str | None = None, mime: str | None = None,
+              since: float | None = None, until: float | None = None) -> int:
+        where, args = self._where(host, mime, since, until)
+        return self.read(lambda conn: conn.execute(f"SELECT COUNT(*) FROM media{where}", args).fetchone()[0])
+
+
+def _since(value: str) -> float:
+    """Parse ``30m`` / ``12h`` / ``7d`` or an ISO date into a timestamp."""
+    units = {"m": 60, "h": 3600, "d": 86_400}
+    if value[-1:] in units and value[:-1].isdigit():
+        return time.time() - int(value[:-1]) * units[value[-1]]
+    return datetime.fromisoformat(value).timestamp()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Query the tzMCP saved-media catalog")
+    parser.add_argument('--config', type=str, help='Path to YAML config file')
+    parser.add_argument('--save-dir', type=str, help='Save directory whose catalog to read (default: from config)')
+    parser.add_argument('--host', type=str, help='Only files from this domain (and its subdomains)')
+    parser.add_argument('--mime', type=str, help='MIME type, or a prefix such as image/')
+    parser.add_argument('--since', type=_since, help='Only files saved after this (30m, 12h, 7d or an ISO date)')
+    parser.add_argument('--limit', type=int, default=50, help='Maximum rows to list')
+    parser.add_argument('--count', action='store_true', help='Only print the number of matches')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.save_dir:
+        save_dir = Path(args.save_dir).resolve()
+    else:
+        save_dir = ConfigManager(Path(args.config).resolve() if args.config else None).load_config().save_dir
+    catalog = MediaCatalog(catalog_path(save_dir))
+    try:
+        if args.count:
+            print(catalog.count(args.host, args.mime, args.since))
+            return
+        for entry in catalog.query(args.host, args.mime, args.since, limit=args.limit):
+            when = datetime.fromtimestamp(entry.saved_at).isoformat(sep=" ", timespec="seconds")
+            dims = f"{entry.width}x{entry.height}" if entry.width else "-"
+            print(f"{when}  {entry.host:<30} {entry.mime:<24} {entry.size:>10} {dims:>11}  {entry.path}")
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# pylint: disable=logging-fstring-interpolation
+"""
+Watchdog glue for live config reloads.
+
+Kept out of ``save_media`` so watchdog is only imported once the addon
+actually starts watching the config file.
+"""
+from pathlib import Path
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from tzMCP.common_utils.log_config import log_proxy
+
+
+class ConfigChangeHandler(FileSystemEventHandler):
+    """Watchdog event handler class"""
+    def __init__(self, callback, file_name: str = "media_proxy_config.yaml"):
+        """Init and accept the callback function."""
+        self.callback = callback
+        self.file_name = file_name
+
+    def on_any_event(self, event):
+        """Process ANY change int the target directory."""
+        log_proxy.debug(f"[watchdog] Event: {event.event_type} → {event.src_path}")
+        if not event.is_directory and event.src_path.endswith(self.file_name):
+            self.callback()
+
+
+def start_config_watcher(config_path: Path, callback) -> Observer:
+    """Start a daemon observer that calls ``callback`` when ``config_path`` changes."""
+    observer = Observer()
+    observer.schedule(ConfigChangeHandler(callback, config_path.name), str(config_path.parent), recursive=False)
+    observer.daemon = True
+    observer.start()
+    return observer
@@ -0,0 +1,61 @@
+"""
+Inspect or change how the dedup index is sharded.
+
+    tzMCP-dedup-shards                      # show the current layout
+    tzMCP-dedup-shards --shards 8           # migrate to 8 shards
+    tzMCP-dedup-shards --save-dir D --shards 1   # un-shard a shared index
+
+Stop every proxy using the index before rebalancing.
+"""
+import argparse
+import sqlite3
+from pathlib import Path
+from tzMCP.paths import logs_dir
+from tzMCP.save_media_utils.dedup_store import MAX_SHARDS, rebalance, shard_paths, stored_shard_count
+from tzMCP.save_media_utils.hash_tracker import DEFAULT_DB_NAME, shared_db_path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="tzMCP dedup index shard tool")
+    location = parser.add_mutually_exclusive_group()
+    location.add_argument('--db', type=str, help='Path to the dedup database (default: the per-user index)')
+    location.add_argument('--save-dir', type=str, help='Use the shared index kept in this save directory')
+    parser.add_argument('--shards', type=int, help=f'Rebalance into this many shards (1-{MAX_SHARDS}; 1 = unsharded)')
+    return parser.parse_args(argv)
+
+
+def _db_path(args) -> Path:
+    if args.save_dir:
+        return shared_db_path(Path(args.save_dir).resolve())
+    if args.db:
+        return Path(args.db).resolve()
+    return logs_dir() / DEFAULT_DB_NAME
+
+
+def _digest_counts(db_path: Path, shards: int) -> list[int]:
+    paths = [db_path] if shards == 1 else shard_paths(db_path, shards)
+    counts = []
+    for path in paths:
+        if not path.exists():
+            counts.append(0)
+            continue
+        with sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True) as conn:
+            counts.append(conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0])
+    return counts
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_path = _db_path(args)
+    if args.shards is not None:
+        moved = rebalance(db_path, args.shards)
+        print(f"Moved {moved} digests.")
+    shards = stored_shard_count(db_path)
+    counts = _digest_counts(db_path, shards)
+    print(f"{db_path}: {shards} shard(s), {sum(counts)} digests")
+    if shards > 1:
+        print("per shard: " + ", ".join(str(c) for c in counts))
+
+
+if __name__ == "__main__":
+    main()
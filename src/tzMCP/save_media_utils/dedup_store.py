@@ -0,0 +1,361 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Thread-safe dedup stores.
+
+``SqliteDedupStore`` is a ``SqliteWorker``: one writer thread that
+group-commits queued writes, and a read-only connection per reading thread.
+``check_and_add`` is atomic: a digest is claimed by exactly one caller even
+when several race, including callers in other proxy processes sharing the
+file, because ``INSERT OR IGNORE`` lets SQLite decide.
+
+``ShardedDedupStore`` splits the digest space across K such stores by hash
+prefix, one file and one writer thread per shard, so inserts no longer
+queue behind a single write lock.  ``rebalance`` migrates an index between
+shard counts (including from and to the unsharded layout).
+
+Each digest carries first-seen / last-seen timestamps.  ``expire`` applies a
+retention policy in small chunks queued behind normal writes, and
+``vacuum`` reclaims the freed pages, so compaction never stalls capture.
+
+``MemoryDedupStore`` is the non-persistent equivalent, guarded by a lock.
+"""
+import heapq
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_proxy
+from tzMCP.gui_bits.config_manager import MAX_DEDUP_SHARDS
+from tzMCP.save_media_utils.sqlite_worker import SqliteWorker, BUSY_TIMEOUT
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS hashes (hash TEXT PRIMARY KEY, first_seen REAL, last_seen REAL)",
+    "CREATE TABLE IF NOT EXISTS url_memo ("
+    "url TEXT PRIMARY KEY, validators TEXT, verdict TEXT, path TEXT, seen_at REAL)",
+    "CREATE TABLE IF NOT EXISTS http_cache ("
+    "url TEXT PRIMARY KEY, path TEXT, mime TEXT, etag TEXT, last_modified TEXT, "
+    "stored_at REAL, expires_at REAL)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS file_index ("
+    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT)",
+)
+
+# Timestamp columns added after the first release; indexed for retention.
+SEEN_COLUMNS = ("first_seen", "last_seen")
+
+# Rows deleted per writer request while applying retention.
+EXPIRE_CHUNK = 5_000
+
+# VACUUM only once this share of the file is free pages.
+VACUUM_FREE_FRACTION = 0.25
+
+# A shard migration holds the main file's write lock while it copies digests;
+# other processes starting up wait this long for it to finish.
+MIGRATION_TIMEOUT = 600.0
+MIGRATION_CHUNK = 10_000
+MAX_SHARDS = MAX_DEDUP_SHARDS
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    """Create missing tables and upgrade old ``hashes`` tables with seen timestamps."""
+    for statement in SCHEMA:
+        conn.execute(statement)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(hashes)")}
+    missing = [column for column in SEEN_COLUMNS if column not in columns]
+    for column in missing:
+        conn.execute(f"ALTER TABLE hashes ADD COLUMN {column} REAL")
+    if missing:
+        # When an old digest was first seen is unknown; start its clock now.
+        now = time.time()
+        conn.execute("UPDATE hashes SET first_seen = ?, last_seen = ? WHERE first_seen IS NULL", (now, now))
+    for column in SEEN_COLUMNS:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS hashes_{column} ON hashes ({column})")
+
+
+class MemoryDedupStore:
+    """Process-local digest set; ``check_and_add`` is atomic across threads."""
+    persistent = False
+
+    def __init__(self):
+        self._hashes: set[str] = set()
+        self._lock = threading.Lock()
+
+    def contains(self, digest: str) -> bool:
+        return digest in self._hashes
+
+    def check_and_add(self, digest: str) -> bool:
+        """Return True if ``digest`` was already present; otherwise record it."""
+        with self._lock:
+            if digest in self._hashes:
+                return True
+            self._hashes.add(digest)
+            return False
+
+    def touch(self, digest: str):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteDedupStore(SqliteWorker):
+    """SQLite-backed digests with a single writer thread and per-thread readers."""
+    persistent = True
+    thread_name = "tzMCP-dedup-writer"
+
+    def init_schema(self, conn: sqlite3.Connection):
+        ensure_schema(conn)
+
+    # ------------------------------------------------------------------
+    # Dedup API
+    # ------------------------------------------------------------------
+    def contains(self, digest: str) -> bool:
+        return self.read(lambda conn: conn.execute("SELECT 1 FROM hashes WHERE hash = ?", (digest,)).fetchone()) is not None
+
+    def check_and_add(self, digest: str) -> bool:
+        """Return True if ``digest`` was already present; otherwise record it.
+
+        The read-only probe answers the common duplicate case without touching
+        the writer; a miss is settled by ``INSERT OR IGNORE`` on the writer
+        thread, so two racing callers cannot both claim the same digest.
+        """
+        if self.contains(digest):
+            self.touch(digest)
+            return True
+        now = time.time()
+        return self.write(lambda conn: conn.execute(
+            "INSERT OR IGNORE INTO hashes (hash, first_seen, last_seen) VALUES (?, ?, ?)", (digest, now, now)
+        ).rowcount == 0)
+
+    def add_many(self, digests) -> int:
+        """Insert ``digests`` in one write; returns how many were new."""
+        now = time.time()
+        rows = [(digest, now, now) for digest in digests]
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO hashes (hash, first_seen, last_seen) VALUES (?, ?, ?)", rows)
+            return conn.total_changes - before
+        return self.write(insert)
+
+    def touch(self, digest: str):
+        """Record that ``digest`` was seen again; queued, never waited on."""
+        now = time.time()
+        self.submit(lambda conn: conn.execute("UPDATE hashes SET last_seen = ? WHERE hash = ?", (now, digest)))
+
+    def count(self) -> int:
+        return self.read(lambda conn: conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0])
+
+    def expire(self, older_than: float | None = None, max_rows: int | None = None, by: str = "last_seen") -> int:
+        """Delete digests not seen since ``older_than`` and the oldest beyond ``max_rows``.
+
+        ``by`` is ``last_seen`` (least recently seen first) or ``first_seen``.
+        Deletes run in ``EXPIRE_CHUNK`` pieces so capture writes interleave.
+        Returns the number of rows removed.
+        """
+        if by not in SEEN_COLUMNS:
+            raise ValueError(f"by must be one of {SEEN_COLUMNS}")
+        removed = 0
+
+        def delete_chunk(where: str, args: tuple, limit: int) -> int:
+            return self.write(lambda conn: conn.execute(
+                f"DELETE FROM hashes WHERE rowid IN (SELECT rowid FROM hashes {where} ORDER BY {by} LIMIT ?)",
+                (*args, limit)).rowcount)
+
+        if older_than is not None:
+            while (n := delete_chunk(f"WHERE {by} < ?", (older_than,), EXPIRE_CHUNK)):
+                removed += n
+        if max_rows is not None:
+            excess = self.count() - max_rows
+            while excess > 0 and (n := delete_chunk("", (), min(excess, EXPIRE_CHUNK))):
+                removed += n
+                excess -= n
+        return removed
+
+    def vacuum(self, min_free_fraction: float = VACUUM_FREE_FRACTION) -> bool:
+        """Rebuild the file if enough of it is free pages; True if it ran."""
+        def maybe_vacuum(conn):
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not pages or free / pages < min_free_fraction:
+                return False
+            conn.execute("VACUUM")
+            return True
+        return self.write(maybe_vacuum, transactional=False)
+
+    def iter_digests(self):
+        """Yield every stored hex digest in ascending order (streamed from the primary-key index)."""
+        cursor = self._reader().execute("SELECT hash FROM hashes ORDER BY hash")
+        while chunk := cursor.fetchmany(MIGRATION_CHUNK):
+            for (digest,) in chunk:
+                yield digest
+
+# ----------------------------------------------------------------------
+# Sharding
+# ----------------------------------------------------------------------
+def shard_index(digest: str, shards: int) -> int:
+    """Shard for a hex digest, from its leading 16 bits (even for any shard count)."""
+    return int(digest[:4], 16) % shards
+
+
+def shard_paths(db_path: Path, shards: int) -> list[Path]:
+    """Shard files for ``db_path``; the count is in the name so layouts never collide."""
+    db_path = Path(db_path)
+    return [db_path.with_name(f"{db_path.stem}.shard{i:03d}-of-{shards:03d}{db_path.suffix}")
+            for i in range(shards)]
+
+
+def _read_shard_count(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'hash_shards'").fetchone()
+    return int(row[0]) if row else 1
+
+
+def stored_shard_count(db_path: Path) -> int:
+    """Shard count recorded in the main file (1 for an unsharded or missing index)."""
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return 1
+    with sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, timeout=BUSY_TIMEOUT) as conn:
+        try:
+            return _read_shard_count(conn)
+        except sqlite3.OperationalError:   # No meta table yet.
+            return 1
+
+
+def _remove_db_files(path: Path):
+    for candidate in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+        candidate.unlink(missing_ok=True)
+
+
+def rebalance(db_path: Path, shards: int) -> int:
+    """Move every digest of the index at ``db_path`` into ``shards`` shards.
+
+    ``shards=1`` means the unsharded layout (digests in the main file).  The
+    copy runs while holding the main file's write lock, and the new shard
+    count is committed in the same transaction that empties the old layout,
+    so a crash leaves the old layout authoritative.  Stop proxies using the
+    index first.  Returns the number of digests moved.
+    """
+    if not 1 <= shards <= MAX_SHARDS:
+        raise ValueError(f"shards must be between 1 and {MAX_SHARDS}")
+    db_path = Path(db_path).resolve()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    main = sqlite3.connect(db_path, timeout=MIGRATION_TIMEOUT, isolation_level=None)
+    try:
+        main.execute("PRAGMA journal_mode=WAL")
+        main.execute("BEGIN IMMEDIATE")
+        ensure_schema(main)
+        old = _read_shard_count(main)
+        if old == shards:    # Another process finished the same migration first.
+            main.execute("ROLLBACK")
+            return 0
+
+        sources = [main] if old == 1 else [sqlite3.connect(p) for p in shard_paths(db_path, old) if p.exists()]
+        targets = [main] if shards == 1 else [sqlite3.connect(p) for p in shard_paths(db_path, shards)]
+        for conn in (*sources, *targets):
+            if conn is not main:
+                conn.execute("PRAGMA journal_mode=WAL")
+                ensure_schema(conn)
+
+        moved = 0
+        for source in sources:
+            cursor = source.execute("SELECT hash, first_seen, last_seen FROM hashes")
+            while chunk := cursor.fetchmany(MIGRATION_CHUNK):
+                grouped = defaultdict(list)
+                for row in chunk:
+                    grouped[shard_index(row[0], len(targets))].append(row)
+                for index, rows in grouped.items():
+                    targets[index].executemany(
+                        "INSERT OR IGNORE INTO hashes (hash, first_seen, last_seen) VALUES (?, ?, ?)", rows)
+                moved += len(chunk)
+        for target in targets:
+            if target is not main:
+                target.commit()
+                target.close()
+        for source in sources:
+            if source is not main:
+                source.commit()
+                source.close()
+
+        if old == 1:
+            main.execute("DELETE FROM hashes")
+        main.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('hash_shards', ?)", (str(shards),))
+        main.execute("COMMIT")
+    except BaseException:
+        if main.in_transaction:
+            main.execute("ROLLBACK")
+        raise
+    finally:
+        main.close()
+
+    if old > 1:
+        for path in shard_paths(db_path, old):
+            _remove_db_files(path)
+    log_proxy.info(f"Rebalanced dedup index from {old} to {shards} shard(s); moved {moved} digests.")
+    return moved
+
+
+class ShardedDedupStore:
+    """Digests spread over ``shards`` SQLite files by hash prefix, one writer thread each.
+
+    The main file keeps the URL memo, archive-cache index and shard count;
+    ``read``/``write``/``submit`` go to it.  Opening with a shard count that
+    differs from the stored one migrates the index first (the proxy only
+    does so for a new index; see ``init_hash_db``).
+    """
+    persistent = True
+
+    def __init__(self, db_path: Path, shards: int):
+        if not 2 <= shards <= MAX_SHARDS:
+            raise ValueError(f"a sharded store needs between 2 and {MAX_SHARDS} shards")
+        self.db_path = Path(db_path).resolve()
+        if stored_shard_count(self.db_path) != shards:
+            rebalance(self.db_path, shards)
+        self.main = SqliteDedupStore(self.db_path)
+        self.shards = [SqliteDedupStore(path) for path in shard_paths(self.db_path, shards)]
+
+    def _shard(self, digest: str) -> SqliteDedupStore:
+        return self.shards[shard_index(digest, len(self.shards))]
+
+    def contains(self, digest: str) -> bool:
+        return self._shard(digest).contains(digest)
+
+    def check_and_add(self, digest: str) -> bool:
+        return self._shard(digest).check_and_add(digest)
+
+    def iter_digests(self):
+        return heapq.merge(*(shard.iter_digests() for shard in self.shards))
+
+    def add_many(self, digests) -> int:
+        grouped = defaultdict(list)
+        for digest in digests:
+            grouped[shard_index(digest, len(self.shards))].append(digest)
+        return sum(self.shards[index].add_many(group) for index, group in grouped.items())
+
+    def touch(self, digest: str):
+        self._shard(digest).touch(digest)
+
+    def count(self) -> int:
+        return sum(shard.count() for shard in self.shards)
+
+    def expire(self, older_than: float | None = None, max_rows: int | None = None, by: str = "last_seen") -> int:
+        """Apply retention per shard; ``max_rows`` is split evenly (digests are spread evenly)."""
+        per_shard = None if max_rows is None else max_rows // len(self.shards)
+        return sum(shard.expire(older_than, per_shard, by) for shard in self.shards)
+
+    def vacuum(self, min_free_fraction: float = VACUUM_FREE_FRACTION) -> bool:
+        ran = [shard.vacuum(min_free_fraction) for shard in self.shards]
+        return any(ran)
+
+    def submit(self, fn, transactional: bool = True):
+        return self.main.submit(fn, transactional)
+
+    def write(self, fn, transactional: bool = True):
+        return self.main.write(fn, transactional)
+
+    def read(self, fn):
+        return self.main.read(fn)
+
+    def close(self):
+        for store in (self.main, *self.shards):
+            store.close()
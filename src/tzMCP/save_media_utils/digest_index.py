@@ -0,0 +1,143 @@
+# pylint: disable=logging-fstring-interpolation
+"""
+In-memory warm-start index over a persistent dedup store.
+
+All known digests are loaded at startup into one packed, sorted ``bytes``
+buffer (32 bytes per SHA-256, so 10 million hashes cost ~320 MB instead of
+several GB of Python strings) and probed with binary search.  Digests added
+while running go into a small delta set that is merged into the sorted
+buffer on a background thread once it grows.
+
+The backing store stays authoritative: the index only answers "seen
+before" at memory speed.  A miss still goes through the store's atomic
+check-and-insert, so other processes sharing the store are never missed.
+After retention removes digests the index is rebuilt, so it never reports
+an expired digest as a duplicate.
+"""
+import heapq
+import threading
+from time import perf_counter
+from tzMCP.common_utils.log_config import log_proxy
+
+DIGEST_SIZE = 32
+
+# Merge the delta once it exceeds this many entries, or 1/16 of the index.
+MERGE_MIN = 50_000
+MERGE_FRACTION = 16
+
+
+class SortedDigestIndex:
+    """Packed sorted digests plus an unsorted delta; membership is safe from any thread."""
+
+    def __init__(self, digests=()):
+        """``digests`` must be raw 32-byte digests in ascending order."""
+        self._sorted = b"".join(digests)
+        self._delta: set[bytes] = set()
+        self._merging: frozenset[bytes] = frozenset()
+        self._merge_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sorted) // DIGEST_SIZE + len(self._merging) + len(self._delta)
+
+    def __contains__(self, digest: bytes) -> bool:
+        buf = self._sorted
+        lo, hi = 0, len(buf) // DIGEST_SIZE
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = buf[mid * DIGEST_SIZE:(mid + 1) * DIGEST_SIZE]
+            if probe < digest:
+                lo = mid + 1
+            elif probe > digest:
+                hi = mid
+            else:
+                return True
+        return digest in self._delta or digest in self._merging
+
+    def add(self, digest: bytes):
+        self._delta.add(digest)
+        if len(self._delta) >= max(MERGE_MIN, len(self._sorted) // DIGEST_SIZE // MERGE_FRACTION):
+            if self._merge_lock.acquire(blocking=False):
+                threading.Thread(target=self._merge_locked, name="tzMCP-digest-merge", daemon=True).start()
+
+    def merge(self):
+        """Fold the delta into the sorted buffer now."""
+        with self._merge_lock:
+            self._merge()
+
+    def _merge_locked(self):
+        try:
+            self._merge()
+        finally:
+            self._merge_lock.release()
+
+    def _merge(self):
+        # Freeze the current delta; new digests keep landing in a fresh set
+        # and lookups consult both while the merged buffer is built.
+        self._merging, self._delta = frozenset(self._delta), set()
+        if not self._merging:
+            return
+        start = perf_counter()
+        old = self._sorted
+        runs = (old[i:i + DIGEST_SIZE] for i in range(0, len(old), DIGEST_SIZE))
+        self._sorted = b"".join(heapq.merge(runs, sorted(self._merging)))
+        merged = len(self._merging)
+        self._merging = frozenset()
+        log_proxy.debug(f"[PROFILE] merged {merged} digests into index of {len(self)} in {perf_counter() - start:.3f}s")
+
+
+class WarmDedupStore:
+    """Wraps a persistent dedup store with a ``SortedDigestIndex`` loaded at startup."""
+    persistent = True
+
+    def __init__(self, store):
+        self.store = store
+        self.index = self._load()
+
+    def _load(self) -> SortedDigestIndex:
+        start = perf_counter()
+        index = SortedDigestIndex(bytes.fromhex(d) for d in self.store.iter_digests())
+        log_proxy.info(f"Loaded {len(index)} dedup digests into memory in {perf_counter() - start:.2f}s.")
+        return index
+
+    def contains(self, digest: str) -> bool:
+        return bytes.fromhex(digest) in self.index or self.store.contains(digest)
+
+    def check_and_add(self, digest: str) -> bool:
+        raw = bytes.fromhex(digest)
+        if raw in self.index:
+            self.store.touch(digest)
+            return True
+        seen = self.store.check_and_add(digest)
+        self.index.add(raw)
+        return seen
+
+    def iter_digests(self):
+        return self.store.iter_digests()
+
+    def touch(self, digest: str):
+        self.store.touch(digest)
+
+    def count(self) -> int:
+        return self.store.count()
+
+    def expire(self, older_than: float | None = None, max_rows: int | None = None, by: str = "last_seen") -> int:
+        removed = self.store.expire(older_than, max_rows, by)
+        if removed:
+            # Digests inserted while reloading are caught by the store on their next miss.
+            self.index = self._load()
+        return removed
+
+    def vacuum(self, *args) -> bool:
+        return self.store.vacuum(*args)
+
+    def submit(self, fn, transactional: bool = True):
+        return self.store.submit(fn, transactional)
+
+    def write(self, fn, transactional: bool = True):
+        return self.store.write(fn, transactional)
+
+    def read(self, fn):
+        return self.store.read(fn)
+
+    def close(self):
+        self.store.close()
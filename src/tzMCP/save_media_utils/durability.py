@@ -0,0 +1,158 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+How hard saves try to survive a crash or power loss.
+
+``none``     Rely on the OS to write back eventually (fastest; a power cut
+             can leave empty or missing files).
+``batched``  A background thread fsyncs saved files and their directories
+             in groups, every ``batch_files`` saves or ``batch_ms``
+             milliseconds, whichever comes first.  At most that window of
+             saves is at risk, at a fraction of per-file cost.
+``strict``   Each file is fsynced before it is renamed into place and its
+             directory right after, so a save that returned is on disk.
+"""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_proxy
+
+NONE, BATCHED, STRICT = "none", "batched", "strict"
+MODES = (NONE, BATCHED, STRICT)
+
+DEFAULT_BATCH_FILES = 64
+DEFAULT_BATCH_MS = 200
+
+
+def fsync_path(path: Path, directory: bool = False):
+    """fsync a file or directory by path (directories are skipped on Windows, which cannot open them)."""
+    if directory and sys.platform == "win32":
+        return
+    flags = os.O_RDWR if sys.platform == "win32" else os.O_RDONLY
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class FsyncBatcher:
+    """Group fsync on a background thread: files first, then the directories holding them."""
+
+    def __init__(self, max_files: int = DEFAULT_BATCH_FILES, max_delay_ms: int = DEFAULT_BATCH_MS):
+        self.max_files = max_files
+        self.max_delay = max_delay_ms / 1000
+        self._files: set[Path] = set()
+        self._dirs: set[Path] = set()
+        self._oldest = 0.0
+        self._synced = 0          # Highest flush() request already served.
+        self._requested = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="tzMCP-fsync", daemon=True)
+        self._thread.start()
+
+    def add(self, path: Path):
+        """Queue ``path`` and its parent directory for the next group fsync."""
+        path = Path(path)
+        with self._cond:
+            first = not self._files
+            if first:
+                self._oldest = time.monotonic()
+            self._files.add(path)
+            self._dirs.add(path.parent)
+            if first or len(self._files) >= self.max_files:
+                self._cond.notify_all()   # Start the delay clock, or sync a full batch now.
+
+    def flush(self):
+        """Block until everything queued so far is synced."""
+        with self._cond:
+            self._requested += 1
+            target = self._requested
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._synced >= target or self._closed)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._files or self._requested > self._synced or self._closed)
+                while not self._closed and self._requested <= self._synced and len(self._files) < self.max_files:
+                    remaining = self._oldest + self.max_delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                files, self._files = self._files, set()
+                dirs, self._dirs = self._dirs, set()
+                requested, closing = self._requested, self._closed
+            self._sync(files, dirs)
+            with self._cond:
+                self._synced = max(self._synced, requested)
+                self._cond.notify_all()
+            if closing and not self._files:
+                return
+
+    @staticmethod
+    def _sync(files, dirs):
+        if not files:
+            return
+        start = time.perf_counter()
+        for path in files:
+            try:
+                fsync_path(path)
+            except OSError as e:
+                log_proxy.warning(f"⚠ fsync failed for {path}: {e}")
+        for path in dirs:
+            try:
+                fsync_path(path, directory=True)
+            except OSError as e:
+                log_proxy.warning(f"⚠ fsync failed for directory {path}: {e}")
+        log_proxy.debug(f"[PROFILE] group fsync of {len(files)} files, {len(dirs)} dirs took {time.perf_counter() - start:.4f}s")
+
+    def close(self):
+        """Sync what is queued and stop the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+class Durability:
+    """The configured durability mode, applied around each save."""
+
+    def __init__(self, mode: str = NONE, batch_files: int = DEFAULT_BATCH_FILES, batch_ms: int = DEFAULT_BATCH_MS):
+        self.mode = mode if mode in MODES else NONE
+        self.batcher = FsyncBatcher(batch_files, batch_ms) if self.mode == BATCHED else None
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "Durability":
+        return cls(settings.get("mode", NONE), settings.get("batch_files", DEFAULT_BATCH_FILES),
+                   settings.get("batch_ms", DEFAULT_BATCH_MS))
+
+    def before_publish(self, f):
+        """Called with the still-open temp file before it is renamed into place."""
+        if self.mode == STRICT:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def after_publish(self, path: Path):
+        """Called once ``path`` has its final name."""
+        if self.mode == STRICT:
+            try:
+                fsync_path(Path(path).parent, directory=True)
+            except OSError as e:
+                log_proxy.warning(f"⚠ fsync failed for directory of {path}: {e}")
+        elif self.batcher:
+            self.batcher.add(path)
+
+    def appended(self, f, path: Path):
+        """Called after appending to the open file ``f`` at ``path`` (pack segments and their index)."""
+        if self.mode == STRICT:
+            f.flush()
+            os.fsync(f.fileno())
+        elif self.batcher:
+            self.batcher.add(path)
+
+    def close(self):
+        if self.batcher:
+            self.batcher.close()
@@ -0,0 +1,42 @@
+# pylint: disable=import-outside-toplevel
+"""
+Exclusive OS file locks shared by the processes writing one ``save_dir``.
+
+POSIX uses ``flock`` (per open file, so two handles in one process also
+exclude each other); Windows locks the first byte with ``msvcrt``, so lock
+a file while its position is at 0.  Closing the file releases the lock.
+"""
+import sys
+
+
+def try_lock(f) -> bool:
+    """Take a non-blocking exclusive lock on an open file; False if someone else holds it."""
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def lock(f):
+    """Wait for an exclusive lock on an open file."""
+    if sys.platform == "win32":
+        import msvcrt
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def unlock(f):
+    if sys.platform == "win32":
+        import msvcrt
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
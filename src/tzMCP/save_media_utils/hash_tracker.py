@@ -1,57 +1,159 @@
 # pylint: disable=global-statement,logging-fstring-interpolation,invalid-name
-import sqlite3
 import hashlib
+import time
 from pathlib import Path
-from tzMCP.common_utils.log_config import setup_logging, log_proxy
+from tzMCP.common_utils.log_config import log_proxy
 from tzMCP.paths import logs_dir
+from tzMCP.save_media_utils.dedup_store import (
+    MemoryDedupStore, SqliteDedupStore, ShardedDedupStore, stored_shard_count
+)
+from tzMCP.save_media_utils.digest_index import WarmDedupStore
+
+# Name of the dedup index shared by every proxy instance saving into one save_dir.
+SHARED_DB_NAME = ".tzmcp_dedup.sqlite"
+DEFAULT_DB_NAME = "hashes_seen.sqlite"
 
-setup_logging()
 _db = None
 
-def init_hash_db(persist: bool = True, db_path: Path = None):
-    """Initialize a hash database."""
+def shared_db_path(save_dir: Path) -> Path:
+    """Location of the dedup index shared by all instances writing to ``save_dir``."""
+    return Path(save_dir) / SHARED_DB_NAME
+
+def config_db_path(config) -> Path | None:
+    """The dedup database ``config`` selects, or None for in-memory dedup."""
+    if config.shared_dedup or config.proxy_workers > 1:
+        # One index per save_dir, so every proxy instance saving there dedups together.
+        return shared_db_path(config.save_dir)
+    if config.enable_persistent_dedup:
+        return logs_dir() / DEFAULT_DB_NAME
+    return None
+
+def init_hash_db(persist: bool = True, db_path: Path = None, shards: int = 1, warm: bool = True):
+    """Initialize a hash database, split across ``shards`` files when above 1.
+
+    ``shards`` only lays out a new index; an existing one is opened with the
+    shard count stored in it.
+
+    With ``warm`` the stored digests are loaded into an in-memory sorted index
+    so repeat lookups never touch SQLite.
+    """
     global _db
 
     # if SQLite Not used, Save hashes to Memory Set.
     if not persist:
-        _db = set()
+        _db = MemoryDedupStore()
         log_proxy.debug("Persistent DeDuping not enabled using in memory set().")
         return
 
     if db_path is None:
-        db_path = logs_dir() / "hashes_seen.sqlite"
+        db_path = logs_dir() / DEFAULT_DB_NAME
         log_proxy.debug(f"Dedupe DB setups at: {db_path}.")
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     log_proxy.info("Staring SQLite3 database and initializing.")
-    _db = sqlite3.connect(db_path)
-    _db.execute("CREATE TABLE IF NOT EXISTS hashes (hash TEXT PRIMARY KEY)")
-    _db.commit()
-
-def is_duplicate(content: bytes) -> bool:
-    """Generate a hash for a file, and compare to db to see if already in existence."""
-    h = hashlib.sha256(content).hexdigest()
-
-    if isinstance(_db, set):
-        if h in _db:
-            log_proxy.debug("Hash found in set this is a Duplicate file.")
-            return True
-        log_proxy.debug("Hash not found in set, adding.")
-        _db.add(h)
-        return False
-
-
-    cur = _db.execute("SELECT 1 FROM hashes WHERE hash = ?", (h,))
-    if cur.fetchone():
-        log_proxy.debug("Hash found in DB.")
+    if db_path.exists():
+        # An existing index keeps its layout; only tzMCP-dedup-shards migrates it (offline).
+        stored = stored_shard_count(db_path)
+        if stored != shards:
+            log_proxy.warning(f"Dedup index {db_path} has {stored} shard(s) but dedup_shards is {shards}; "
+                              f"keeping {stored}. Stop the proxy and run `tzMCP-dedup-shards --shards {shards}` "
+                              "to migrate.")
+            shards = stored
+    store = ShardedDedupStore(db_path, shards) if shards > 1 else SqliteDedupStore(db_path)
+    _db = WarmDedupStore(store) if warm else store
+
+def get_store():
+    """Return the active dedup store (None before ``init_hash_db``)."""
+    return _db
+
+def is_duplicate(content: bytes, digest: str | None = None) -> bool:
+    """Generate a hash for a file, and compare to db to see if already in existence.
+
+    Pass ``digest`` when the caller already has the SHA-256 hex digest.
+    Safe to call from any thread: the check and the insert are one atomic step.
+    """
+    h = digest or hashlib.sha256(content).hexdigest()
+    if _db.check_and_add(h):
+        log_proxy.debug("Hash found in store this is a Duplicate file.")
         return True
-    log_proxy.debug("Hash not foundin DB, adding.")
-    _db.execute("INSERT INTO hashes (hash) VALUES (?)", (h,))
-    _db.commit()
+    log_proxy.debug("Hash not found in store, added.")
     return False
 
+def load_url_memo(limit: int) -> list[tuple]:
+    """Return up to ``limit`` most recent URL memo rows, oldest first (empty without SQLite)."""
+    if not getattr(_db, "persistent", False):
+        return []
+    rows = _db.read(lambda conn: conn.execute(
+        "SELECT url, validators, verdict, path, seen_at FROM url_memo ORDER BY seen_at DESC LIMIT ?", (limit,)
+    ).fetchall())
+    return rows[::-1]
+
+def store_url_memo(rows: list[tuple], keep: int | None = None, wait: bool = True):
+    """Upsert ``rows`` into the persisted URL memo and keep only the newest ``keep`` entries.
+
+    Rows are merged rather than replaced so instances sharing the database do
+    not erase each other's entries.  With ``wait=False`` the write is only
+    queued to the writer thread (no-op without SQLite).
+    """
+    if not rows or not getattr(_db, "persistent", False):
+        return
+    def _merge(conn):
+        conn.executemany("INSERT OR REPLACE INTO url_memo VALUES (?, ?, ?, ?, ?)", rows)
+        if keep:
+            conn.execute(
+                "DELETE FROM url_memo WHERE url NOT IN "
+                "(SELECT url FROM url_memo ORDER BY seen_at DESC LIMIT ?)", (keep,)
+            )
+    (_db.write if wait else _db.submit)(_merge)
+    log_proxy.debug(f"Persisted {len(rows)} URL memo entries.")
+
+def load_http_cache(limit: int) -> list[tuple]:
+    """Return up to ``limit`` unexpired archive-cache rows, oldest first (empty without SQLite)."""
+    if not getattr(_db, "persistent", False):
+        return []
+    rows = _db.read(lambda conn: conn.execute(
+        "SELECT url, path, mime, etag, last_modified, stored_at, expires_at FROM http_cache "
+        "WHERE expires_at >= ? ORDER BY stored_at DESC LIMIT ?", (time.time(), limit)
+    ).fetchall())
+    return rows[::-1]
+
+def store_http_cache(rows: list[tuple], keep: int | None = None, wait: bool = True):
+    """Upsert ``rows`` into the archive-cache index, dropping expired entries and all but the newest ``keep``.
+
+    With ``wait=False`` the write is only queued (no-op without SQLite).
+    """
+    if not rows or not getattr(_db, "persistent", False):
+        return
+    def _merge(conn):
+        conn.executemany("INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.execute("DELETE FROM http_cache WHERE expires_at < ?", (time.time(),))
+        if keep:
+            conn.execute(
+                "DELETE FROM http_cache WHERE url NOT IN "
+                "(SELECT url FROM http_cache ORDER BY stored_at DESC LIMIT ?)", (keep,)
+            )
+    (_db.write if wait else _db.submit)(_merge)
+    log_proxy.debug(f"Persisted {len(rows)} archive cache entries.")
+
+def compact_hash_db(max_age_days: float = 0, max_rows: int = 0, by: str = "last_seen") -> int:
+    """Apply dedup retention and reclaim space; returns digests removed (0 without SQLite).
+
+    ``max_age_days`` / ``max_rows`` of 0 mean no limit.  Meant for a
+    background thread: deletes are chunked behind capture writes.
+    """
+    if not getattr(_db, "persistent", False):
+        return 0
+    start = time.perf_counter()
+    older_than = time.time() - max_age_days * 86_400 if max_age_days else None
+    removed = _db.expire(older_than, max_rows or None, by)
+    vacuumed = _db.vacuum()
+    log_proxy.info(f"🧹 Dedup compaction removed {removed} digests{' and vacuumed' if vacuumed else ''} "
+                   f"in {time.perf_counter() - start:.2f}s.")
+    return removed
+
 def shutdown_hash_db():
-    """Shutdown DB connection if it exists."""
-    if isinstance(_db, sqlite3.Connection):
+    """Stop the dedup store's writer thread and close its connections, if any."""
+    if getattr(_db, "persistent", False):
         log_proxy.info("Shutting down sqlite3 databse.")
+    if _db is not None:
         _db.close()
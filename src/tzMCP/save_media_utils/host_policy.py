@@ -0,0 +1,62 @@
+# pylint: disable=logging-fstring-interpolation
+"""
+Request-phase host decisions.
+
+Whitelist and blacklist rules only depend on the request host, so they can be
+decided in mitmproxy's ``request`` hook, before a response body exists.  The
+verdict is stored in ``flow.metadata`` and lets later hooks skip buffering,
+sniffing and every other check for that flow.
+"""
+from tzMCP.common_utils.log_config import log_proxy
+from tzMCP.save_media_utils.config_provider import get_config
+from tzMCP.save_media_utils.save_media_utils import _domain_matches
+
+VERDICT_KEY = "tzmcp_host_verdict"
+BLOCKED_BY_WHITELIST = "whitelist"
+BLOCKED_BY_BLACKLIST = "blacklist"
+
+
+class HostVerdicts:
+    """Per-host whitelist/blacklist verdicts, cached for the active config.
+
+    ``verdict()`` returns the rule that blocks the host, or ``None`` when the
+    host is allowed.  The cache is dropped when a different config object is
+    installed; ``ConfigManager.load_config()`` updates its config in place, so
+    callers that reload must also call ``clear()``.  It is bounded so random
+    subdomains cannot grow it without limit.
+    """
+
+    def __init__(self, max_hosts: int = 4096):
+        self.max_hosts = max_hosts
+        self._config = None
+        self._verdicts: dict[str, str | None] = {}
+
+    def verdict(self, host: str) -> str | None:
+        config = get_config()
+        if config is not self._config:
+            self._config = config
+            self._verdicts = {}
+
+        host = (host or "").lower()
+        try:
+            return self._verdicts[host]
+        except KeyError:
+            pass
+
+        result = None
+        whitelist = getattr(config, "whitelist", None)
+        blacklist = getattr(config, "blacklist", None)
+        if whitelist and not _domain_matches(host, whitelist):
+            result = BLOCKED_BY_WHITELIST
+        elif blacklist and _domain_matches(host, blacklist):
+            result = BLOCKED_BY_BLACKLIST
+
+        if len(self._verdicts) >= self.max_hosts:
+            self._verdicts.clear()
+        self._verdicts[host] = result
+        if result:
+            log_proxy.debug(f"Host {host} blocked by {result}; its flows will pass through unprocessed.")
+        return result
+
+    def clear(self):
+        self._verdicts = {}
@@ -0,0 +1,214 @@
+# pylint: disable=logging-fstring-interpolation
+"""
+Serve repeat media requests from the saved archive.
+
+When ``serve_from_archive`` is enabled, every saved response that is safe
+to reuse is indexed by URL together with the headers needed to replay it.
+A later request for the same URL is answered from disk while the entry is
+still fresh under HTTP caching rules (RFC 9111, private cache), so the
+browser never waits on the network for media we already have.  The body is
+read inside mitmproxy's request hook, so only files up to
+``MAX_SERVE_BYTES`` are served; larger ones are fetched upstream as usual.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from tzMCP.save_media_utils.pack_store import read_saved, saved_exists, saved_size
+from tzMCP.save_media_utils.url_memo import has_credentials, normalize_url
+
+CACHE_KEY = "tzmcp_cache_hit"
+
+# Without explicit freshness, reuse for 10% of the time since Last-Modified
+# (RFC 9111 section 4.2.2), but never longer than a day.
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_SECONDS = 86_400
+
+# Largest saved file answered from the archive (read on the proxy's event loop).
+MAX_SERVE_BYTES = 8 * 1024 * 1024
+
+
+def _cache_directives(value: str | None) -> dict[str, str | None]:
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def freshness_lifetime(headers, now: float | None = None) -> float:
+    """Seconds a response stays fresh from when it was received (0 if it must not be reused)."""
+    now = time.time() if now is None else now
+    directives = _cache_directives(headers.get("Cache-Control"))
+    if "no-cache" in directives or "no-store" in directives:
+        return 0.0
+    try:
+        age = max(0.0, float(headers.get("Age") or 0))
+    except ValueError:
+        age = 0.0
+
+    if directives.get("max-age"):
+        try:
+            return max(0.0, int(directives["max-age"]) - age)
+        except ValueError:
+            return 0.0
+
+    date = _http_date(headers.get("Date")) or now
+    expires = _http_date(headers.get("Expires"))
+    if headers.get("Expires") is not None:
+        return max(0.0, (expires or 0.0) - date - age)
+
+    last_modified = _http_date(headers.get("Last-Modified"))
+    if last_modified and last_modified < date:
+        return min(HEURISTIC_MAX_SECONDS, (date - last_modified) * HEURISTIC_FRACTION)
+    return 0.0
+
+
+def is_storable(request_headers, response_headers) -> bool:
+    """Whether a response may be replayed later for the same URL."""
+    if request_headers.get("Authorization"):
+        return False
+    if "no-store" in _cache_directives(response_headers.get("Cache-Control")):
+        return False
+    if response_headers.get("Set-Cookie"):
+        return False
+    # Bodies are stored decoded, so only content-encoding variance is harmless.
+    vary = {v.strip().lower() for v in (response_headers.get("Vary") or "").split(",") if v.strip()}
+    return vary <= {"accept-encoding"}
+
+
+def bypasses_cache(method: str, request_headers) -> bool:
+    """Requests that must always go upstream (non-GET, credentials, forced reloads)."""
+    if method != "GET" or request_headers.get("Authorization"):
+        return True
+    directives = _cache_directives(request_headers.get("Cache-Control"))
+    if "no-cache" in directives or "no-store" in directives or directives.get("max-age") == "0":
+        return True
+    return "no-cache" in (request_headers.get("Pragma") or "").lower()
+
+
+@dataclass
+class CacheEntry:
+    path: str
+    mime: str
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+    expires_at: float
+
+
+class ArchiveCache:
+    """Bounded LRU of ``normalized url -> CacheEntry`` pointing at saved files."""
+
+    def __init__(self, max_entries: int = 20_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self._dirty: set[str] = set()     # Keys changed since the last ``take_dirty``.
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def unsaved(self) -> int:
+        return len(self._dirty)
+
+    def store(self, url: str, path: Path, mime: str, request_headers, response_headers):
+        """Index a saved file for ``url`` if the response is reusable and has a lifetime."""
+        if not is_storable(request_headers, response_headers):
+            return
+        now = time.time()
+        lifetime = freshness_lifetime(response_headers, now)
+        if lifetime <= 0:
+            return
+        key = normalize_url(url)
+        self._entries[key] = CacheEntry(str(path), mime, response_headers.get("ETag"),
+                                        response_headers.get("Last-Modified"), now, now + lifetime)
+        self._entries.move_to_end(key)
+        self._dirty.add(key)
+        while len(self._entries) > self.max_entries:
+            self._dirty.discard(self._entries.popitem(last=False)[0])
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """Return a fresh entry whose file still exists, dropping stale ones."""
+        key = normalize_url(url)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.time() or not saved_exists(entry.path):
+            del self._entries[key]
+            self._dirty.discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def rows(self) -> list[tuple]:
+        return [(url, e.path, e.mime, e.etag, e.last_modified, e.stored_at, e.expires_at)
+                for url, e in self._entries.items()]
+
+    def take_dirty(self) -> list[tuple]:
+        """Rows (as in ``rows()``) changed since the last call and safe to persist."""
+        rows = [(url, e.path, e.mime, e.etag, e.last_modified, e.stored_at, e.expires_at)
+                for url, e in self._entries.items() if url in self._dirty and not has_credentials(url)]
+        self._dirty.clear()
+        return rows
+
+    def load_rows(self, rows):
+        now = time.time()
+        for url, *fields in rows:
+            entry = CacheEntry(*fields)
+            if entry.expires_at >= now:
+                self._entries[url] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def cached_response(entry: CacheEntry, request_headers,
+                    max_bytes: int = MAX_SERVE_BYTES) -> tuple[int, bytes, dict[str, str]] | None:
+    """Build ``(status, body, headers)`` for a cache hit, honouring conditional requests.
+
+    None when the saved file is gone or a full response would need more than ``max_bytes``.
+    """
+    now = time.time()
+    headers = {
+        "Content-Type": entry.mime,
+        # The full lifetime plus our Age leaves the client the same freshness we have left.
+        "Cache-Control": f"max-age={int(entry.expires_at - entry.stored_at)}",
+        "Age": str(int(now - entry.stored_at)),
+        "X-tzMCP-Cache": "HIT",
+    }
+    if entry.etag:
+        headers["ETag"] = entry.etag
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+
+    if_none_match = request_headers.get("If-None-Match")
+    if if_none_match is not None:
+        if entry.etag and (if_none_match.strip() == "*" or entry.etag in [t.strip() for t in if_none_match.split(",")]):
+            return 304, b"", headers
+    else:
+        since = _http_date(request_headers.get("If-Modified-Since"))
+        modified = _http_date(entry.last_modified)
+        if since and modified and modified <= since:
+            return 304, b"", headers
+
+    size = saved_size(entry.path)
+    if size is None or size > max_bytes:
+        return None
+    try:
+        body = read_saved(entry.path)
+    except OSError:
+        return None
+    headers["Content-Length"] = str(len(body))
+    return 200, body, headers
@@ -1,42 +1,70 @@
 # mime_categories.py
+from functools import cache
+from tzMCP.save_media_utils.mime_data_minimal import mime_to_extensions
 
-from tzMCP.save_media_utils.mime_data_minimal import MIME_TO_EXTENSIONS
+# Group names are static so config validation and the GUI never need the table.
+MIME_GROUP_NAMES = ("image", "video", "audio", "text", "document", "executable")
 
 # Build category sets based on standard and known nonstandard prefixes
 def _matches(mime: str, keyword: str) -> bool:
     return mime.startswith(f"{keyword}/") or keyword in mime
 
-# Define categories from MIME type prefixes and known patterns
-MIME_GROUPS = {
-    "image": {m for m in MIME_TO_EXTENSIONS if _matches(m, "image")},
-    "video": {m for m in MIME_TO_EXTENSIONS if _matches(m, "video")},
-    "audio": {m for m in MIME_TO_EXTENSIONS if _matches(m, "audio")},
-    "text":  {m for m in MIME_TO_EXTENSIONS if _matches(m, "text")},
-    "document": {
-        "application/pdf",
-        "application/msword",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "application/vnd.ms-excel",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        "application/vnd.ms-powerpoint",
-        "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        "application/epub+zip",
-    },
-    "executable": {
-        "application/x-msdownload",
-        "application/x-executable",
-        "application/x-sh",
-        "application/x-dosexec",
-        "application/x-elf",
-        "application/vnd.microsoft.portable-executable",
-        "application/x-mach-binary",
+@cache
+def mime_groups() -> dict[str, frozenset[str]]:
+    """Define categories from MIME type prefixes and known patterns (built on first use)."""
+    known = mime_to_extensions()
+    return {
+        "image": frozenset(m for m in known if _matches(m, "image")),
+        "video": frozenset(m for m in known if _matches(m, "video")),
+        "audio": frozenset(m for m in known if _matches(m, "audio")),
+        "text":  frozenset(m for m in known if _matches(m, "text")),
+        "document": frozenset({
+            "application/pdf",
+            "application/msword",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "application/vnd.ms-excel",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "application/vnd.ms-powerpoint",
+            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+            "application/epub+zip",
+        }),
+        "executable": frozenset({
+            "application/x-msdownload",
+            "application/x-executable",
+            "application/x-sh",
+            "application/x-dosexec",
+            "application/x-elf",
+            "application/vnd.microsoft.portable-executable",
+            "application/x-mach-binary",
+        }),
     }
+
+@cache
+def allowed_mime_types(groups: tuple[str, ...]) -> frozenset[str]:
+    """Union of the MIME types in ``groups``; cached per distinct group selection."""
+    table = mime_groups()
+    return frozenset().union(*(table.get(group, ()) for group in groups))
+
+def mime_group(mime: str) -> str | None:
+    """Name of the first group containing ``mime``, or None."""
+    for group, types in mime_groups().items():
+        if mime in types:
+            return group
+    return None
+
+# Optional: export individual sets if needed elsewhere (resolved lazily)
+_GROUP_ALIASES = {
+    "MIME_GROUPS": None,
+    "IMAGE_TYPES": "image",
+    "VIDEO_TYPES": "video",
+    "AUDIO_TYPES": "audio",
+    "TEXT_TYPES": "text",
+    "DOCUMENT_TYPES": "document",
+    "EXECUTABLE_TYPES": "executable",
 }
 
-# Optional: export individual sets if needed elsewhere
-IMAGE_TYPES = MIME_GROUPS["image"]
-VIDEO_TYPES = MIME_GROUPS["video"]
-AUDIO_TYPES = MIME_GROUPS["audio"]
-TEXT_TYPES  = MIME_GROUPS["text"]
-DOCUMENT_TYPES = MIME_GROUPS["document"]
-EXECUTABLE_TYPES = MIME_GROUPS["executable"]
+def __getattr__(name):
+    if name in _GROUP_ALIASES:
+        group = _GROUP_ALIASES[name]
+        return mime_groups() if group is None else mime_groups()[group]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
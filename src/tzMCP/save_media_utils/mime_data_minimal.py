@@ -1,2288 +1,41 @@
-MIME_TO_EXTENSIONS = {
-  "application/vnd.lotus-1-2-3": [
-    ".123"
-  ],
-  "text/vnd.in3d.3dml": [
-    ".3dml"
-  ],
-  "video/3gpp2": [
-    ".3g2"
-  ],
-  "image/avif": [
-    ".avif"
-  ],
-  "image/avif-sequence": [
-    ".avifs"
-  ],
-  "application/x-krita": [
-    ".kra",
-    ".krz"
-  ],
-  "image/heic": [
-    ".heif",
-    ".heic"
-  ],
-  "video/3gpp": [
-    ".3gp"
-  ],
-  "audio/3gpp2": [
-    ".3g2"
-  ],
-  "application/x-7z-compressed": [
-    ".7z"
-  ],
-  "application/octet-stream": [
-    ".bin",
-    ".a",
-    ".bpk",
-    ".deploy",
-    ".dist",
-    ".distz",
-    ".dmg",
-    ".dms",
-    ".dump",
-    ".elc",
-    ".lha",
-    ".lrf",
-    ".lzh",
-    ".o",
-    ".obj",
-    ".pkg",
-    ".so"
-  ],
-  "application/x-authorware-bin": [
-    ".aab",
-    ".u32",
-    ".vox",
-    ".x32"
-  ],
-  "image/x-icns": [
-    ".icns"
-  ],
-  "audio/mp4": [
-    ".mp4",
-    ".m4a",
-    ".m4b",
-    ".m4p",
-    ".m4r",
-    ".m4v",
-    ".mp4v",
-    ".3gp",
-    ".3g2",
-    ".3ga",
-    ".3gpa",
-    ".3gpp",
-    ".3gpp2",
-    ".3gp2"
-  ],
-  "audio/aac": [
-    ".aac",
-    ".m4a"
-  ],
-  "audio/mp4a-latm": [],
-  "audio/aacp": [
-    ".aacp"
-  ],
-  "application/x-authorware-map": [
-    ".aam"
-  ],
-  "application/x-authorware-seg": [
-    ".aas"
-  ],
-  "application/x-abiword": [
-    ".abw",
-    ".zabw",
-    ".abw.gz"
-  ],
-  "application/vnd.americandynamics.acc": [
-    ".acc"
-  ],
-  "application/x-ace-compressed": [
-    ".ace"
-  ],
-  "application/vnd.acucobol": [
-    ".acu"
-  ],
-  "application/vnd.acucorp": [
-    ".acutc",
-    ".atc"
-  ],
-  "audio/adpcm": [
-    ".adp"
-  ],
-  "application/vnd.audiograph": [
-    ".aep"
-  ],
-  "application/x-font-type1": [
-    ".afm",
-    ".pfa",
-    ".pfb",
-    ".pfm"
-  ],
-  "application/vnd.ibm.modcap": [
-    ".afp",
-    ".list3820",
-    ".listafp"
-  ],
-  "application/postscript": [
-    ".ai",
-    ".eps",
-    ".ps"
-  ],
-  "application/vnd.adobe.air-application-installer-package+zip": [
-    ".air"
-  ],
-  "application/vnd.amiga.ami": [
-    ".ami"
-  ],
-  "application/vnd.android.package-archive": [
-    ".apk"
-  ],
-  "application/x-ms-application": [
-    ".application"
-  ],
-  "application/vnd.lotus-approach": [
-    ".apr"
-  ],
-  "application/pgp-signature": [
-    ".asc",
-    ".sig"
-  ],
-  "video/x-ms-asf": [
-    ".asf",
-    ".asx"
-  ],
-  "text/x-asm": [
-    ".asm",
-    ".s"
-  ],
-  "application/vnd.accpac.simply.aso": [
-    ".aso"
-  ],
-  "application/atom+xml": [
-    ".atom"
-  ],
-  "application/atomcat+xml": [
-    ".atomcat"
-  ],
-  "application/atomsvc+xml": [
-    ".atomsvc"
-  ],
-  "application/vnd.antix.game-component": [
-    ".atx"
-  ],
-  "audio/basic": [
-    ".au",
-    ".snd"
-  ],
-  "video/x-msvideo": [
-    ".avi"
-  ],
-  "application/applixware": [
-    ".aw"
-  ],
-  "application/vnd.airzip.filesecure.azf": [
-    ".azf"
-  ],
-  "application/vnd.airzip.filesecure.azs": [
-    ".azs"
-  ],
-  "application/vnd.amazon.ebook": [
-    ".azw"
-  ],
-  "application/x-msdownload": [
-    ".exe",
-    ".msi"
-    ".com",
-    ".bat",
-    ".dll",
-  ],
-  "application/x-bcpio": [
-    ".bcpio"
-  ],
-  "application/x-font-bdf": [
-    ".bdf"
-  ],
-  "application/vnd.syncml.dm+wbxml": [
-    ".bdm"
-  ],
-  "application/vnd.fujitsu.oasysprs": [
-    ".bh2"
-  ],
-  "application/vnd.bmi": [
-    ".bmi"
-  ],
-  "image/bmp": [
-    ".bmp"
-  ],
-  "application/vnd.framemaker": [
-    ".book",
-    ".fm",
-    ".frame",
-    ".maker"
-  ],
-  "application/vnd.previewsystems.box": [
-    ".box"
-  ],
-  "application/x-bzip2": [
-    ".bz2"
-    ".boz",
-  ],
-  "image/prs.btif": [
-    ".btif"
-  ],
-  "application/x-bzip": [
-    ".bz"
-  ],
-  "text/x-c": [
-    ".c",
-    ".cc",
-    ".cpp",
-    ".cxx",
-    ".dic",
-    ".h",
-    ".hh"
-  ],
-  "application/vnd.clonk.c4group": [
-    ".c4d",
-    ".c4f",
-    ".c4g",
-    ".c4p",
-    ".c4u"
-  ],
-  "application/vnd.ms-cab-compressed": [
-    ".cab"
-  ],
-  "application/vnd.curl.car": [
-    ".car"
-  ],
-  "application/vnd.ms-pki.seccat": [
-    ".cat"
-  ],
-  "application/x-director": [
-    ".cct",
-    ".cst",
-    ".cxt",
-    ".dcr",
-    ".dir",
-    ".dxr",
-    ".fgd",
-    ".swa",
-    ".w3d"
-  ],
-  "application/ccxml+xml": [
-    ".ccxml"
-  ],
-  "application/vnd.contact.cmsg": [
-    ".cdbcmsg"
-  ],
-  "application/x-netcdf": [
-    ".cdf",
-    ".nc"
-  ],
-  "application/vnd.mediastation.cdkey": [
-    ".cdkey"
-  ],
-  "chemical/x-cdx": [
-    ".cdx"
-  ],
-  "application/vnd.chemdraw+xml": [
-    ".cdxml"
-  ],
-  "application/vnd.cinderella": [
-    ".cdy"
-  ],
-  "application/pkix-cert": [
-    ".cer"
-  ],
-  "image/cgm": [
-    ".cgm"
-  ],
-  "application/x-chat": [
-    ".chat"
-  ],
-  "application/vnd.ms-htmlhelp": [
-    ".chm"
-  ],
-  "application/vnd.kde.kchart": [
-    ".chrt"
-  ],
-  "chemical/x-cif": [
-    ".cif"
-  ],
-  "application/vnd.anser-web-certificate-issue-initiation": [
-    ".cii"
-  ],
-  "application/vnd.ms-artgalry": [
-    ".cil"
-  ],
-  "application/vnd.claymore": [
-    ".cla"
-  ],
-  "application/java-vm": [
-    ".class"
-  ],
-  "application/vnd.crick.clicker.keyboard": [
-    ".clkk"
-  ],
-  "application/vnd.crick.clicker.palette": [
-    ".clkp"
-  ],
-  "application/vnd.crick.clicker.template": [
-    ".clkt"
-  ],
-  "application/vnd.crick.clicker.wordbank": [
-    ".clkw"
-  ],
-  "application/vnd.crick.clicker": [
-    ".clkx"
-  ],
-  "application/x-msclip": [
-    ".clp"
-  ],
-  "application/vnd.cosmocaller": [
-    ".cmc"
-  ],
-  "chemical/x-cmdf": [
-    ".cmdf"
-  ],
-  "chemical/x-cml": [
-    ".cml"
-  ],
-  "application/vnd.yellowriver-custom-menu": [
-    ".cmp"
-  ],
-  "image/x-cmx": [
-    ".cmx"
-  ],
-  "application/vnd.rim.cod": [
-    ".cod"
-  ],
-  "text/plain": [
-    ".txt"
-    ".log",
-    ".conf",
-    ".text",
-    ".def",
-    ".diff",
-    ".in",
-    ".ksh",
-    ".list",
-    ".pl",
-  ],
-  "application/vnd.debian.binary-package": [
-    ".deb",
-    ".udeb"
-  ],
-  "text/markdown": [
-    ".md",
-    ".markdown",
-    ".mdown",
-    ".markdn"
-  ],
-  "application/wasm": [
-    ".wasm"
-  ],
-  "application/x-cpio": [
-    ".cpio"
-  ],
-  "application/mac-compactpro": [
-    ".cpt"
-  ],
-  "application/x-mscardfile": [
-    ".crd"
-  ],
-  "application/pkix-crl": [
-    ".crl"
-  ],
-  "application/x-x509-ca-cert": [
-    ".crt",
-    ".der"
-  ],
-  "application/x-csh": [
-    ".csh"
-  ],
-  "chemical/x-csml": [
-    ".csml"
-  ],
-  "application/vnd.commonspace": [
-    ".csp"
-  ],
-  "text/css": [
-    ".css"
-  ],
-  "text/csv": [
-    ".csv"
-  ],
-  "application/cu-seeme": [
-    ".cu"
-  ],
-  "text/vnd.curl": [
-    ".curl"
-  ],
-  "application/prs.cww": [
-    ".cww"
-  ],
-  "application/vnd.mobius.daf": [
-    ".daf"
-  ],
-  "application/vnd.fdsn.seed": [
-    ".dataless",
-    ".seed"
-  ],
-  "application/davmount+xml": [
-    ".davmount"
-  ],
-  "text/vnd.curl.dcurl": [
-    ".dcurl"
-  ],
-  "application/vnd.oma.dd2+xml": [
-    ".dd2"
-  ],
-  "application/vnd.fujixerox.ddd": [
-    ".ddd"
-  ],
-  "application/x-debian-package": [
-    ".deb",
-    ".udeb"
-  ],
-  "application/vnd.dreamfactory": [
-    ".dfac"
-  ],
-  "application/vnd.mobius.dis": [
-    ".dis"
-  ],
-  "image/vnd.djvu": [
-    ".djv",
-    ".djvu"
-  ],
-  "application/vnd.dna": [
-    ".dna"
-  ],
-  "application/msword": [
-    ".doc",
-    ".dot",
-    ".wiz"
-  ],
-  "application/vnd.ms-word.document.macroenabled.12": [
-    ".docm"
-  ],
-  "application/vnd.openxmlformats-officedocument.wordprocessingml.document": [
-    ".docx"
-  ],
-  "application/vnd.ms-word.template.macroenabled.12": [
-    ".dotm"
-  ],
-  "application/vnd.openxmlformats-officedocument.wordprocessingml.template": [
-    ".dotx"
-  ],
-  "application/vnd.osgi.dp": [
-    ".dp"
-  ],
-  "application/vnd.dpgraph": [
-    ".dpg"
-  ],
-  "text/prs.lines.tag": [
-    ".dsc"
-  ],
-  "application/x-dtbook+xml": [
-    ".dtb"
-  ],
-  "application/xml-dtd": [
-    ".dtd"
-  ],
-  "audio/vnd.dts": [
-    ".dts"
-  ],
-  "audio/vnd.dts.hd": [
-    ".dtshd"
-  ],
-  "application/x-dvi": [
-    ".dvi"
-  ],
-  "model/vnd.dwf": [
-    ".dwf"
-  ],
-  "image/vnd.dwg": [
-    ".dwg"
-  ],
-  "image/vnd.dxf": [
-    ".dxf"
-  ],
-  "application/vnd.spotfire.dxp": [
-    ".dxp"
-  ],
-  "audio/vnd.nuera.ecelp4800": [
-    ".ecelp4800"
-  ],
-  "audio/vnd.nuera.ecelp7470": [
-    ".ecelp7470"
-  ],
-  "audio/vnd.nuera.ecelp9600": [
-    ".ecelp9600"
-  ],
-  "application/ecmascript": [
-    ".ecma"
-  ],
-  "application/vnd.novadigm.edm": [
-    ".edm"
-  ],
-  "application/vnd.novadigm.edx": [
-    ".edx"
-  ],
-  "application/vnd.picsel": [
-    ".efif"
-  ],
-  "application/vnd.pg.osasli": [
-    ".ei6"
-  ],
-  "message/rfc822": [
-    ".eml",
-    ".mht",
-    ".mhtml",
-    ".mime",
-    ".nws"
-  ],
-  "application/emma+xml": [
-    ".emma"
-  ],
-  "audio/vnd.digital-winds": [
-    ".eol"
-  ],
-  "application/vnd.ms-fontobject": [
-    ".eot"
-  ],
-  "application/epub+zip": [
-    ".epub"
-  ],
-  "application/vnd.eszigno3+xml": [
-    ".es3",
-    ".et3"
-  ],
-  "application/vnd.epson.esf": [
-    ".esf"
-  ],
-  "text/x-setext": [
-    ".etx"
-  ],
-  "application/vnd.novadigm.ext": [
-    ".ext"
-  ],
-  "application/andrew-inset": [
-    ".ez"
-  ],
-  "application/vnd.ezpix-album": [
-    ".ez2"
-  ],
-  "application/vnd.ezpix-package": [
-    ".ez3"
-  ],
-  "text/x-fortran": [
-    ".f",
-    ".f77",
-    ".f90",
-    ".for"
-  ],
-  "video/x-f4v": [
-    ".f4v"
-  ],
-  "image/vnd.fastbidsheet": [
-    ".fbs"
-  ],
-  "application/vnd.fdf": [
-    ".fdf"
-  ],
-  "application/vnd.denovo.fcselayout-link": [
-    ".fe_launch"
-  ],
-  "application/vnd.fujitsu.oasysgp": [
-    ".fg5"
-  ],
-  "image/x-freehand": [
-    ".fh",
-    ".fh4",
-    ".fh5",
-    ".fh7",
-    ".fhc"
-  ],
-  "application/x-xfig": [
-    ".fig"
-  ],
-  "video/x-fli": [
-    ".fli"
-  ],
-  "application/vnd.micrografx.flo": [
-    ".flo"
-  ],
-  "video/x-flv": [
-    ".flv"
-  ],
-  "application/vnd.kde.kivio": [
-    ".flw"
-  ],
-  "text/vnd.fmi.flexstor": [
-    ".flx"
-  ],
-  "text/vnd.fly": [
-    ".fly"
-  ],
-  "application/vnd.frogans.fnc": [
-    ".fnc"
-  ],
-  "image/vnd.fpx": [
-    ".fpx"
-  ],
-  "application/vnd.fsc.weblaunch": [
-    ".fsc"
-  ],
-  "image/vnd.fst": [
-    ".fst"
-  ],
-  "application/vnd.fluxtime.clip": [
-    ".ftc"
-  ],
-  "application/vnd.anser-web-funds-transfer-initiation": [
-    ".fti"
-  ],
-  "video/vnd.fvt": [
-    ".fvt"
-  ],
-  "application/vnd.fuzzysheet": [
-    ".fzs"
-  ],
-  "image/g3fax": [
-    ".g3"
-  ],
-  "application/vnd.groove-account": [
-    ".gac"
-  ],
-  "model/vnd.gdl": [
-    ".gdl"
-  ],
-  "application/vnd.dynageo": [
-    ".geo"
-  ],
-  "application/vnd.geometry-explorer": [
-    ".gex",
-    ".gre"
-  ],
-  "application/vnd.geogebra.file": [
-    ".ggb"
-  ],
-  "application/vnd.geogebra.tool": [
-    ".ggt"
-  ],
-  "application/vnd.groove-help": [
-    ".ghf"
-  ],
-  "image/gif": [
-    ".gif"
-  ],
-  "application/vnd.groove-identity-message": [
-    ".gim"
-  ],
-  "application/vnd.gmx": [
-    ".gmx"
-  ],
-  "application/x-gnumeric": [
-    ".gnumeric"
-  ],
-  "application/vnd.flographit": [
-    ".gph"
-  ],
-  "application/vnd.grafeq": [
-    ".gqf",
-    ".gqs"
-  ],
-  "application/srgs": [
-    ".gram"
-  ],
-  "application/vnd.groove-injector": [
-    ".grv"
-  ],
-  "application/srgs+xml": [
-    ".grxml"
-  ],
-  "application/x-font-ghostscript": [
-    ".gsf"
-  ],
-  "application/x-gtar": [
-    ".gtar"
-  ],
-  "application/vnd.groove-tool-message": [
-    ".gtm"
-  ],
-  "model/vnd.gtw": [
-    ".gtw"
-  ],
-  "text/vnd.graphviz": [
-    ".gv"
-  ],
-  "application/x-gzip": [
-    ".gz",
-    ".tgz"
-  ],
-  "application/gzip": [
-    ".gz",
-    ".tgz"
-  ],
-  "video/h261": [
-    ".h261"
-  ],
-  "gcode": [
-    ".gcode"
-  ],
-  "video/h263": [
-    ".h263"
-  ],
-  "video/h264": [
-    ".h264"
-  ],
-  "application/vnd.hbci": [
-    ".hbci"
-  ],
-  "application/vnd.gerber": [
-    ".gbr"
-  ],
-  "application/x-hdf": [
-    ".hdf"
-  ],
-  "application/winhlp": [
-    ".hlp"
-  ],
-  "application/vnd.hp-hpgl": [
-    ".hpgl"
-  ],
-  "application/vnd.hp-hpid": [
-    ".hpid"
-  ],
-  "application/vnd.hp-hps": [
-    ".hps"
-  ],
-  "application/mac-binhex40": [
-    ".hqx"
-  ],
-  "application/vnd.kenameaapp": [
-    ".htke"
-  ],
-  "text/html": [
-    ".htm",
-    ".html"
-  ],
-  "application/vnd.yamaha.hv-dic": [
-    ".hvd"
-  ],
-  "application/vnd.yamaha.hv-voice": [
-    ".hvp"
-  ],
-  "application/vnd.yamaha.hv-script": [
-    ".hvs"
-  ],
-  "application/vnd.iccprofile": [
-    ".icc",
-    ".icm"
-  ],
-  "x-conference/x-cooltalk": [
-    ".ice"
-  ],
-  "image/x-icon": [
-    ".ico"
-  ],
-  "text/calendar": [
-    ".ics",
-    ".ifb"
-  ],
-  "image/ief": [
-    ".ief"
-  ],
-  "application/vnd.shana.informed.formdata": [
-    ".ifm"
-  ],
-  "model/iges": [
-    ".iges",
-    ".igs"
-  ],
-  "application/vnd.igloader": [
-    ".igl"
-  ],
-  "application/vnd.micrografx.igx": [
-    ".igx"
-  ],
-  "application/vnd.shana.informed.interchange": [
-    ".iif"
-  ],
-  "application/vnd.accpac.simply.imp": [
-    ".imp"
-  ],
-  "application/vnd.ms-ims": [
-    ".ims"
-  ],
-  "application/vnd.shana.informed.package": [
-    ".ipk"
-  ],
-  "application/vnd.ibm.rights-management": [
-    ".irm"
-  ],
-  "application/vnd.irepository.package+xml": [
-    ".irp"
-  ],
-  "application/vnd.shana.informed.formtemplate": [
-    ".itp"
-  ],
-  "application/vnd.immervision-ivp": [
-    ".ivp"
-  ],
-  "application/vnd.immervision-ivu": [
-    ".ivu"
-  ],
-  "text/vnd.sun.j2me.app-descriptor": [
-    ".jad"
-  ],
-  "application/vnd.jam": [
-    ".jam"
-  ],
-  "application/java-archive": [
-    ".jar"
-  ],
-  "text/x-java-source": [
-    ".java"
-  ],
-  "application/vnd.jisp": [
-    ".jisp"
-  ],
-  "application/vnd.hp-jlyt": [
-    ".jlt"
-  ],
-  "application/x-java-jnlp-file": [
-    ".jnlp"
-  ],
-  "application/vnd.joost.joda-archive": [
-    ".joda"
-  ],
-  "image/jpeg": [
-    ".jpg",
-    ".jpe",
-    ".jpeg",
-    ".pjpg",
-    ".jfif",
-    ".jfif-tbnl",
-    ".jif"
-  ],
-  "image/pjpeg": [
-    ".pjpg",
-    ".jpe",
-    ".jpeg",
-    ".jpg",
-    ".jfi",
-    ".jfif",
-    ".jfif-tbnl",
-    ".jif"
-  ],
-  "video/jpm": [
-    ".jpgm",
-    ".jpm"
-  ],
-  "video/jpeg": [
-    ".jpgv"
-  ],
-  "application/x-trash": [],
-  "application/x-shellscript": [
-    ".sh"
-  ],
-  "text/javascript": [
-    ".js"
-  ],
-  "application/json": [
-    ".json"
-  ],
-  "audio/midi": [
-    ".midi",
-    ".kar",
-    ".mid",
-    ".rmi"
-  ],
-  "audio/aiff": [
-    ".aiff",
-    ".aif",
-    ".aff"
-  ],
-  "audio/opus": [
-    ".opus"
-  ],
-  "application/vnd.kde.karbon": [
-    ".karbon"
-  ],
-  "application/vnd.kde.kformula": [
-    ".kfo"
-  ],
-  "application/vnd.kidspiration": [
-    ".kia"
-  ],
-  "application/x-killustrator": [
-    ".kil"
-  ],
-  "application/vnd.google-earth.kml+xml": [
-    ".kml"
-  ],
-  "application/vnd.google-earth.kmz": [
-    ".kmz"
-  ],
-  "application/vnd.kinar": [
-    ".kne",
-    ".knp"
-  ],
-  "application/vnd.kde.kontour": [
-    ".kon"
-  ],
-  "application/vnd.kde.kpresenter": [
-    ".kpr",
-    ".kpt"
-  ],
-  "application/vnd.kde.kspread": [
-    ".ksp"
-  ],
-  "application/vnd.kahootz": [
-    ".ktr",
-    ".ktz"
-  ],
-  "application/vnd.kde.kword": [
-    ".kwd",
-    ".kwt"
-  ],
-  "application/x-latex": [
-    ".latex"
-  ],
-  "application/vnd.llamagraphics.life-balance.desktop": [
-    ".lbd"
-  ],
-  "application/vnd.llamagraphics.life-balance.exchange+xml": [
-    ".lbe"
-  ],
-  "application/vnd.hhe.lesson-player": [
-    ".les"
-  ],
-  "application/vnd.route66.link66+xml": [
-    ".link66"
-  ],
-  "application/lost+xml": [
-    ".lostxml"
-  ],
-  "application/vnd.ms-lrm": [
-    ".lrm"
-  ],
-  "application/vnd.frogans.ltf": [
-    ".ltf"
-  ],
-  "audio/vnd.lucent.voice": [
-    ".lvp"
-  ],
-  "application/vnd.lotus-wordpro": [
-    ".lwp"
-  ],
-  "application/x-msmediaview": [
-    ".m13",
-    ".m14",
-    ".mvb"
-  ],
-  "video/mpeg": [
-    ".m1v",
-    ".m2v",
-    ".mpa",
-    ".mpe",
-    ".mpeg",
-    ".mpg"
-  ],
-  "audio/mpeg": [
-    ".m2a",
-    ".m3a",
-    ".mp2",
-    ".mp2a",
-    ".mp3",
-    ".mpga"
-  ],
-  "audio/x-mpegurl": [
-    ".m3u"
-  ],
-  "video/vnd.mpegurl": [
-    ".m4u",
-    ".mxu"
-  ],
-  "video/x-m4v": [
-    ".m4v"
-  ],
-  "application/mathematica": [
-    ".ma",
-    ".mb",
-    ".nb"
-  ],
-  "application/vnd.ecowin.chart": [
-    ".mag"
-  ],
-  "text/troff": [
-    ".man",
-    ".me",
-    ".ms",
-    ".roff",
-    ".t",
-    ".tr"
-  ],
-  "application/mathml+xml": [
-    ".mathml",
-    ".mml"
-  ],
-  "text/mathml": [
-    ".mathml",
-    ".mml"
-  ],
-  "application/vnd.sqlite3": [
-    ".sqlite3",
-    ".db",
-    ".sqlite",
-    ".db-wal",
-    ".sqlite-wal",
-    ".db-shm",
-    ".sqlite-shm"
-  ],
-  "application/vnd.mobius.mbk": [
-    ".mbk"
-  ],
-  "application/mbox": [
-    ".mbox"
-  ],
-  "application/vnd.medcalcdata": [
-    ".mc1"
-  ],
-  "application/vnd.mcd": [
-    ".mcd"
-  ],
-  "text/vnd.curl.mcurl": [
-    ".mcurl"
-  ],
-  "application/x-msaccess": [
-    ".mdb"
-  ],
-  "image/vnd.ms-modi": [
-    ".mdi"
-  ],
-  "model/mesh": [
-    ".mesh",
-    ".msh",
-    ".silo"
-  ],
-  "application/vnd.mfmp": [
-    ".mfm"
-  ],
-  "application/vnd.proteus.magazine": [
-    ".mgz"
-  ],
-  "application/vnd.mif": [
-    ".mif"
-  ],
-  "video/mj2": [
-    ".mj2",
-    ".mjp2"
-  ],
-  "application/vnd.dolby.mlp": [
-    ".mlp"
-  ],
-  "application/vnd.chipnuts.karaoke-mmd": [
-    ".mmd"
-  ],
-  "application/vnd.smaf": [
-    ".mmf"
-  ],
-  "image/vnd.fujixerox.edmics-mmr": [
-    ".mmr"
-  ],
-  "application/x-msmoney": [
-    ".mny"
-  ],
-  "application/x-mobipocket-ebook": [
-    ".mobi",
-    ".prc"
-  ],
-  "video/quicktime": [
-    ".mov",
-    ".qt"
-  ],
-  "video/x-sgi-movie": [
-    ".movie"
-  ],
-  "video/mp4": [
-    ".mp4",
-    ".mp4v",
-    ".mpg4"
-  ],
-  "application/x-iso9660-image": [
-    ".iso",
-    ".isoimg",
-    ".cdr"
-  ],
-  "application/yaml": [
-    ".yaml",
-    ".yml"
-  ],
-  "application/mp4": [
-    ".mp4s"
-  ],
-  "application/vnd.mophun.certificate": [
-    ".mpc"
-  ],
-  "application/vnd.apple.installer+xml": [
-    ".mpkg"
-  ],
-  "application/vnd.blueice.multipass": [
-    ".mpm"
-  ],
-  "application/vnd.mophun.application": [
-    ".mpn"
-  ],
-  "application/vnd.ms-project": [
-    ".mpp",
-    ".mpt"
-  ],
-  "application/vnd.ibm.minipay": [
-    ".mpy"
-  ],
-  "application/vnd.mobius.mqy": [
-    ".mqy"
-  ],
-  "application/marc": [
-    ".mrc"
-  ],
-  "application/mediaservercontrol+xml": [
-    ".mscml"
-  ],
-  "application/vnd.fdsn.mseed": [
-    ".mseed"
-  ],
-  "application/vnd.mseq": [
-    ".mseq"
-  ],
-  "application/vnd.epson.msf": [
-    ".msf"
-  ],
-  "application/vnd.mobius.msl": [
-    ".msl"
-  ],
-  "application/vnd.muvee.style": [
-    ".msty"
-  ],
-  "model/vnd.mts": [
-    ".mts"
-  ],
-  "application/vnd.musician": [
-    ".mus"
-  ],
-  "application/vnd.recordare.musicxml+xml": [
-    ".musicxml"
-  ],
-  "application/vnd.mfer": [
-    ".mwf"
-  ],
-  "application/mxf": [
-    ".mxf"
-  ],
-  "application/vnd.recordare.musicxml": [
-    ".mxl"
-  ],
-  "application/xv+xml": [
-    ".mxml",
-    ".xhvml",
-    ".xvm",
-    ".xvml"
-  ],
-  "application/vnd.triscape.mxs": [
-    ".mxs"
-  ],
-  "application/vnd.nokia.n-gage.symbian.install": [
-    ".n-gage"
-  ],
-  "application/x-dtbncx+xml": [
-    ".ncx"
-  ],
-  "application/vnd.nokia.n-gage.data": [
-    ".ngdat"
-  ],
-  "application/vnd.neurolanguage.nlu": [
-    ".nlu"
-  ],
-  "application/vnd.enliven": [
-    ".nml"
-  ],
-  "application/vnd.noblenet-directory": [
-    ".nnd"
-  ],
-  "application/vnd.noblenet-sealer": [
-    ".nns"
-  ],
-  "application/vnd.noblenet-web": [
-    ".nnw"
-  ],
-  "image/vnd.net-fpx": [
-    ".npx"
-  ],
-  "application/vnd.lotus-notes": [
-    ".nsf"
-  ],
-  "application/vnd.fujitsu.oasys2": [
-    ".oa2"
-  ],
-  "application/vnd.fujitsu.oasys3": [
-    ".oa3"
-  ],
-  "application/vnd.fujitsu.oasys": [
-    ".oas"
-  ],
-  "application/x-msbinder": [
-    ".obd"
-  ],
-  "application/oda": [
-    ".oda"
-  ],
-  "application/vnd.oasis.opendocument.database": [
-    ".odb"
-  ],
-  "application/vnd.oasis.opendocument.chart": [
-    ".odc"
-  ],
-  "application/vnd.oasis.opendocument.formula": [
-    ".odf"
-  ],
-  "application/vnd.oasis.opendocument.formula-template": [
-    ".odft"
-  ],
-  "application/vnd.oasis.opendocument.graphics": [
-    ".odg"
-  ],
-  "application/vnd.oasis.opendocument.image": [
-    ".odi"
-  ],
-  "application/vnd.oasis.opendocument.presentation": [
-    ".odp"
-  ],
-  "application/vnd.oasis.opendocument.spreadsheet": [
-    ".ods"
-  ],
-  "application/vnd.oasis.opendocument.text": [
-    ".odt"
-  ],
-  "audio/ogg": [
-    ".ogg",
-    ".oga",
-    ".spx"
-  ],
-  "video/x-matroska": [
-    ".mkv"
-  ],
-  "audio/x-matroska": [
-    ".mka"
-  ],
-  "video/ogg": [
-    ".ogv"
-  ],
-  "application/ogg": [
-    ".ogx"
-  ],
-  "application/onenote": [
-    ".onepkg",
-    ".onetmp",
-    ".onetoc",
-    ".onetoc2"
-  ],
-  "application/oebps-package+xml": [
-    ".opf"
-  ],
-  "application/vnd.palm": [
-    ".oprc",
-    ".pdb",
-    ".pqa"
-  ],
-  "application/vnd.lotus-organizer": [
-    ".org"
-  ],
-  "application/vnd.yamaha.openscoreformat": [
-    ".osf"
-  ],
-  "application/vnd.yamaha.openscoreformat.osfpvg+xml": [
-    ".osfpvg"
-  ],
-  "application/vnd.oasis.opendocument.chart-template": [
-    ".otc"
-  ],
-  "font/woff": [
-    ".woff"
-  ],
-  "font/woff2": [
-    ".woff2"
-  ],
-  "application/x-redhat-package-manager": [
-    ".rpa"
-  ],
-  "application/x-perl": [
-    ".pm",
-    ".pl"
-  ],
-  "audio/webm": [
-    ".weba"
-  ],
-  "video/webm": [
-    ".webm"
-  ],
-  "image/webp": [
-    ".webp"
-  ],
-  "application/x-font-otf": [
-    ".otf"
-  ],
-  "font/otf": [
-    ".otf"
-  ],
-  "application/vnd.oasis.opendocument.graphics-template": [
-    ".otg"
-  ],
-  "application/vnd.oasis.opendocument.text-web": [
-    ".oth"
-  ],
-  "application/vnd.oasis.opendocument.image-template": [
-    ".oti"
-  ],
-  "application/vnd.oasis.opendocument.text-master": [
-    ".otm"
-  ],
-  "application/vnd.oasis.opendocument.presentation-template": [
-    ".otp"
-  ],
-  "application/vnd.oasis.opendocument.spreadsheet-template": [
-    ".ots"
-  ],
-  "application/vnd.oasis.opendocument.text-template": [
-    ".ott"
-  ],
-  "application/vnd.openofficeorg.extension": [
-    ".oxt"
-  ],
-  "text/x-pascal": [
-    ".p",
-    ".pas",
-    ".pp",
-    ".inc"
-  ],
-  "application/pkcs10": [
-    ".p10"
-  ],
-  "application/x-pkcs12": [
-    ".p12",
-    ".pfx"
-  ],
-  "application/x-pkcs7-certificates": [
-    ".p7b",
-    ".spc"
-  ],
-  "application/pkcs7-mime": [
-    ".p7c",
-    ".p7m"
-  ],
-  "application/x-pkcs7-certreqresp": [
-    ".p7r"
-  ],
-  "application/pkcs7-signature": [
-    ".p7s"
-  ],
-  "application/vnd.powerbuilder6": [
-    ".pbd"
-  ],
-  "image/x-portable-bitmap": [
-    ".pbm"
-  ],
-  "application/x-font-pcf": [
-    ".pcf"
-  ],
-  "application/vnd.hp-pcl": [
-    ".pcl"
-  ],
-  "application/vnd.hp-pclxl": [
-    ".pclxl"
-  ],
-  "image/x-pict": [
-    ".pct",
-    ".pic"
-  ],
-  "application/vnd.curl.pcurl": [
-    ".pcurl"
-  ],
-  "image/x-pcx": [
-    ".pcx"
-  ],
-  "application/pdf": [
-    ".pdf"
-  ],
-  "application/font-tdpfr": [
-    ".pfr"
-  ],
-  "image/x-portable-graymap": [
-    ".pgm"
-  ],
-  "application/x-chess-pgn": [
-    ".pgn"
-  ],
-  "application/pgp-encrypted": [
-    ".pgp"
-  ],
-  "application/pkixcmp": [
-    ".pki"
-  ],
-  "application/pkix-pkipath": [
-    ".pkipath"
-  ],
-  "application/vnd.3gpp.pic-bw-large": [
-    ".plb"
-  ],
-  "application/vnd.mobius.plc": [
-    ".plc"
-  ],
-  "application/vnd.pocketlearn": [
-    ".plf"
-  ],
-  "application/pls+xml": [
-    ".pls"
-  ],
-  "application/vnd.ctc-posml": [
-    ".pml"
-  ],
-  "image/png": [
-    ".png"
-  ],
-  "image/x-portable-anymap": [
-    ".pnm"
-  ],
-  "application/vnd.macports.portpkg": [
-    ".portpkg"
-  ],
-  "application/vnd.ms-powerpoint": [
-    ".pot",
-    ".ppa",
-    ".pps",
-    ".ppt",
-    ".pwz"
-  ],
-  "application/vnd.ms-powerpoint.template.macroenabled.12": [
-    ".potm"
-  ],
-  "application/vnd.openxmlformats-officedocument.presentationml.template": [
-    ".potx"
-  ],
-  "application/vnd.ms-powerpoint.addin.macroenabled.12": [
-    ".ppam"
-  ],
-  "application/vnd.cups-ppd": [
-    ".ppd"
-  ],
-  "image/x-portable-pixmap": [
-    ".ppm"
-  ],
-  "application/vnd.ms-powerpoint.slideshow.macroenabled.12": [
-    ".ppsm"
-  ],
-  "application/vnd.openxmlformats-officedocument.presentationml.slideshow": [
-    ".ppsx"
-  ],
-  "application/vnd.ms-powerpoint.presentation.macroenabled.12": [
-    ".pptm"
-  ],
-  "application/vnd.openxmlformats-officedocument.presentationml.presentation": [
-    ".pptx"
-  ],
-  "application/vnd.lotus-freelance": [
-    ".pre"
-  ],
-  "application/pics-rules": [
-    ".prf"
-  ],
-  "application/prql": [
-    ".prql"
-  ],
-  "application/vnd.3gpp.pic-bw-small": [
-    ".psb"
-  ],
-  "image/vnd.adobe.photoshop": [
-    ".psd"
-  ],
-  "application/x-font-linux-psf": [
-    ".psf"
-  ],
-  "application/vnd.pvi.ptid1": [
-    ".ptid"
-  ],
-  "application/x-mspublisher": [
-    ".pub"
-  ],
-  "application/vnd.3gpp.pic-bw-var": [
-    ".pvb"
-  ],
-  "application/vnd.3m.post-it-notes": [
-    ".pwn"
-  ],
-  "text/x-python": [
-    ".py",
-    ".pyc",
-    ".pyo",
-    ".pyd",
-    ".whl"
-  ],
-  "audio/vnd.ms-playready.media.pya": [
-    ".pya"
-  ],
-  "video/vnd.ms-playready.media.pyv": [
-    ".pyv"
-  ],
-  "application/vnd.epson.quickanime": [
-    ".qam"
-  ],
-  "application/vnd.intu.qbo": [
-    ".qbo"
-  ],
-  "application/vnd.intu.qfx": [
-    ".qfx"
-  ],
-  "application/vnd.publishare-delta-tree": [
-    ".qps"
-  ],
-  "application/vnd.quark.quarkxpress": [
-    ".qwd",
-    ".qwt",
-    ".qxb",
-    ".qxd",
-    ".qxl",
-    ".qxt"
-  ],
-  "audio/x-pn-realaudio": [
-    ".ra",
-    ".ram"
-  ],
-  "application/vnd.rar": [
-    ".rar"
-  ],
-  "application/x-rar-compressed": [
-    ".rar"
-  ],
-  "image/x-cmu-raster": [
-    ".ras"
-  ],
-  "application/vnd.ipunplugged.rcprofile": [
-    ".rcprofile"
-  ],
-  "application/rdf+xml": [
-    ".rdf"
-  ],
-  "application/vnd.data-vision.rdz": [
-    ".rdz"
-  ],
-  "application/vnd.businessobjects": [
-    ".rep"
-  ],
-  "application/x-dtbresource+xml": [
-    ".res"
-  ],
-  "image/x-rgb": [
-    ".rgb"
-  ],
-  "application/reginfo+xml": [
-    ".rif"
-  ],
-  "application/resource-lists+xml": [
-    ".rl"
-  ],
-  "image/vnd.fujixerox.edmics-rlc": [
-    ".rlc"
-  ],
-  "application/resource-lists-diff+xml": [
-    ".rld"
-  ],
-  "application/vnd.rn-realmedia": [
-    ".rm"
-  ],
-  "audio/x-pn-realaudio-plugin": [
-    ".rmp"
-  ],
-  "application/vnd.jcp.javame.midlet-rms": [
-    ".rms"
-  ],
-  "application/relax-ng-compact-syntax": [
-    ".rnc"
-  ],
-  "application/x-rpm": [
-    ".rpm"
-  ],
-  "application/vnd.nokia.radio-presets": [
-    ".rpss"
-  ],
-  "application/vnd.nokia.radio-preset": [
-    ".rpst"
-  ],
-  "application/sparql-query": [
-    ".rq"
-  ],
-  "application/rls-services+xml": [
-    ".rs"
-  ],
-  "application/rsd+xml": [
-    ".rsd"
-  ],
-  "application/rss+xml": [
-    ".rss",
-    ".xml"
-  ],
-  "application/rtf": [
-    ".rtf"
-  ],
-  "text/richtext": [
-    ".rtx"
-  ],
-  "application/vnd.yamaha.smaf-audio": [
-    ".saf"
-  ],
-  "application/sbml+xml": [
-    ".sbml"
-  ],
-  "application/vnd.ibm.secure-container": [
-    ".sc"
-  ],
-  "application/x-msschedule": [
-    ".scd"
-  ],
-  "application/vnd.lotus-screencam": [
-    ".scm"
-  ],
-  "application/scvp-cv-request": [
-    ".scq"
-  ],
-  "application/scvp-cv-response": [
-    ".scs"
-  ],
-  "text/vnd.curl.scurl": [
-    ".scurl"
-  ],
-  "application/vnd.stardivision.draw": [
-    ".sda"
-  ],
-  "application/vnd.stardivision.calc": [
-    ".sdc"
-  ],
-  "application/vnd.stardivision.impress": [
-    ".sdd"
-  ],
-  "application/vnd.solent.sdkm+xml": [
-    ".sdkd",
-    ".sdkm"
-  ],
-  "application/sdp": [
-    ".sdp"
-  ],
-  "application/vnd.stardivision.writer": [
-    ".sdw",
-    ".vor"
-  ],
-  "application/vnd.seemail": [
-    ".see"
-  ],
-  "application/vnd.sema": [
-    ".sema"
-  ],
-  "application/vnd.semd": [
-    ".semd"
-  ],
-  "application/vnd.semf": [
-    ".semf"
-  ],
-  "application/java-serialized-object": [
-    ".ser"
-  ],
-  "application/set-payment-initiation": [
-    ".setpay"
-  ],
-  "application/set-registration-initiation": [
-    ".setreg"
-  ],
-  "application/vnd.hydrostatix.sof-data": [
-    ".sfd-hdstx"
-  ],
-  "application/vnd.spotfire.sfs": [
-    ".sfs"
-  ],
-  "application/vnd.stardivision.writer-global": [
-    ".sgl"
-  ],
-  "text/sgml": [
-    ".sgm",
-    ".sgml"
-  ],
-  "application/x-sh": [
-    ".sh"
-  ],
-  "application/x-shar": [
-    ".shar"
-  ],
-  "application/shf+xml": [
-    ".shf"
-  ],
-  "text/vnd.wap.si": [
-    ".si"
-  ],
-  "application/vnd.wap.sic": [
-    ".sic"
-  ],
-  "application/vnd.symbian.install": [
-    ".sis",
-    ".sisx"
-  ],
-  "application/x-stuffit": [
-    ".sit"
-  ],
-  "application/x-stuffitx": [
-    ".sitx"
-  ],
-  "application/vnd.koan": [
-    ".skd",
-    ".skm",
-    ".skp",
-    ".skt"
-  ],
-  "text/vnd.wap.sl": [
-    ".sl"
-  ],
-  "application/vnd.wap.slc": [
-    ".slc"
-  ],
-  "application/vnd.ms-powerpoint.slide.macroenabled.12": [
-    ".sldm"
-  ],
-  "application/vnd.openxmlformats-officedocument.presentationml.slide": [
-    ".sldx"
-  ],
-  "application/vnd.epson.salt": [
-    ".slt"
-  ],
-  "application/vnd.stardivision.math": [
-    ".smf"
-  ],
-  "application/smil+xml": [
-    ".smi",
-    ".smil"
-  ],
-  "application/x-font-snf": [
-    ".snf"
-  ],
-  "application/vnd.yamaha.smaf-phrase": [
-    ".spf"
-  ],
-  "application/x-futuresplash": [
-    ".spl"
-  ],
-  "text/vnd.in3d.spot": [
-    ".spot"
-  ],
-  "application/scvp-vp-response": [
-    ".spp"
-  ],
-  "application/scvp-vp-request": [
-    ".spq"
-  ],
-  "application/x-wais-source": [
-    ".src"
-  ],
-  "application/sparql-results+xml": [
-    ".srx"
-  ],
-  "application/vnd.kodak-descriptor": [
-    ".sse"
-  ],
-  "application/vnd.epson.ssf": [
-    ".ssf"
-  ],
-  "application/ssml+xml": [
-    ".ssml"
-  ],
-  "application/vnd.sun.xml.calc.template": [
-    ".stc"
-  ],
-  "application/vnd.sun.xml.draw.template": [
-    ".std"
-  ],
-  "application/vnd.wt.stf": [
-    ".stf"
-  ],
-  "application/vnd.sun.xml.impress.template": [
-    ".sti"
-  ],
-  "application/hyperstudio": [
-    ".stk"
-  ],
-  "application/vnd.ms-pki.stl": [
-    ".stl"
-  ],
-  "application/vnd.pg.format": [
-    ".str"
-  ],
-  "application/vnd.sun.xml.writer.template": [
-    ".stw"
-  ],
-  "application/vnd.sus-calendar": [
-    ".sus",
-    ".susp"
-  ],
-  "application/x-sv4cpio": [
-    ".sv4cpio"
-  ],
-  "application/x-sv4crc": [
-    ".sv4crc"
-  ],
-  "application/vnd.svd": [
-    ".svd"
-  ],
-  "image/svg+xml": [
-    ".svg",
-    ".svgz"
-  ],
-  "application/x-shockwave-flash": [
-    ".swf"
-  ],
-  "application/vnd.arastra.swi": [
-    ".swi"
-  ],
-  "application/vnd.sun.xml.calc": [
-    ".sxc"
-  ],
-  "application/vnd.sun.xml.draw": [
-    ".sxd"
-  ],
-  "application/vnd.sun.xml.writer.global": [
-    ".sxg"
-  ],
-  "application/vnd.sun.xml.impress": [
-    ".sxi"
-  ],
-  "application/vnd.sun.xml.math": [
-    ".sxm"
-  ],
-  "application/vnd.sun.xml.writer": [
-    ".sxw"
-  ],
-  "application/vnd.tao.intent-module-archive": [
-    ".tao"
-  ],
-  "application/x-tar": [
-    ".tar"
-  ],
-  "application/vnd.3gpp2.tcap": [
-    ".tcap"
-  ],
-  "application/x-tcl": [
-    ".tcl"
-  ],
-  "application/vnd.smart.teacher": [
-    ".teacher"
-  ],
-  "application/x-tex": [
-    ".tex"
-  ],
-  "application/x-texinfo": [
-    ".texi",
-    ".texinfo"
-  ],
-  "application/x-tex-tfm": [
-    ".tfm"
-  ],
-  "image/tiff": [
-    ".tiff"
-    ".tif",
-  ],
-  "application/vnd.tmobile-livetv": [
-    ".tmo"
-  ],
-  "application/x-bittorrent": [
-    ".torrent"
-  ],
-  "application/vnd.groove-tool-template": [
-    ".tpl"
-  ],
-  "application/vnd.trid.tpt": [
-    ".tpt"
-  ],
-  "application/vnd.trueapp": [
-    ".tra"
-  ],
-  "application/x-msterminal": [
-    ".trm"
-  ],
-  "text/tab-separated-values": [
-    ".tsv"
-  ],
-  "application/x-font-ttf": [
-    ".ttf"
-    ".ttc",
-  ],
-  "application/vnd.simtech-mindmapper": [
-    ".twd",
-    ".twds"
-  ],
-  "application/vnd.genomatix.tuxedo": [
-    ".txd"
-  ],
-  "application/vnd.mobius.txf": [
-    ".txf"
-  ],
-  "application/vnd.ufdl": [
-    ".ufd",
-    ".ufdl"
-  ],
-  "test/mimetype": [
-    ".test"
-  ],
-  "application/vnd.umajin": [
-    ".umj"
-  ],
-  "application/vnd.unity": [
-    ".unityweb"
-  ],
-  "application/vnd.uoml+xml": [
-    ".uoml"
-  ],
-  "text/uri-list": [
-    ".uri",
-    ".uris",
-    ".urls"
-  ],
-  "application/x-ustar": [
-    ".ustar"
-  ],
-  "application/vnd.uiq.theme": [
-    ".utz"
-  ],
-  "text/x-uuencode": [
-    ".uu"
-  ],
-  "application/x-cdlink": [
-    ".vcd"
-  ],
-  "text/x-vcard": [
-    ".vcf"
-  ],
-  "application/vnd.groove-vcard": [
-    ".vcg"
-  ],
-  "text/x-vcalendar": [
-    ".vcs"
-  ],
-  "application/vnd.vcx": [
-    ".vcx"
-  ],
-  "application/vnd.visionary": [
-    ".vis"
-  ],
-  "video/vnd.vivo": [
-    ".viv"
-  ],
-  "model/vrml": [
-    ".vrml",
-    ".wrl"
-  ],
-  "application/vnd.visio": [
-    ".vsd",
-    ".vss",
-    ".vst",
-    ".vsw",
-    ".vsdx",
-    ".vssx",
-    ".vstx",
-    ".vssm",
-    ".vstm"
-  ],
-  "application/vnd.vsf": [
-    ".vsf"
-  ],
-  "model/vnd.vtu": [
-    ".vtu"
-  ],
-  "application/voicexml+xml": [
-    ".vxml"
-  ],
-  "application/x-doom": [
-    ".wad"
-  ],
-  "video/mp2t": [
-    ".ts"
-  ],
-  "audio/vnd.wav": [
-    ".wav"
-  ],
-  "audio/x-ms-wax": [
-    ".wax"
-  ],
-  "image/vnd.wap.wbmp": [
-    ".wbmp"
-  ],
-  "application/vnd.criticaltools.wbs+xml": [
-    ".wbs"
-  ],
-  "application/vnd.wap.wbxml": [
-    ".wbxml"
-  ],
-  "application/vnd.ms-works": [
-    ".wks",
-    ".wcm",
-    ".wdb",
-    ".wps"
-  ],
-  "video/x-ms-wm": [
-    ".wm"
-  ],
-  "audio/x-ms-wma": [
-    ".wma"
-  ],
-  "application/x-ms-wmd": [
-    ".wmd"
-  ],
-  "application/x-msmetafile": [
-    ".wmf"
-  ],
-  "text/vnd.wap.wml": [
-    ".wml"
-  ],
-  "application/vnd.wap.wmlc": [
-    ".wmlc"
-  ],
-  "text/vnd.wap.wmlscript": [
-    ".wmls"
-  ],
-  "application/vnd.wap.wmlscriptc": [
-    ".wmlsc"
-  ],
-  "video/x-ms-wmv": [
-    ".wmv"
-  ],
-  "video/x-ms-wmx": [
-    ".wmx"
-  ],
-  "application/x-ms-wmz": [
-    ".wmz"
-  ],
-  "application/vnd.wordperfect": [
-    ".wpd"
-  ],
-  "application/vnd.ms-wpl": [
-    ".wpl"
-  ],
-  "application/vnd.wqd": [
-    ".wqd"
-  ],
-  "application/x-mswrite": [
-    ".wri"
-  ],
-  "application/wsdl+xml": [
-    ".wsdl"
-  ],
-  "application/wspolicy+xml": [
-    ".wspolicy"
-  ],
-  "application/vnd.webturbo": [
-    ".wtb"
-  ],
-  "video/x-ms-wvx": [
-    ".wvx"
-  ],
-  "application/vnd.hzn-3d-crossword": [
-    ".x3d"
-  ],
-  "application/x-silverlight-app": [
-    ".xap"
-  ],
-  "application/vnd.xara": [
-    ".xar"
-  ],
-  "application/x-ms-xbap": [
-    ".xbap"
-  ],
-  "application/vnd.fujixerox.docuworks.binder": [
-    ".xbd"
-  ],
-  "image/x-xbitmap": [
-    ".xbm"
-  ],
-  "application/vnd.syncml.dm+xml": [
-    ".xdm"
-  ],
-  "application/vnd.adobe.xdp+xml": [
-    ".xdp"
-  ],
-  "application/vnd.fujixerox.docuworks": [
-    ".xdw"
-  ],
-  "application/xenc+xml": [
-    ".xenc"
-  ],
-  "application/patch-ops-error+xml": [
-    ".xer"
-  ],
-  "application/vnd.adobe.xfdf": [
-    ".xfdf"
-  ],
-  "application/vnd.xfdl": [
-    ".xfdl"
-  ],
-  "application/xhtml+xml": [
-    ".xht",
-    ".xhtml"
-  ],
-  "image/vnd.xiff": [
-    ".xif"
-  ],
-  "application/vnd.ms-excel": [
-    ".xls",
-    ".xla",
-    ".xlb",
-    ".xlc",
-    ".xlm",
-    ".xlt",
-    ".xlw"
-  ],
-  "application/vnd.ms-excel.addin.macroenabled.12": [
-    ".xlam"
-  ],
-  "application/vnd.ms-excel.sheet.binary.macroenabled.12": [
-    ".xlsb"
-  ],
-  "application/vnd.ms-excel.sheet.macroenabled.12": [
-    ".xlsm"
-  ],
-  "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": [
-    ".xlsx"
-  ],
-  "application/vnd.ms-excel.template.macroenabled.12": [
-    ".xltm"
-  ],
-  "application/vnd.openxmlformats-officedocument.spreadsheetml.template": [
-    ".xltx"
-  ],
-  "application/xml": [
-    ".xml",
-    ".xpdl",
-    ".xsl"
-  ],
-  "application/vnd.olpc-sugar": [
-    ".xo"
-  ],
-  "application/xop+xml": [
-    ".xop"
-  ],
-  "application/x-xpinstall": [
-    ".xpi"
-  ],
-  "image/x-xpixmap": [
-    ".xpm"
-  ],
-  "application/vnd.is-xpr": [
-    ".xpr"
-  ],
-  "application/vnd.ms-xpsdocument": [
-    ".xps"
-  ],
-  "application/vnd.intercon.formnet": [
-    ".xpw",
-    ".xpx"
-  ],
-  "application/xslt+xml": [
-    ".xslt"
-  ],
-  "application/vnd.syncml+xml": [
-    ".xsm"
-  ],
-  "application/xspf+xml": [
-    ".xspf"
-  ],
-  "application/vnd.mozilla.xul+xml": [
-    ".xul"
-  ],
-  "image/x-xwindowdump": [
-    ".xwd"
-  ],
-  "chemical/x-xyz": [
-    ".xyz"
-  ],
-  "application/vnd.zzazz.deck+xml": [
-    ".zaz"
-  ],
-  "application/zip": [
-    ".zip"
-  ],
-  "application/x-zip-compressed": [
-    ".zip"
-  ],
-  "application/zip-compressed": [
-    ".zip"
-  ],
-  "application/vnd.zul": [
-    ".zir",
-    ".zirz"
-  ],
-  "application/vnd.handheld-entertainment+xml": [
-    ".zmm"
-  ],
-  "image/x-adobe-dng": [
-    ".dng"
-  ],
-  "image/x-sony-arw": [
-    ".arw"
-  ],
-  "image/x-canon-cr2": [
-    ".cr2"
-  ],
-  "image/x-canon-crw": [
-    ".crw"
-  ],
-  "image/x-kodak-dcr": [
-    ".dcr"
-  ],
-  "image/x-epson-erf": [
-    ".erf"
-  ],
-  "image/x-kodak-k25": [
-    ".k25"
-  ],
-  "image/x-kodak-kdc": [
-    ".kdc"
-  ],
-  "image/x-minolta-mrw": [
-    ".mrw"
-  ],
-  "image/x-nikon-nef": [
-    ".nef"
-  ],
-  "image/x-olympus-orf": [
-    ".orf"
-  ],
-  "image/x-pentax-pef": [
-    ".pef",
-    ".ptx"
-  ],
-  "image/x-fuji-raf": [
-    ".raf"
-  ],
-  "image/x-panasonic-raw": [
-    ".raw",
-    ".rw2",
-    ".rwl"
-  ],
-  "audio/flac": [
-    ".flac"
-  ],
-  "image/x-sony-sr2": [
-    ".sr2"
-  ],
-  "image/x-sony-srf": [
-    ".srf"
-  ],
-  "image/x-sigma-x3f": [
-    ".x3f"
-  ]
-}
\ No newline at end of file
+"""
+MIME type to file-extension tables.
+
+The data lives in ``mime_types.txt`` (Apache ``mime.types`` layout) and is
+parsed on first use, so importing this module costs nothing.  Lookup indexes
+are built once per process and cached.
+"""
+from functools import cache
+from pathlib import Path
+
+MIME_TABLE_PATH = Path(__file__).with_name("mime_types.txt")
+
+
+@cache
+def mime_to_extensions() -> dict[str, tuple[str, ...]]:
+    """Return ``{mime: (".ext", ...)}`` in table order."""
+    table = {}
+    with MIME_TABLE_PATH.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            mime, *extensions = line.split()
+            table[mime] = tuple(f".{ext}" for ext in extensions)
+    return table
+
+
+@cache
+def extension_to_mime() -> dict[str, str]:
+    """Return the inverted ``{".ext": mime}`` index (later table rows win)."""
+    return {
+        ext.lower(): mime
+        for mime, extensions in mime_to_extensions().items()
+        for ext in extensions
+    }
+
+
+def __getattr__(name):
+    """Keep ``MIME_TO_EXTENSIONS`` importable without loading it at import time."""
+    if name == "MIME_TO_EXTENSIONS":
+        return mime_to_extensions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
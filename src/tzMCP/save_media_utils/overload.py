@@ -0,0 +1,79 @@
+# pylint: disable=logging-fstring-interpolation
+"""
+Backpressure: what to give up when saving falls behind.
+
+``pressure`` is how full the slowest resource is (save queue bytes or
+files, memory budget) as a fraction of its limit.  At ``degrade_at`` the
+proxy degrades: responses in ``shed_mime_groups`` are passed through
+unsaved and the check stages in ``skip_stages`` are skipped.  At
+``passthrough_at`` every response is passed through unsaved until the
+backlog drains.  A level is only left once pressure drops below
+``RECOVER_RATIO`` of its threshold, so the proxy does not flap between
+levels on every save.  Shedding happens before the body is buffered
+wherever the headers allow it, so a slow disk never stalls browsing.
+"""
+import threading
+from collections import Counter
+from tzMCP.common_utils.log_config import log_proxy
+
+NORMAL, DEGRADED, SATURATED = "normal", "degraded", "saturated"
+_LEVELS = (NORMAL, DEGRADED, SATURATED)
+RECOVER_RATIO = 0.8
+
+
+class Backpressure:
+    """Tracks the overload level and counts what was shed because of it."""
+
+    def __init__(self, pressure, degrade_at: float = 0.5, passthrough_at: float = 1.0,
+                 shed_mime_groups=(), skip_stages=()):
+        self.pressure = pressure          # Callable: current load as a fraction of capacity.
+        self.degrade_at = degrade_at
+        self.passthrough_at = passthrough_at
+        self.shed_mime_groups = frozenset(shed_mime_groups)
+        self.skip_stages = frozenset(skip_stages)
+        self.current = NORMAL
+        self.events = 0                   # Times a higher level was entered.
+        self.shed_counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, settings: dict, pressure) -> "Backpressure":
+        return cls(pressure, settings["degrade_at"], settings["passthrough_at"],
+                   settings["shed_mime_groups"], settings["skip_stages"])
+
+    def _target(self, load: float) -> str:
+        thresholds = ((SATURATED, self.passthrough_at), (DEGRADED, self.degrade_at))
+        for level, threshold in thresholds:
+            entered = _LEVELS.index(self.current) >= _LEVELS.index(level)
+            if load >= (threshold * RECOVER_RATIO if entered else threshold):
+                return level
+        return NORMAL
+
+    def level(self) -> str:
+        """Re-evaluate pressure and return the current level, logging transitions."""
+        load = self.pressure()
+        with self._lock:
+            target = self._target(load)
+            if target == self.current:
+                return target
+            previous, self.current = self.current, target
+            if _LEVELS.index(target) > _LEVELS.index(previous):
+                self.events += 1
+            shed = dict(self.shed_counts)
+        if target == NORMAL:
+            log_proxy.info(f"✅ Save backlog drained ({load:.0%} of capacity); back to normal. Shed so far: {shed}")
+        else:
+            log_proxy.warning(f"🚦 Save backlog at {load:.0%} of capacity: {previous} → {target}. Shed so far: {shed}")
+        return target
+
+    def sheds_group(self, group: str | None) -> bool:
+        return group in self.shed_mime_groups
+
+    def shed(self, reason: str):
+        """Count one response (or skipped stage) given up under load."""
+        with self._lock:
+            self.shed_counts[reason] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"level": self.current, "events": self.events, "shed": dict(self.shed_counts)}
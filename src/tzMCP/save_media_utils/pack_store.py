@@ -0,0 +1,368 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Append-only pack storage for small media.
+
+Instead of one file (and inode) per capture, small objects are appended to
+rotating segment files in ``<save_dir>/.packs``.  Segments are plain POSIX
+tar archives, so ``tar -xf`` works on them; each member carries its URL,
+MIME type and digest in PAX headers, which makes a segment self-describing.
+A JSON-lines sidecar (``<segment>.idx``) lists every member's data offset,
+so reads are one seek and listing never parses the tar.  A lost sidecar is
+rebuilt from its segment.
+
+    tzMCP-pack list [--host H]
+    tzMCP-pack extract DEST
+    tzMCP-pack export-warc captures.warc.gz
+
+Every writer process opens its own segments (pid in the name), so pool
+workers sharing a save_dir never append to the same file; the segment
+being written is held under an OS lock, so others can tell it is live.
+Saved objects are addressed as ``<segment>#<offset>:<size>``; ``read_saved``
+and ``saved_exists`` accept those references as well as ordinary paths.
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import tarfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+from tzMCP.common_utils.log_config import log_proxy
+from tzMCP.save_media_utils.file_lock import try_lock
+from tzMCP.gui_bits.config_manager import ConfigManager
+
+PACK_DIR_NAME = ".packs"
+SEGMENT_PREFIX = "pack-"
+SEGMENT_SUFFIX = ".tar"
+INDEX_SUFFIX = ".idx"
+REF_SEP = "#"
+BLOCK = tarfile.BLOCKSIZE
+
+DEFAULT_MAX_OBJECT_BYTES = 256 * 1024
+DEFAULT_SEGMENT_BYTES = 1024 * 1024 * 1024
+
+# PAX header keys carrying capture metadata inside each member.
+PAX_URL = "TZMCP.url"
+PAX_MIME = "TZMCP.mime"
+PAX_DIGEST = "TZMCP.digest"
+
+
+@dataclass
+class PackMember:
+    name: str
+    offset: int
+    size: int
+    digest: str
+    url: str
+    mime: str
+    saved_at: float
+    segment: str = ""
+
+    @property
+    def ref(self) -> str:
+        return pack_ref(Path(self.segment), self.offset, self.size)
+
+
+def pack_dir(save_dir: Path) -> Path:
+    return Path(save_dir) / PACK_DIR_NAME
+
+
+def pack_ref(segment: Path, offset: int, size: int) -> str:
+    return f"{segment}{REF_SEP}{offset}:{size}"
+
+
+def parse_ref(path: str) -> tuple[Path, int, int] | None:
+    """Split a pack reference into ``(segment, offset, size)``; None for ordinary paths."""
+    segment, sep, span = str(path).rpartition(REF_SEP)
+    if not sep or not segment.endswith(SEGMENT_SUFFIX):
+        return None
+    offset, _, size = span.partition(":")
+    if not (offset.isdigit() and size.isdigit()):
+        return None
+    return Path(segment), int(offset), int(size)
+
+
+def read_saved(path: str) -> bytes:
+    """Bytes of a saved object, whether a plain file or a pack reference (raises ``OSError``)."""
+    ref = parse_ref(path)
+    if ref is None:
+        return Path(path).read_bytes()
+    segment, offset, size = ref
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        data = f.read(size)
+    if len(data) != size:
+        raise OSError(f"Truncated pack member: {path}")
+    return data
+
+
+def saved_size(path: str) -> int | None:
+    """Size of a saved object (plain file or pack reference); None if it is gone."""
+    ref = parse_ref(path)
+    try:
+        if ref is None:
+            st = Path(path).stat()
+            return st.st_size if Path(path).is_file() else None
+        segment, offset, size = ref
+        return size if segment.stat().st_size >= offset + size else None
+    except OSError:
+        return None
+
+
+def saved_exists(path: str) -> bool:
+    return saved_size(path) is not None
+
+
+def index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + INDEX_SUFFIX)
+
+
+class PackWriter:
+    """Appends objects to this process's current segment, rotating at ``segment_bytes``."""
+
+    def __init__(self, directory: Path, segment_bytes: int = DEFAULT_SEGMENT_BYTES, durability=None):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.durability = durability
+        self.segment: Path | None = None
+        self._file = None
+        self._index = None
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def _open_segment(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        while True:
+            self._seq += 1
+            name = f"{SEGMENT_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._seq:04d}{SEGMENT_SUFFIX}"
+            try:
+                self._file = open(self.directory / name, "xb")
+                break
+            except FileExistsError:
+                continue
+        try_lock(self._file)    # Released by closing; marks the segment as live.
+        self.segment = self.directory / name
+        self._index = open(index_path(self.segment), "a", encoding="utf-8")
+        if self.durability:
+            self.durability.after_publish(self.segment)
+        log_proxy.info(f"📦 Opened pack segment {self.segment}")
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.write(b"\0" * (2 * BLOCK))   # End-of-archive marker.
+            self._file.close()
+            self._index.close()
+        self._file = self._index = None
+
+    def append(self, name: str, content: bytes, url: str = "", mime: str = "", digest: str = "") -> str:
+        """Append one object and return its pack reference."""
+        now = time.time()
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        info.mtime = int(now)
+        info.mode = 0o644
+        info.pax_headers = {PAX_URL: url, PAX_MIME: mime, PAX_DIGEST: digest}
+        header = info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+        padding = b"\0" * (-len(content) % BLOCK)
+
+        with self._lock:
+            if self._file is None or (self._file.tell() and
+                                      self._file.tell() + len(header) + len(content) > self.segment_bytes):
+                self._close_segment()
+                self._open_segment()
+            offset = self._file.tell() + len(header)
+            self._file.write(header + content + padding)
+            self._file.flush()
+            if self.durability:
+                self.durability.appended(self._file, self.segment)
+            # The sidecar line is written only after the data, so it never points past the end.
+            self._index.write(_index_line(PackMember(name, offset, len(content), digest, url, mime, now)))
+            self._index.flush()
+            if self.durability:
+                self.durability.appended(self._index, index_path(self.segment))
+            return pack_ref(self.segment, offset, len(content))
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+
+def _index_line(member: PackMember) -> str:
+    fields = asdict(member)
+    del fields["segment"]   # Implied by the sidecar's own name.
+    return json.dumps(fields) + "\n"
+
+
+def scan_segment(segment: Path) -> list[PackMember]:
+    """Read members straight from the tar, tolerating a truncated tail from a crash."""
+    members = []
+    try:
+        with tarfile.open(segment, "r:") as tar:
+            for info in tar:
+                if not info.isfile():
+                    continue
+                pax = info.pax_headers
+                members.append(PackMember(info.name, info.offset_data, info.size, pax.get(PAX_DIGEST, ""),
+                                          pax.get(PAX_URL, ""), pax.get(PAX_MIME, ""), float(info.mtime),
+                                          str(segment)))
+    except (tarfile.ReadError, EOFError, OSError) as e:
+        log_proxy.warning(f"⚠ Stopped reading {segment} at a damaged member: {e}")
+    size = segment.stat().st_size
+    return [m for m in members if m.offset + m.size <= size]
+
+
+def rebuild_index(segment: Path) -> list[PackMember]:
+    """Rewrite ``segment``'s sidecar index from the tar itself."""
+    members = scan_segment(segment)
+    tmp = index_path(segment).with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for m in members:
+            f.write(_index_line(m))
+    os.replace(tmp, index_path(segment))
+    return members
+
+
+def read_index(segment: Path) -> list[PackMember]:
+    """Members of ``segment`` from its sidecar.
+
+    A missing or unreadable sidecar is rebuilt.  One that ends before the
+    segment's data does (a crash between the two appends) is bypassed by
+    scanning the tar, but not rewritten: its writer may still be running.
+    """
+    members = []
+    try:
+        with open(index_path(segment), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    members.append(PackMember(**json.loads(line), segment=str(segment)))
+    except (OSError, ValueError, TypeError):
+        return rebuild_index(segment)
+    end = members[-1].offset + members[-1].size + (-members[-1].size % BLOCK) if members else 0
+    try:
+        if segment.stat().st_size > end + 2 * BLOCK:
+            return scan_segment(segment)
+    except OSError:
+        return []
+    return members
+
+
+def segments(directory: Path) -> list[Path]:
+    return sorted(Path(directory).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"))
+
+
+def packed_refs(directory: Path) -> dict[str, str]:
+    """Map every packed digest to the reference of (one) object holding it."""
+    return {m.digest: m.ref for m in iter_members(directory) if m.digest}
+
+
+def iter_members(directory: Path):
+    """Every packed object under ``directory``, oldest segment first."""
+    for segment in segments(directory):
+        yield from read_index(segment)
+
+
+def extract(members, dest: Path) -> int:
+    """Write each member to ``dest`` as a plain file (numbered on name clashes); returns files written."""
+    dest.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for m in members:
+        target = dest / Path(m.name).name
+        counter = 1
+        while target.exists():
+            target = (dest / Path(m.name).name).with_stem(f"{Path(m.name).stem}_{counter}")
+            counter += 1
+        target.write_bytes(read_saved(m.ref))
+        os.utime(target, (m.saved_at, m.saved_at))
+        written += 1
+    return written
+
+
+def _warc_record(headers: dict[str, str], block: bytes) -> bytes:
+    head = "WARC/1.0\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return head.encode("utf-8") + b"\r\n" + block + b"\r\n\r\n"
+
+
+def _warc_date(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def export_warc(members, out_path: Path) -> int:
+    """Write members as WARC ``resource`` records (gzipped per record if ``out_path`` ends in .gz)."""
+    compress = out_path.suffix == ".gz"
+    written = 0
+    with open(out_path, "wb") as out:
+        def emit(headers, block):
+            record = _warc_record(headers | {"Content-Length": str(len(block))}, block)
+            out.write(gzip.compress(record) if compress else record)
+
+        info = b"software: tzMCP\r\nformat: WARC File Format 1.0\r\n"
+        emit({"WARC-Type": "warcinfo", "WARC-Record-ID": f"<urn:uuid:{uuid.uuid4()}>",
+              "WARC-Date": _warc_date(time.time()), "WARC-Filename": out_path.name,
+              "Content-Type": "application/warc-fields"}, info)
+        for m in members:
+            block = read_saved(m.ref)
+            sha1 = base64.b32encode(hashlib.sha1(block).digest()).decode("ascii")
+            emit({"WARC-Type": "resource", "WARC-Record-ID": f"<urn:uuid:{uuid.uuid4()}>",
+                  "WARC-Date": _warc_date(m.saved_at), "WARC-Target-URI": m.url or f"urn:tzmcp:{m.name}",
+                  "Content-Type": m.mime or "application/octet-stream",
+                  "WARC-Block-Digest": f"sha1:{sha1}"}, block)
+            written += 1
+    return written
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="List, extract or export tzMCP pack segments")
+    parser.add_argument('--config', type=str, help='Path to YAML config file')
+    parser.add_argument('--save-dir', type=str, help='Save directory holding .packs (default: from config)')
+    parser.add_argument('--host', type=str, help='Only objects from this domain (and its subdomains)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='Print every packed object')
+    extract_cmd = commands.add_parser('extract', help='Copy packed objects out as plain files')
+    extract_cmd.add_argument('dest', type=str)
+    warc_cmd = commands.add_parser('export-warc', help='Write packed objects to a WARC file (.warc or .warc.gz)')
+    warc_cmd.add_argument('output', type=str)
+    commands.add_parser('reindex', help='Rebuild every sidecar index from its segment')
+    return parser.parse_args(argv)
+
+
+def _host_matches(url: str, host: str) -> bool:
+    netloc = (urlsplit(url).hostname or "").lower()
+    return netloc == host or netloc.endswith("." + host)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.save_dir:
+        save_dir = Path(args.save_dir).resolve()
+    else:
+        save_dir = ConfigManager(Path(args.config).resolve() if args.config else None).load_config().save_dir
+    directory = pack_dir(save_dir)
+
+    if args.command == 'reindex':
+        for segment in segments(directory):
+            print(f"{segment.name}: {len(rebuild_index(segment))} objects")
+        return
+
+    members = iter_members(directory)
+    if args.host:
+        host = args.host.lower()
+        members = (m for m in members if _host_matches(m.url, host))
+    if args.command == 'list':
+        for m in members:
+            when = datetime.fromtimestamp(m.saved_at).isoformat(sep=" ", timespec="seconds")
+            print(f"{when}  {m.mime:<24} {m.size:>10}  {Path(m.segment).name}  {m.name}  {m.url}")
+    elif args.command == 'extract':
+        print(f"Extracted {extract(members, Path(args.dest))} files.")
+    elif args.command == 'export-warc':
+        print(f"Wrote {export_warc(members, Path(args.output))} records to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
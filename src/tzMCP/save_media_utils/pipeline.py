@@ -0,0 +1,229 @@
+# pylint: disable=logging-fstring-interpolation,line-too-long
+"""
+Response check pipeline.
+
+Every captured response runs through a list of check stages that share one
+``FlowContext``.  The context parses the URL once and sniffs the body lazily,
+so a stage only pays for the data it actually needs.
+
+Stages are kept in cost-per-rejection order: a stage that is cheap and
+rejects often runs first.  The order is recomputed from live timings every
+``reorder_every`` flows, with older statistics decayed so the pipeline
+follows changes in traffic.
+"""
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
+from time import perf_counter
+from urllib.parse import urlsplit
+from tzMCP.common_utils.log_config import log_proxy
+from tzMCP.save_media_utils.mime_categories import mime_groups
+from tzMCP.save_media_utils.save_media_utils import (
+    safe_filename, sanitize_url, detect_mime_and_extension, does_header_match_size, image_dimensions,
+    is_file_size_out_of_bounds, is_mime_type_allowed, is_domain_blocked_by_whitelist,
+    is_domain_blacklisted, is_valid_image, is_image_size_out_of_bounds,
+)
+
+
+@dataclass
+class FlowContext:
+    """Per-flow data shared by all stages; derived fields are computed on first use."""
+    url: str
+    content: bytes
+    content_length: str | None = None
+    headers: Mapping[str, str] = field(default_factory=dict)
+    request_headers: Mapping[str, str] = field(default_factory=dict)
+    spill: str = ""     # File the body was streamed to when it was not buffered (``content`` maps it).
+
+    @cached_property
+    def parts(self):
+        return urlsplit(self.url)
+
+    @cached_property
+    def host(self) -> str:
+        return (self.parts.hostname or "").lower()
+
+    @cached_property
+    def path(self) -> str:
+        return self.parts.path
+
+    @cached_property
+    def basename(self) -> str:
+        return os.path.basename(self.path)
+
+    @cached_property
+    def size(self) -> int:
+        return len(self.content)
+
+    @cached_property
+    def safe_url(self) -> str:
+        return sanitize_url(self.url)
+
+    @cached_property
+    def mime_and_ext(self) -> tuple[str, str]:
+        return detect_mime_and_extension(self.content, fallback_url=self.url)
+
+    @property
+    def mime_type(self) -> str:
+        return self.mime_and_ext[0]
+
+    @property
+    def ext(self) -> str:
+        return self.mime_and_ext[1]
+
+    @cached_property
+    def digest(self) -> str:
+        return hashlib.sha256(self.content).hexdigest()
+
+    @cached_property
+    def dimensions(self) -> tuple[int, int] | None:
+        """Pixel size for images (header only), None otherwise."""
+        if self.mime_type not in mime_groups()["image"]:
+            return None
+        return image_dimensions(self.content)
+
+    @cached_property
+    def fname(self) -> str:
+        return safe_filename(self.basename, self.ext, fallback_url=self.url)
+
+    @property
+    def label(self) -> str:
+        """A name for log lines that does not force MIME sniffing."""
+        return self.basename or self.host
+
+
+class Stage(ABC):
+    """A single check. ``check`` returns True when the flow must be rejected."""
+    name = "stage"
+
+    def __init__(self):
+        self.calls = 0
+        self.rejections = 0
+        self.seconds = 0.0
+
+    @abstractmethod
+    def check(self, ctx: FlowContext) -> bool:
+        ...
+
+    def run(self, ctx: FlowContext) -> bool:
+        """Run the check and record its cost and outcome."""
+        start = perf_counter()
+        rejected = self.check(ctx)
+        self.seconds += perf_counter() - start
+        self.calls += 1
+        if rejected:
+            self.rejections += 1
+        return rejected
+
+    @property
+    def rank(self) -> float | None:
+        """Expected cost per rejection; lower runs earlier.  None until the stage has run.
+
+        Sorting independent filters by cost / P(reject) minimises the expected
+        cost of reaching a verdict.  Laplace smoothing keeps new stages sane.
+        """
+        if not self.calls:
+            return None
+        reject_rate = (self.rejections + 1) / (self.calls + 2)
+        return self.seconds / self.calls / reject_rate
+
+    def decay(self, factor: float = 0.5):
+        """Age the statistics so recent traffic dominates the ordering."""
+        self.calls = int(self.calls * factor)
+        self.rejections = int(self.rejections * factor)
+        self.seconds *= factor
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "rejections": self.rejections, "seconds": round(self.seconds, 6)}
+
+
+class ContentLengthStage(Stage):
+    name = "content_length"
+
+    def check(self, ctx):
+        return not does_header_match_size(ctx.content_length, ctx.size, ctx.url)
+
+
+class FileSizeStage(Stage):
+    name = "file_size"
+
+    def check(self, ctx):
+        return is_file_size_out_of_bounds(ctx.size, ctx.label)
+
+
+class WhitelistStage(Stage):
+    name = "whitelist"
+
+    def check(self, ctx):
+        return is_domain_blocked_by_whitelist(ctx.url, ctx.label, netloc=ctx.host)
+
+
+class BlacklistStage(Stage):
+    name = "blacklist"
+
+    def check(self, ctx):
+        return is_domain_blacklisted(ctx.url, ctx.label, netloc=ctx.host)
+
+
+class MimeTypeStage(Stage):
+    name = "mime_type"
+
+    def check(self, ctx):
+        return not is_mime_type_allowed(ctx.mime_type, ctx.fname)
+
+
+class PixelDimensionStage(Stage):
+    name = "pixel_dimensions"
+
+    def check(self, ctx):
+        if ctx.mime_type not in mime_groups()["image"]:
+            return False
+        return is_valid_image(ctx.content) and is_image_size_out_of_bounds(ctx.content, ctx.fname)
+
+
+class CheckPipeline:
+    """Runs stages in adaptive cost order and stops at the first rejection."""
+
+    def __init__(self, stages: list[Stage], reorder_every: int = 200):
+        self.stages = list(stages)
+        self.reorder_every = reorder_every
+        self._flows = 0
+
+    @classmethod
+    def default(cls) -> "CheckPipeline":
+        """The standard stages, seeded cheapest-first until live timings exist."""
+        return cls([
+            ContentLengthStage(),
+            FileSizeStage(),
+            BlacklistStage(),
+            WhitelistStage(),
+            MimeTypeStage(),
+            PixelDimensionStage(),
+        ])
+
+    def rejects(self, ctx: FlowContext, skip=frozenset()) -> bool:
+        """Return True if any stage rejects the flow; stages named in ``skip`` are not run."""
+        self._flows += 1
+        if self.reorder_every and self._flows % self.reorder_every == 0:
+            self.reorder()
+        return any(stage.run(ctx) for stage in self.stages if stage.name not in skip)
+
+    def reorder(self):
+        """Re-sort stages by measured cost per rejection, then decay the stats.
+
+        A stage no flow has reached yet is ranked at the mean of the measured
+        ones, so it neither jumps to the front nor sinks to the back.
+        """
+        ranks = {stage.name: stage.rank for stage in self.stages}
+        measured = [rank for rank in ranks.values() if rank is not None]
+        prior = sum(measured) / len(measured) if measured else 0.0
+        self.stages.sort(key=lambda stage: prior if ranks[stage.name] is None else ranks[stage.name])
+        for stage in self.stages:
+            stage.decay()
+        log_proxy.debug(f"[PROFILE] check order: {', '.join(stage.name for stage in self.stages)}")
+
+    def stats(self) -> dict:
+        return {stage.name: stage.stats() for stage in self.stages}
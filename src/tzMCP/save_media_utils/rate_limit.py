@@ -0,0 +1,120 @@
+"""
+Disk-write rate limits for the save writer.
+
+Token buckets in bytes per second, one global and one per source domain.
+Files are charged chunk by chunk as they are written, so a single large
+file is paced too.  A chunk may take a bucket into debt; the debt has to
+be paid back before that bucket allows the next chunk.  The writer thread
+sleeps off global debt, and the debt of the domain whose file it is in the
+middle of writing.  Between files, domain debt instead makes the scheduler
+pass over that domain's jobs, so one throttled site does not hold up saves
+from others.
+"""
+import threading
+import time
+
+MB = 1024 * 1024
+MIN_BURST = 64 * 1024
+MAX_IDLE_DOMAINS = 1024     # Full (idle) domain buckets are dropped past this many.
+
+
+class TokenBucket:
+    """``rate`` bytes/s with up to ``burst`` bytes saved up."""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until the bucket is out of debt."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def charge(self, nbytes: int, now: float) -> float:
+        """Take ``nbytes``; return the seconds of debt this leaves."""
+        self._refill(now)
+        self.tokens -= nbytes
+        return self.wait_time(now)
+
+    def full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+class WriteThrottle:
+    """Global and per-domain byte-rate limits; a rate of 0 means unlimited."""
+
+    def __init__(self, global_rate: float = 0, domain_rate: float = 0, burst_seconds: float = 1.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.domain_rate = domain_rate
+        self.burst_seconds = burst_seconds
+        now = clock()
+        self._global = TokenBucket(global_rate, self._burst(global_rate), now) if global_rate else None
+        self._domains: dict[str, TokenBucket] = {}
+        self.throttled_seconds = 0.0                       # Writer time spent sleeping off debt.
+        self.domain_throttled: dict[str, float] = {}       # Domain -> seconds its saves were held back.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "WriteThrottle":
+        return cls(settings["global_mb_s"] * MB, settings["domain_mb_s"] * MB, settings["burst_s"])
+
+    def _burst(self, rate: float) -> float:
+        return max(rate * self.burst_seconds, MIN_BURST)
+
+    def ready(self, job) -> bool:
+        """False while ``job``'s domain is still paying off earlier writes."""
+        if not self.domain_rate:
+            return True
+        with self._lock:
+            bucket = self._domains.get(job.host)
+            return bucket is None or bucket.wait_time(self.clock()) == 0
+
+    def acquire(self, job, nbytes: int | None = None):
+        """Wait out the debt of both limits, then charge ``nbytes`` of ``job`` (default all of it).
+
+        Called by the writer thread before each chunk of a file.
+        """
+        nbytes = job.size if nbytes is None else nbytes
+        with self._lock:
+            now = self.clock()
+            bucket = self._domain_bucket(job.host, now) if self.domain_rate else None
+            wait = max(self._global.wait_time(now) if self._global else 0.0,
+                       bucket.wait_time(now) if bucket else 0.0)
+        if wait:
+            self.sleep(wait)
+        with self._lock:
+            now = self.clock()
+            self.throttled_seconds += wait
+            if self._global:
+                self._global.charge(nbytes, now)
+            if bucket:
+                held = bucket.charge(nbytes, now)
+                if held:
+                    self.domain_throttled[job.host] = self.domain_throttled.get(job.host, 0.0) + held
+
+    def _domain_bucket(self, host: str, now: float) -> TokenBucket:
+        bucket = self._domains.get(host)
+        if bucket is None:
+            self._prune(now)
+            bucket = self._domains[host] = TokenBucket(self.domain_rate, self._burst(self.domain_rate), now)
+        return bucket
+
+    def _prune(self, now: float):
+        if len(self._domains) >= MAX_IDLE_DOMAINS:
+            for host in [h for h, b in self._domains.items() if b.full(now)]:
+                del self._domains[host]
+
+    def stats(self) -> dict:
+        with self._lock:
+            top = sorted(self.domain_throttled.items(), key=lambda item: item[1], reverse=True)[:10]
+            return {"throttled_seconds": round(self.throttled_seconds, 3),
+                    "domain_throttled_seconds": {host: round(s, 3) for host, s in top}}
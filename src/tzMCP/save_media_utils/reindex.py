@@ -0,0 +1,156 @@
+"""
+Rebuild the dedup index from files already in the save directory.
+
+    tzMCP-reindex                        # use the configured save_dir and dedup database
+    tzMCP-reindex --save-dir D --db X    # explicit locations
+
+Files are found with ``os.scandir`` and hashed in a process pool through
+read-only memory maps.  Every file's (path, size, mtime) and digest are
+recorded in the ``file_index`` table in batches, so an interrupted run
+resumes where it stopped and later runs only hash new or changed files.
+Objects in pack segments already carry their digest in the sidecar index,
+so they are added without being read.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from tzMCP.gui_bits.config_manager import ConfigManager
+from tzMCP.paths import logs_dir
+from tzMCP.save_media_utils.dedup_store import SqliteDedupStore, ShardedDedupStore, stored_shard_count
+from tzMCP.save_media_utils.hash_tracker import DEFAULT_DB_NAME, config_db_path
+from tzMCP.save_media_utils.pack_store import iter_members, pack_dir
+
+# Digests and file_index rows are committed together every this many files.
+COMMIT_EVERY = 500
+MAP_CHUNKSIZE = 16
+
+
+@dataclass
+class ReindexStats:
+    scanned: int = 0
+    unchanged: int = 0
+    hashed: int = 0
+    added: int = 0
+    failed: int = 0
+    packed: int = 0
+
+
+def iter_files(root: Path):
+    """Yield ``(path, size, mtime_ns)`` for every regular file under ``root``, skipping dot-entries."""
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        yield entry.path, st.st_size, st.st_mtime_ns
+        except OSError:
+            continue
+
+
+def hash_file(path: str) -> str | None:
+    """SHA-256 of a file read through a memory map (None if it cannot be read)."""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return hashlib.sha256(b"").hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+    except (OSError, ValueError):
+        return None
+
+
+def _known_files(store) -> dict[str, tuple[int, int]]:
+    rows = store.read(lambda conn: conn.execute("SELECT path, size, mtime_ns FROM file_index").fetchall())
+    return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+
+def _commit(store, main, batch: list[tuple]) -> int:
+    """Store digests first, then their file_index rows, so a crash only causes re-hashing."""
+    added = store.add_many(digest for _, _, _, digest in batch)
+    main.write(lambda conn: conn.executemany(
+        "INSERT OR REPLACE INTO file_index (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)", batch))
+    return added
+
+
+def reindex(save_dir: Path, store, workers: int | None = None, progress=None) -> ReindexStats:
+    """Add digests of every new or changed file under ``save_dir`` to ``store``."""
+    main = store.main if isinstance(store, ShardedDedupStore) else store
+    known = _known_files(main)
+    stats = ReindexStats()
+
+    pending = []
+    for path, size, mtime_ns in iter_files(save_dir):
+        stats.scanned += 1
+        if known.get(path) == (size, mtime_ns):
+            stats.unchanged += 1
+        else:
+            pending.append((path, size, mtime_ns))
+
+    batch = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        digests = pool.map(hash_file, [path for path, _, _ in pending], chunksize=MAP_CHUNKSIZE)
+        for (path, size, mtime_ns), digest in zip(pending, digests):
+            if digest is None:
+                stats.failed += 1
+                continue
+            stats.hashed += 1
+            batch.append((path, size, mtime_ns, digest))
+            if len(batch) >= COMMIT_EVERY:
+                stats.added += _commit(store, main, batch)
+                batch = []
+                if progress:
+                    progress(stats, len(pending))
+    if batch:
+        stats.added += _commit(store, main, batch)
+
+    packed = [m.digest for m in iter_members(pack_dir(save_dir)) if m.digest]
+    stats.packed = len(packed)
+    stats.added += store.add_many(packed)
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Index files already in the save directory into the tzMCP dedup store")
+    parser.add_argument('--config', type=str, help='Path to YAML config file')
+    parser.add_argument('--save-dir', type=str, help='Directory to index (default: save_dir from the config)')
+    parser.add_argument('--db', type=str, help='Dedup database to fill (default: the one the config selects)')
+    parser.add_argument('--workers', type=int, help='Hashing processes (default: one per CPU)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = ConfigManager(Path(args.config).resolve() if args.config else None).load_config()
+    save_dir = Path(args.save_dir).resolve() if args.save_dir else config.save_dir
+    if args.db:
+        db_path = Path(args.db).resolve()
+    else:
+        db_path = config_db_path(config) or logs_dir() / DEFAULT_DB_NAME
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    shards = stored_shard_count(db_path)
+    store = ShardedDedupStore(db_path, shards) if shards > 1 else SqliteDedupStore(db_path)
+    start = perf_counter()
+    try:
+        stats = reindex(save_dir, store, args.workers,
+                        progress=lambda s, total: print(f"  hashed {s.hashed}/{total}, {s.added} new digests", flush=True))
+    finally:
+        store.close()
+    print(f"Indexed {save_dir} into {db_path} in {perf_counter() - start:.1f}s: "
+          f"{stats.scanned} files, {stats.unchanged} unchanged, {stats.hashed} hashed, "
+          f"{stats.packed} packed, {stats.added} new digests, {stats.failed} unreadable.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-# pylint: disable=logging-fstring-interpolation,redefined-outer-name,broad-exception-caught,line-too-long,invalid-name
+# pylint: disable=logging-fstring-interpolation,redefined-outer-name,broad-exception-caught,line-too-long,invalid-name,import-outside-toplevel
 import hashlib
 import os
 import re
@@ -8,24 +8,15 @@ from pathlib import Path
 from tempfile import NamedTemporaryFile
 from time import perf_counter
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
-import filetype
-from PIL import Image
 from tzMCP.save_media_utils.config_provider import get_config
-from tzMCP.save_media_utils.mime_data_minimal import MIME_TO_EXTENSIONS
-from tzMCP.save_media_utils.mime_categories import MIME_GROUPS
-from tzMCP.common_utils.log_config import setup_logging, log_proxy
-
-# Configure log_proxy
-setup_logging()
+from tzMCP.save_media_utils.mime_data_minimal import mime_to_extensions, extension_to_mime
+from tzMCP.save_media_utils.mime_categories import allowed_mime_types
+from tzMCP.save_media_utils.url_memo import SENSITIVE_KEYS
+from tzMCP.common_utils.log_config import log_proxy
 
 # Setup file Constants
 ENABLE_PERFORMANCE_CHECK = True
-SENSITIVE_KEYS = {"token", "access_token", "auth", "session", "key"}
-# Inverted map: ext -> mime
-EXTENSION_TO_MIME = {}
-for mime, extensions in MIME_TO_EXTENSIONS.items():
-    for ext in extensions:
-        EXTENSION_TO_MIME[ext.lower()] = mime
+WRITE_CHUNK = 1024 * 1024     # Bytes per paced write in atomic_save.
 
 # ----------------------------------
 # Utility functions
@@ -71,16 +62,18 @@ def detect_mime_and_extension(byte_data: bytes, fallback_url: str = "") -> tuple
     if fallback_url:
         base = os.path.basename(fallback_url.split("?", 1)[0])
         ext = os.path.splitext(base)[1].lower()
-        if ext in EXTENSION_TO_MIME:
-            log_proxy.info(f"URL extension found: {ext}. Using MIME type: {EXTENSION_TO_MIME[ext]}")
-            return EXTENSION_TO_MIME[ext], ext
+        mime = extension_to_mime().get(ext)
+        if mime:
+            log_proxy.info(f"URL extension found: {ext}. Using MIME type: {mime}")
+            return mime, ext
     log_proxy.debug("No extension found in url.")
 
     # --- Step 2: Fallback to content-based detection ---
-    kind = filetype.guess(byte_data)
+    import filetype  # Deferred: only needed for URLs without a known extension.
+    kind = filetype.guess(byte_data[:8192])   # All filetype reads; also makes mapped (spilled) bodies work.
     if kind:
         mime = kind.mime
-        extensions = MIME_TO_EXTENSIONS.get(mime)
+        extensions = mime_to_extensions().get(mime)
         ext = f".{kind.extension}" if not extensions else extensions[0]
         log_proxy.info(f"Filetype tested as: {ext}. Using MIME type: {mime}")
         return mime, ext
@@ -104,9 +97,7 @@ def is_mime_type_allowed(mime_type: str, fname: str = None) -> bool:
     start_check = perf_counter()
     config = get_config()
 
-    allowed_types = set()
-    for group in config.allowed_mime_groups:
-        allowed_types.update(MIME_GROUPS.get(group, []))
+    allowed_types = allowed_mime_types(tuple(config.allowed_mime_groups))
 
     result = True
     if mime_type not in allowed_types:
@@ -153,34 +144,38 @@ def _domain_matches(netloc: str, patterns) -> bool:
             log_proxy.warning("Ignoring invalid domain regex: %r", pattern)
     return False
 
-def is_domain_blocked_by_whitelist(url:str, fname:str = None):
+def is_domain_blocked_by_whitelist(url:str, fname:str = None, netloc:str = None):
     """
     Check domain whitelist
     IF whitelist is NOT set (ie []), then allow all domains
     IF whitelist is set, then only allow domains that match an entry
+    Pass ``netloc`` when the caller has already parsed the URL's host.
     """
     start_is_domain_blocked_by_whitelist_check = perf_counter()
     response = False
     config = get_config()
     if config.whitelist:
-        netloc = urlparse(url).hostname or ""
+        if netloc is None:
+            netloc = urlparse(url).hostname or ""
         if not _domain_matches(netloc, config.whitelist):
             log_proxy.info(f"⏭ Skipped {fname} URL: {sanitize_url(url)} Reason: domain not in whitelist.")
             response = True
     log_duration("is_domain_blocked_by_whitelist() ", start_is_domain_blocked_by_whitelist_check)
     return response
 
-def is_domain_blacklisted(url:str, fname:str = None):
+def is_domain_blacklisted(url:str, fname:str = None, netloc:str = None):
     """
     Check domain blacklist
     IF blacklist is NOT set (ie []), then allow all domains
     IF blacklist is set, then only allow domains that match no entry
+    Pass ``netloc`` when the caller has already parsed the URL's host.
     """
     start_is_domian_blacklisted_check = perf_counter()
     response = False
     config = get_config()
     if config.blacklist:
-        netloc = urlparse(url).hostname or ""
+        if netloc is None:
+            netloc = urlparse(url).hostname or ""
         if _domain_matches(netloc, config.blacklist):
             log_proxy.info(f"⏭ Skipped {fname} URL: {sanitize_url(url)} Reason: domain in blacklist.")
             response = True
@@ -192,6 +187,7 @@ def is_valid_image(content: bytes):
     start_is_valid_image_check = perf_counter()
     response = False
     try:
+        from PIL import Image  # Deferred: Pillow is slow to import.
         img = Image.open(BytesIO(content))
         img.verify()  # Verify header-only, no full decode
         response = True
@@ -201,6 +197,15 @@ def is_valid_image(content: bytes):
     log_duration("is_valid_image() ", start_is_valid_image_check)
     return response
 
+def image_dimensions(content: bytes) -> tuple[int, int] | None:
+    """Return ``(width, height)`` from the image header, or None if it is not a readable image."""
+    try:
+        from PIL import Image
+        with Image.open(BytesIO(content)) as img:
+            return img.size
+    except Exception:
+        return None
+
 def is_image_size_out_of_bounds(content: bytes, fname: str = None):
     """Check the size of an image and see if we want it."""
     start_is_image_size_out_of_bounds_check = perf_counter()
@@ -208,6 +213,7 @@ def is_image_size_out_of_bounds(content: bytes, fname: str = None):
     config = get_config()
     if config.filter_pixel_dimensions:
         try:
+            from PIL import Image
             img = Image.open(BytesIO(content))
             w, h = img.size
             min_w = config.filter_pixel_dimensions.get("min_width", 1)
@@ -259,16 +265,42 @@ def is_directory_traversal_attempted(save_path:str):
     log_duration("is_directory_traversal_attempted() ", start_check)
     return response
 
-def atomic_save(content: bytes, save_path: Path, size: int):
+def find_saved_copy(save_path: Path, digest: str, size: int) -> Path | None:
+    """Return ``save_path`` or one of its numbered variants if it already holds this exact content."""
+    candidate, counter = save_path, 1
+    while candidate.exists():
+        try:
+            if candidate.stat().st_size == size and hashlib.sha256(candidate.read_bytes()).hexdigest() == digest:
+                return candidate
+        except OSError:
+            pass
+        candidate = save_path.with_stem(f"{save_path.stem}_{counter}")
+        counter += 1
+    return None
+
+def atomic_save(content: bytes, save_path: Path, size: int, durability=None, pace=None) -> Path | None:
     """
     Write content to a temporary file and atomically move it to the final path.
     Ensures no partial file writes and handles cleanup on failure.
+    ``durability`` (a ``Durability``) decides whether and when it is fsynced.
+    ``pace(nbytes)``, if given, is called before each chunk is written.
+    Returns the path actually written (a numbered suffix is added on name
+    collisions), or None if the save failed.
     """
     tmp_path = None
     try:
         with NamedTemporaryFile('wb', delete=False, dir=save_path.parent) as tmp:
-            tmp.write(content)
             tmp_path = Path(tmp.name)
+            if pace:
+                view = memoryview(content)
+                for start in range(0, len(view), WRITE_CHUNK):
+                    chunk = view[start:start + WRITE_CHUNK]
+                    pace(len(chunk))
+                    tmp.write(chunk)
+            else:
+                tmp.write(content)
+            if durability:
+                durability.before_publish(tmp)
 
         final_path = save_path
         counter = 1
@@ -277,7 +309,10 @@ def atomic_save(content: bytes, save_path: Path, size: int):
             counter += 1
 
         os.replace(tmp_path, final_path)
+        if durability:
+            durability.after_publish(final_path)
         log_proxy.info(f"💾 Saved → {final_path} ({size} B)")
+        return final_path
 
     except PermissionError:
         log_proxy.error(f"❌ Permission denied: {save_path}")
@@ -290,3 +325,4 @@ def atomic_save(content: bytes, save_path: Path, size: int):
     except Exception as e:
         log_proxy.error(f"❌ Unexpected save failure: {e}")
         cleanup_temp_file(tmp_path)
+    return None
@@ -0,0 +1,143 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Asynchronous save path.
+
+Accepted bodies become ``SaveJob``s.  ``SaveWriter.submit`` journals the job
+in the spool (when one is configured) and queues it, so the proxy's event
+loop only pays for a sequential append; a writer thread then stores the
+body and marks the journal entry done.  Queued jobs are written in the
+order a ``SaveScheduler`` picks (priority class, then domain), not FIFO.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_proxy
+from tzMCP.save_media_utils.admission import map_file
+from tzMCP.save_media_utils.scheduler import SaveScheduler
+
+
+@dataclass
+class SaveJob:
+    save_path: Path
+    content: bytes
+    url: str          # Sanitized URL (catalog, packs, WARC).
+    host: str
+    mime: str
+    digest: str
+    accepted_at: float = field(default_factory=time.time)
+    replayed: bool = False
+    seq: int = 0
+    ctx: object = None   # FlowContext of the live flow; None for replayed jobs.
+    spill: str = ""      # Spill file holding the body (``content`` maps it); journaled by path.
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @property
+    def body(self) -> bytes:
+        """What the spool stores: the content itself, or nothing when a spill file already holds it."""
+        return b"" if self.spill else self.content
+
+    def meta(self) -> dict:
+        """What the spool needs to redo this save without the flow."""
+        meta = {"save_path": str(self.save_path), "url": self.url, "host": self.host,
+                "mime": self.mime, "digest": self.digest, "accepted_at": self.accepted_at}
+        if self.spill:
+            meta["spill"] = self.spill
+        return meta
+
+    @classmethod
+    def from_meta(cls, meta: dict, content: bytes) -> "SaveJob":
+        """Rebuild a journaled job; a spilled body is mapped from its file (OSError if it is gone)."""
+        spill = meta.get("spill", "")
+        if spill:
+            content = map_file(spill)
+        return cls(Path(meta["save_path"]), content, meta["url"], meta["host"], meta["mime"],
+                   meta["digest"], meta["accepted_at"], replayed=True, spill=spill)
+
+
+class SaveWriter:
+    """Stores queued jobs on a background thread.
+
+    ``store(job)`` returns where the body went (None on failure) and runs on
+    the writer thread; ``on_saved(job, path)`` is then called there too.
+    Failed jobs stay in the spool and are retried on the next start.
+    """
+
+    def __init__(self, store, journal=None, on_saved=None, scheduler: SaveScheduler | None = None):
+        self.store = store
+        self.journal = journal
+        self.on_saved = on_saved
+        self.pending = 0
+        self.pending_bytes = 0
+        self.pending_memory = 0       # pending_bytes held in memory (spilled bodies are mapped files).
+        self.saved = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._unfinished = 0          # Submitted jobs not fully handled yet (for drain).
+        self.scheduler = scheduler or SaveScheduler()
+        self._thread = threading.Thread(target=self._loop, name="tzMCP-save-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: SaveJob):
+        if self.journal:
+            job.seq = self.journal.append(job.meta(), job.body)
+        with self._lock:
+            self.pending += 1
+            self.pending_bytes += job.size
+            if not job.spill:
+                self.pending_memory += job.size
+            self._unfinished += 1
+        self.scheduler.put(job)
+
+    def _loop(self):
+        while True:
+            job = self.scheduler.get()
+            if job is None:
+                return
+            try:
+                self._run(job)
+            finally:
+                with self._idle:
+                    self._unfinished -= 1
+                    self._idle.notify_all()
+
+    def _run(self, job: SaveJob):
+        final_path = None
+        try:
+            final_path = self.store(job)
+        except Exception as e:
+            log_proxy.error(f"❌ Save writer failed for {job.save_path.name}: {e}")
+        with self._lock:
+            self.pending -= 1
+            self.pending_bytes -= job.size
+            if not job.spill:
+                self.pending_memory -= job.size
+            if final_path is None:
+                self.failed += 1
+            else:
+                self.saved += 1
+        if final_path is None:
+            return
+        if self.journal and job.seq:
+            self.journal.done(job.seq)
+        if self.on_saved:
+            self.on_saved(job, final_path)
+
+    def drain(self):
+        """Block until every job submitted so far has been handled."""
+        with self._idle:
+            self._idle.wait_for(lambda: self._unfinished == 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"pending": self.pending, "pending_bytes": self.pending_bytes,
+                    "pending_memory": self.pending_memory, "saved": self.saved, "failed": self.failed}
+
+    def close(self):
+        """Finish queued jobs, then stop the thread."""
+        self.scheduler.close()
+        self._thread.join()
@@ -0,0 +1,200 @@
+"""
+Order in which queued saves are written.
+
+Jobs are sorted into priority classes by MIME group and size, and each
+class into one queue per source domain.  Both levels are served by
+deficit round robin over bytes: every visit credits a class
+``weight × quantum`` bytes (a domain gets ``quantum``) and it may write
+jobs while its credit covers them.  A class of weight 8 therefore gets
+eight times the disk bandwidth of a weight-1 class while both have work,
+and one domain's multi-hundred-MB videos cannot hold back another
+domain's images in the same class.  Idle classes and domains earn no
+credit, so nothing is lost when only one of them is busy.
+"""
+import threading
+from collections import deque
+from dataclasses import dataclass
+from tzMCP.save_media_utils.mime_categories import mime_group
+
+DEFAULT_QUANTUM = 1024 * 1024
+DEFAULT_CLASSES = [
+    {"name": "small_images", "groups": ["image"], "max_kb": 512, "weight": 8},
+    {"name": "images", "groups": ["image"], "max_kb": 0, "weight": 4},
+    {"name": "video_audio", "groups": ["video", "audio"], "max_kb": 0, "weight": 1},
+    {"name": "other", "groups": [], "max_kb": 0, "weight": 2},
+]
+FALLBACK_CLASS = "other"
+NOT_READY_POLL = 0.05   # Seconds between retries while every queued domain is rate-limited.
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    name: str
+    groups: frozenset
+    max_bytes: int      # 0 = any size
+    weight: int
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "PriorityClass":
+        return cls(settings["name"], frozenset(settings.get("groups", ())),
+                   settings.get("max_kb", 0) * 1024, max(1, settings.get("weight", 1)))
+
+    def matches(self, group: str | None, size: int) -> bool:
+        return (not self.groups or group in self.groups) and (not self.max_bytes or size <= self.max_bytes)
+
+
+def _cost(job) -> int:
+    return max(1, job.size)
+
+
+class _Fifo:
+    """Jobs of one domain within one class, in arrival order."""
+
+    def __init__(self):
+        self.jobs = deque()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def push(self, job):
+        self.jobs.append(job)
+
+    def peek(self, eligible=None):
+        job = self.jobs[0]
+        return job if eligible is None or eligible(job) else None
+
+    def pop(self, eligible=None):
+        job = self.peek(eligible)
+        self.jobs.popleft()
+        return job
+
+
+class DrrRing:
+    """Deficit round robin over child queues (anything with ``len``, ``push``, ``peek`` and ``pop``).
+
+    ``peek`` settles on the job that is served next; it only advances the
+    ring when the current child's credit cannot cover its head, so calling
+    it again (or ``pop`` afterwards) sees the same job.  That lets rings
+    nest: a parent ring peeks into a child ring to learn the cost of the
+    child's next job.  Jobs failing ``eligible`` (e.g. a rate-limited
+    domain) are passed over without credit; ``peek`` returns None when
+    nothing is eligible.
+    """
+
+    def __init__(self, quantum, key_of, factory=_Fifo):
+        self.quantum = quantum            # Callable: key -> bytes credited per visit.
+        self.key_of = key_of              # Callable: job -> child key.
+        self.factory = factory            # Builds an empty child.
+        self.children: dict = {}
+        self._deficit: dict = {}
+        self._active: deque = deque()     # Keys with work; the front one is being served.
+        self._credited = False            # Whether the front key got its credit for this visit.
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, job):
+        key = self.key_of(job)
+        child = self.children.get(key)
+        if child is None:
+            child = self.children[key] = self.factory()
+            self._active.append(key)
+            self._deficit[key] = 0
+        child.push(job)
+        self._size += 1
+
+    def peek(self, eligible=None):
+        passed_over = 0
+        while self._active and passed_over < len(self._active):
+            key = self._active[0]
+            job = self.children[key].peek(eligible)
+            if job is None:
+                passed_over += 1
+            else:
+                passed_over = 0
+                if not self._credited:
+                    self._deficit[key] += self.quantum(key)
+                    self._credited = True
+                if _cost(job) <= self._deficit[key]:
+                    return job
+            self._active.rotate(-1)
+            self._credited = False
+        return None
+
+    def pop(self, eligible=None):
+        job = self.peek(eligible)
+        if job is None:
+            return None
+        key = self._active[0]
+        child = self.children[key]
+        child.pop(eligible)
+        self._deficit[key] -= _cost(job)
+        self._size -= 1
+        if not len(child):
+            # An emptied queue keeps no credit and leaves the ring (domains come and go).
+            self._active.popleft()
+            del self._deficit[key]
+            del self.children[key]
+            self._credited = False
+        return job
+
+
+class SaveScheduler:
+    """Blocking, fair job queue for the save writer: priority classes, then domains."""
+
+    def __init__(self, classes=None, quantum: int = DEFAULT_QUANTUM, ready=None):
+        self.ready = ready      # Callable: job -> False while its domain is rate-limited.
+        self.classes = [PriorityClass.from_config(c) for c in (classes or DEFAULT_CLASSES)]
+        if not any(not c.groups and not c.max_bytes for c in self.classes):
+            self.classes.append(PriorityClass(FALLBACK_CLASS, frozenset(), 0, 1))
+        weights = {c.name: c.weight for c in self.classes}
+        self._ring = DrrRing(lambda name: weights[name] * quantum, self.classify,
+                             lambda: DrrRing(lambda _host: quantum, lambda job: job.host))
+        self.served: dict[str, int] = {c.name: 0 for c in self.classes}
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_config(cls, settings: dict, ready=None) -> "SaveScheduler":
+        return cls(settings["classes"], settings["quantum_kb"] * 1024, ready)
+
+    def classify(self, job) -> str:
+        group = mime_group(job.mime)
+        return next(c.name for c in self.classes if c.matches(group, job.size))
+
+    def put(self, job):
+        with self._cond:
+            self._ring.push(job)
+            self._cond.notify()
+
+    def get(self):
+        """Next job to write, blocking while nothing is queued (or ready); None once closed and drained.
+
+        After ``close`` the readiness check is dropped so shutdown flushes at full speed.
+        """
+        with self._cond:
+            while True:
+                self._cond.wait_for(lambda: len(self._ring) or self._closed)
+                if not len(self._ring):
+                    return None
+                job = self._ring.pop(None if self._closed else self.ready)
+                if job is not None:
+                    self.served[self.classify(job)] += 1
+                    return job
+                self._cond.wait(NOT_READY_POLL)
+
+    def __len__(self):
+        with self._cond:
+            return len(self._ring)
+
+    def close(self):
+        """Let ``get`` drain what is queued, then return None."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = {name: len(ring) for name, ring in self._ring.children.items()}
+            return {"queued": queued, "served": dict(self.served)}
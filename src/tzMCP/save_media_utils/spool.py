@@ -0,0 +1,211 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Write-ahead spool for accepted bodies that are not saved yet.
+
+When a body passes the checks it is appended to this process's journal in
+``<save_dir>/.spool`` before being queued for the save writer, and a short
+"done" record follows once it is stored.  If the proxy crashes or is
+killed, the next start replays every put without a done into the save
+path, so accepted captures are never lost.
+
+Records are ``<length><crc32><kind>`` headers followed by the payload; a
+torn record at the tail (the crash itself) fails its CRC and ends replay.
+Each live journal is held under an exclusive OS lock, so proxies sharing
+a save_dir only replay journals whose owner has exited.  Journals rotate
+at ``rotate_bytes`` and are deleted once everything in them is done.
+"""
+import io
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_proxy
+from tzMCP.save_media_utils.file_lock import try_lock
+
+SPOOL_DIR_NAME = ".spool"
+JOURNAL_PREFIX = "journal-"
+JOURNAL_SUFFIX = ".wal"
+DEFAULT_ROTATE_BYTES = 256 * 1024 * 1024
+READ_CHUNK = 1024 * 1024
+
+_HEADER = struct.Struct("<IIB")   # payload length, crc32(kind + payload), kind
+_META_LEN = struct.Struct("<I")
+_SEQ = struct.Struct("<Q")
+PUT, DONE = 1, 2
+
+
+def spool_dir(save_dir: Path) -> Path:
+    return Path(save_dir) / SPOOL_DIR_NAME
+
+
+def _record(kind: int, payload: bytes) -> bytes:
+    crc = zlib.crc32(payload, zlib.crc32(bytes([kind])))
+    return _HEADER.pack(len(payload), crc, kind) + payload
+
+
+def _payload_intact(f, length: int, kind: int, crc: int) -> bool:
+    """Check the CRC of the ``length``-byte payload at ``f``'s position, reading it in chunks."""
+    running = zlib.crc32(bytes([kind]))
+    remaining = length
+    while remaining:
+        chunk = f.read(min(remaining, READ_CHUNK))
+        if not chunk:
+            return False
+        running = zlib.crc32(chunk, running)
+        remaining -= len(chunk)
+    return running == crc
+
+
+def _pending_puts(f) -> list[tuple[dict, int, int]]:
+    """``(meta, body offset, body size)`` of every put without a done record, in append order."""
+    pending: dict[int, tuple[dict, int, int]] = {}
+    pos = 0
+    while True:
+        f.seek(pos)
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            break
+        length, crc, kind = _HEADER.unpack(header)
+        start = pos + _HEADER.size
+        if not _payload_intact(f, length, kind, crc):
+            break
+        f.seek(start)
+        if kind == PUT:
+            (meta_len,) = _META_LEN.unpack(f.read(_META_LEN.size))
+            meta = json.loads(f.read(meta_len))
+            body_at = start + _META_LEN.size + meta_len
+            pending[meta["seq"]] = (meta, body_at, start + length - body_at)
+        elif kind == DONE:
+            pending.pop(_SEQ.unpack(f.read(_SEQ.size))[0], None)
+        pos = start + length
+    return list(pending.values())
+
+
+def iter_journal(f):
+    """Yield ``(meta, body)`` for each put in the open journal ``f`` that has no done record.
+
+    Records are CRC-checked in chunks and bodies are read one at a time, so a
+    journal is never held in memory whole.  Stops at the first torn record.
+    """
+    for meta, offset, size in _pending_puts(f):
+        f.seek(offset)
+        yield meta, f.read(size)
+
+
+def read_journal(data: bytes) -> list[tuple[dict, bytes]]:
+    """Puts in journal ``data`` that have no done record, in append order."""
+    return list(iter_journal(io.BytesIO(data)))
+
+
+class SpoolJournal:
+    """This process's journal of accepted, not-yet-saved bodies."""
+
+    def __init__(self, directory: Path, durability=None, rotate_bytes: int = DEFAULT_ROTATE_BYTES):
+        self.directory = Path(directory)
+        self.durability = durability
+        self.rotate_bytes = rotate_bytes
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.path: Path | None = None             # Journal receiving new puts.
+        self._files: dict[Path, object] = {}      # Open (and locked) journals, current and rotated.
+        self._outstanding: dict[Path, int] = {}   # Journal -> puts without a done.
+        self._owner: dict[int, Path] = {}         # seq -> journal holding it.
+
+    def _open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"{JOURNAL_PREFIX}{os.getpid()}-{time.time_ns()}{JOURNAL_SUFFIX}"
+        f = open(self.path, "xb")
+        try_lock(f)
+        self._files[self.path] = f
+        self._outstanding[self.path] = 0
+
+    def _write(self, path: Path, record: bytes):
+        f = self._files[path]
+        f.write(record)
+        f.flush()
+        if self.durability:
+            self.durability.appended(f, path)
+
+    def append(self, meta: dict, body: bytes) -> int:
+        """Journal one accepted body; returns its sequence number for ``done``."""
+        with self._lock:
+            if self.path is None:
+                self._open()
+            elif self._files[self.path].tell() >= self.rotate_bytes:
+                current = self.path
+                self._open()
+                if self._outstanding[current] == 0:
+                    self._remove(current)
+            self._seq += 1
+            encoded = json.dumps(dict(meta, seq=self._seq)).encode("utf-8")
+            self._write(self.path, _record(PUT, _META_LEN.pack(len(encoded)) + encoded + body))
+            self._outstanding[self.path] += 1
+            self._owner[self._seq] = self.path
+            return self._seq
+
+    def done(self, seq: int):
+        """Mark ``seq`` as stored; a rotated journal is deleted once nothing in it is outstanding."""
+        with self._lock:
+            path = self._owner.pop(seq, None)
+            if path is None:
+                return
+            self._outstanding[path] -= 1
+            if path != self.path and self._outstanding[path] == 0:
+                self._remove(path)
+            else:
+                self._files[path].write(_record(DONE, _SEQ.pack(seq)))
+                self._files[path].flush()
+
+    def _remove(self, path: Path):
+        self._files.pop(path).close()
+        del self._outstanding[path]
+        try:
+            path.unlink()
+        except OSError as e:
+            log_proxy.warning(f"⚠ Could not remove spool journal {path}: {e}")
+
+    def close(self):
+        """Close every journal; empty ones are deleted, the rest stay for replay."""
+        with self._lock:
+            for path in list(self._files):
+                if self._outstanding[path] == 0:
+                    self._remove(path)
+                else:
+                    self._files.pop(path).close()
+            self.path = None
+
+    def replay_orphans(self, replay) -> int:
+        """Call ``replay(meta, body)`` for every pending put in journals whose process is gone.
+
+        Each orphan stays locked while it is replayed, so concurrently
+        starting proxies never replay the same journal, and is deleted
+        afterwards.  ``replay`` should journal the entry again here.
+        Returns the number of entries replayed.
+        """
+        replayed = 0
+        for path in sorted(self.directory.glob(f"{JOURNAL_PREFIX}*{JOURNAL_SUFFIX}")):
+            if path in self._files:
+                continue
+            try:
+                f = open(path, "rb+")
+            except OSError:
+                continue
+            try:
+                if not try_lock(f):
+                    continue      # Its owner is still running.
+                for meta, body in iter_journal(f):   # Through the locking handle (Windows locks are mandatory).
+                    replay(meta, body)
+                    replayed += 1
+            except (OSError, ValueError) as e:
+                log_proxy.error(f"❌ Unreadable spool journal {path}: {e}")
+                continue
+            finally:
+                f.close()
+            try:
+                path.unlink()
+            except OSError as e:
+                log_proxy.warning(f"⚠ Could not remove replayed spool journal {path}: {e}")
+        return replayed
@@ -0,0 +1,178 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Single-writer SQLite service shared by the dedup store and the media catalog.
+
+One write connection lives on a dedicated writer thread that drains a
+request queue and group-commits each batch (``BEGIN IMMEDIATE``, so other
+processes sharing the file wait up to ``BUSY_TIMEOUT`` instead of
+deadlocking).  Every other thread reads through its own read-only
+connection; the database runs in WAL mode, so readers never block the
+writer.  Subclasses create their tables in ``init_schema``.
+"""
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_proxy
+
+# Upper bound on requests committed together by the writer thread.
+WRITE_BATCH_SIZE = 256
+
+# Seconds a connection waits for another process's lock before failing.
+BUSY_TIMEOUT = 10.0
+
+_STOP = object()
+
+
+class SqliteWorker:
+    """A SQLite file with one writer thread and per-thread read-only connections."""
+    thread_name = "tzMCP-sqlite-writer"
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path).resolve()
+        self._queue: queue.Queue = queue.Queue()
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._submit_lock = threading.Lock()   # Nothing is queued after the stop sentinel.
+
+        # The writer connection is created and used only on the writer thread.
+        ready: Future = Future()
+        self._writer = threading.Thread(target=self._write_loop, args=(ready,),
+                                        name=self.thread_name, daemon=True)
+        self._writer.start()
+        ready.result()   # Surface schema/open errors to the caller.
+
+    def init_schema(self, conn: sqlite3.Connection):
+        """Create this database's tables; runs once on the writer connection."""
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+    def _open_writer(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly per batch.
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("BEGIN IMMEDIATE")
+        self.init_schema(conn)
+        conn.execute("COMMIT")
+        return conn
+
+    def _write_loop(self, ready: Future):
+        try:
+            conn = self._open_writer()
+        except Exception as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            work, done = [], []
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                    continue
+                fn, future, transactional = item
+                if transactional:
+                    work.append((fn, future))
+                    continue
+                # Statements such as VACUUM cannot run inside a transaction.
+                done += self._run_batch(conn, work) if work else []
+                work = []
+                try:
+                    done.append((future, fn(conn), None))
+                except Exception as e:
+                    done.append((future, None, e))
+            done += self._run_batch(conn, work) if work else []
+
+            # Acknowledge only after the batch is committed.
+            for future, result, error in done:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+        conn.close()
+
+    @staticmethod
+    def _run_batch(conn: sqlite3.Connection, work: list) -> list:
+        """Run queued writes in one transaction; returns ``(future, result, error)`` triples."""
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except Exception as e:
+            log_proxy.error(f"❌ SQLite database is locked by another process: {e}")
+            return [(future, None, e) for _, future in work]
+
+        done = []
+        for fn, future in work:
+            try:
+                done.append((future, fn(conn), None))
+            except Exception as e:
+                done.append((future, None, e))
+        try:
+            conn.execute("COMMIT")
+        except Exception as e:
+            log_proxy.error(f"❌ SQLite commit failed: {e}")
+            conn.execute("ROLLBACK")
+            done = [(future, None, e) for future, _, _ in done]
+        return done
+
+    def submit(self, fn, transactional: bool = True) -> Future:
+        """Queue ``fn(write_connection)`` for the writer thread.
+
+        Transactional requests are group-committed with their neighbours;
+        others run on their own, outside any transaction.
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if not self._closed:
+                self._queue.put((fn, future, transactional))
+                return future
+        future.set_exception(RuntimeError(f"{type(self).__name__} is closed"))
+        return future
+
+    def write(self, fn, transactional: bool = True):
+        """Run ``fn(write_connection)`` on the writer thread and wait for the commit."""
+        return self.submit(fn, transactional).result()
+
+    # ------------------------------------------------------------------
+    # Reader side
+    # ------------------------------------------------------------------
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can release it from the
+            # shutdown thread; each connection is otherwise used by one thread.
+            conn = sqlite3.connect(f"{self.db_path.as_uri()}?mode=ro", uri=True,
+                                   timeout=BUSY_TIMEOUT, check_same_thread=False)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def read(self, fn):
+        """Run ``fn(read_only_connection)`` on this thread's reader connection."""
+        return fn(self._reader())
+
+    def close(self):
+        """Stop the writer after it drains the queue, and close all reader connections."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
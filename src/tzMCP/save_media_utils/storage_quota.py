@@ -0,0 +1,345 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Quota and free-space management for ``save_dir``.
+
+``StorageManager`` sizes ``save_dir`` with one background scan at startup
+and from then on keeps the total up to date from the saves it is told
+about and the files it evicts, so nothing rescans the tree per save.
+Proxies sharing a save_dir (pool workers) keep that total in one small
+counter file updated under an OS lock, and only the holder of the evictor
+lock scans and evicts; another process takes over when it exits.
+
+Before a body is queued, ``admit`` checks it against a cached free-space
+reading (refreshed every ``FREE_CHECK_SECONDS`` and reduced by what was
+written since) so saves stop cleanly while ``min_free`` bytes are still
+left, instead of failing with OSError mid-write.  When usage passes the
+quota (``max_bytes``, or ``max_percent`` of the disk), or free space drops
+below ``min_free``, the evictor removes the oldest (``age``) or least
+recently accessed (``lru``) saves until usage is back under ``LOW_WATER``
+of the quota.  Only what tzMCP saved is evicted: loose files the catalog
+lists (``saved_files``) and closed pack segments.  Anything else in
+save_dir, the spool, databases and any segment still locked by its writer
+never are.  Digests of evicted saves stay in the dedup index, so the same
+content is not captured again.  With eviction set to ``none`` saves simply
+stop at the quota.
+"""
+import os
+import shutil
+import struct
+import threading
+import time
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_proxy
+from tzMCP.save_media_utils.file_lock import lock, try_lock, unlock
+from tzMCP.save_media_utils.pack_store import PACK_DIR_NAME, index_path
+from tzMCP.save_media_utils.spool import SPOOL_DIR_NAME
+
+AGE, LRU, NONE = "age", "lru", "none"
+EVICT_MODES = (AGE, LRU, NONE)
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+FREE_CHECK_SECONDS = 2.0
+LOW_WATER = 0.9     # Eviction frees down to this fraction of the quota.
+EVICT_RETRY_SECONDS = 60.0   # Back-off after an eviction pass could not free enough.
+USAGE_FILE = ".tzmcp_usage"
+EVICTOR_LOCK_FILE = ".tzmcp_evictor.lock"
+
+_USAGE = struct.Struct("<qB")   # bytes used, whether a scan has set it
+
+
+class SharedUsage:
+    """The byte total of ``save_dir``, in a file every process sharing it updates under an OS lock."""
+
+    def __init__(self, path: Path):
+        self._file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+        self._lock = threading.Lock()
+
+    def _update(self, change) -> tuple[int, int]:
+        """Apply ``change((total, scanned)) -> (total, scanned)`` atomically and return the result."""
+        with self._lock:
+            self._file.seek(0)
+            lock(self._file)
+            try:
+                raw = self._file.read(_USAGE.size)
+                current = _USAGE.unpack(raw) if len(raw) == _USAGE.size else (0, 0)
+                updated = change(current)
+                if updated != current:
+                    self._file.seek(0)
+                    self._file.write(_USAGE.pack(*updated))
+                    self._file.flush()
+            finally:
+                self._file.seek(0)
+                unlock(self._file)
+        return updated
+
+    def raw(self) -> int:
+        return self._update(lambda current: current)[0]
+
+    def get(self) -> int | None:
+        """The shared total, or None until some process has scanned ``save_dir``."""
+        total, scanned = self._update(lambda current: current)
+        return total if scanned else None
+
+    def add(self, delta: int) -> int | None:
+        total, scanned = self._update(lambda current: (max(0, current[0] + delta), current[1]))
+        return total if scanned else None
+
+    def settle(self, scanned: int, before: int) -> int:
+        """Set the total to a fresh scan plus what was added since ``raw()`` returned ``before``."""
+        return self._update(lambda current: (max(0, scanned + current[0] - before), 1))[0]
+
+    def close(self):
+        self._file.close()
+
+
+class _Candidate:
+    """A unit of eviction: a loose file, or a pack segment with its index."""
+    __slots__ = ("paths", "size", "stamp")
+
+    def __init__(self, paths: list[Path], size: int, stamp: float):
+        self.paths = paths
+        self.size = size
+        self.stamp = stamp
+
+
+def _segment_closed(segment: Path) -> bool:
+    """False while a writer (in this process or another) still holds ``segment``'s lock."""
+    try:
+        with open(segment, "rb") as f:
+            return try_lock(f)      # Closing the probe drops the lock again.
+    except OSError:
+        return False
+
+
+class StorageManager:
+    """Tracks ``save_dir`` usage and keeps it within quota and free-space limits."""
+
+    def __init__(self, save_dir: Path, max_bytes: int = 0, max_percent: float = 0, min_free: int = 0,
+                 evict: str = AGE, on_evicted=None, saved_files=None):
+        self.save_dir = Path(save_dir).resolve()
+        self.evict = evict if evict in EVICT_MODES else AGE
+        self.min_free = min_free
+        self.on_evicted = on_evicted      # Called with the evicted paths (e.g. to drop catalog rows).
+        self.saved_files = saved_files    # () -> paths of loose files tzMCP saved; None evicts only packs.
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        disk = shutil.disk_usage(self.save_dir)
+        limits = [limit for limit in (max_bytes, int(disk.total * max_percent / 100)) if limit]
+        self.limit = min(limits) if limits else 0
+        self._shared = SharedUsage(self.save_dir / USAGE_FILE)
+        self.usage: int | None = None     # Unknown until some process has scanned save_dir.
+        self.evictor = False              # Whether this process scans and evicts for everyone.
+        self._evictor_lock = None
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self.refused = 0
+        self._free = disk.free
+        self._free_at = time.monotonic()
+        self._written_since_check = 0
+        self._full = False
+        self._retry_at = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="tzMCP-storage", daemon=True)
+
+    @classmethod
+    def from_config(cls, save_dir: Path, settings: dict, on_evicted=None, saved_files=None) -> "StorageManager":
+        return cls(save_dir, int(settings["max_gb"] * GB), settings["max_percent"], settings["min_free_mb"] * MB,
+                   settings["evict"], on_evicted, saved_files)
+
+    def start(self) -> "StorageManager":
+        self._thread.start()
+        return self
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+    def free_bytes(self) -> int:
+        """Free space on the save disk, re-read at most every ``FREE_CHECK_SECONDS``."""
+        with self._cond:
+            now = time.monotonic()
+            if now - self._free_at >= FREE_CHECK_SECONDS:
+                try:
+                    self._free = shutil.disk_usage(self.save_dir).free
+                except OSError as e:
+                    log_proxy.warning(f"⚠ Could not read free space of {self.save_dir}: {e}")
+                self._free_at = now
+                self._written_since_check = 0
+            return self._free - self._written_since_check
+
+    def admit(self, size: int) -> bool:
+        """Whether a save of ``size`` bytes may go ahead now."""
+        free = self.free_bytes()
+        with self._cond:
+            reason = None
+            if free - size < self.min_free:
+                reason = f"only {free // MB} MB free (keeping {self.min_free // MB} MB)"
+            elif self.evict == NONE and self.limit and self.usage is not None and self.usage + size > self.limit:
+                reason = f"quota of {self.limit // MB} MB reached"
+            if reason is None:
+                if self._full:
+                    self._full = False
+                    log_proxy.info("💾 Save directory has room again; saving resumed.")
+                return True
+            self.refused += 1
+            if not self._full:
+                self._full = True
+                log_proxy.warning(f"⛔ Saving paused: {reason}.")
+            if self.evict != NONE:
+                self._cond.notify_all()
+            return False
+
+    def added(self, size: int):
+        """Record ``size`` bytes written to ``save_dir`` (writer thread)."""
+        usage = self._shared.add(size)
+        with self._cond:
+            self._written_since_check += size
+            self.usage = usage
+            if self._needs_eviction():
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Background work
+    # ------------------------------------------------------------------
+    def _needs_eviction(self) -> bool:
+        if self.evict == NONE or not self.evictor or self.usage is None:
+            return False
+        return bool(self.limit and self.usage > self.limit) or self._free - self._written_since_check < self.min_free
+
+    def _try_become_evictor(self):
+        """Take the evictor lock unless another process holds it, then size save_dir for everyone."""
+        f = open(self.save_dir / EVICTOR_LOCK_FILE, "ab")
+        if not try_lock(f):
+            f.close()
+            return
+        before = self._shared.raw()
+        try:
+            scanned = self._scan_usage()
+        except Exception as e:
+            log_proxy.error(f"❌ Could not size save directory {self.save_dir}: {e}")
+            f.close()
+            return
+        usage = self._shared.settle(scanned, before)
+        self._evictor_lock = f
+        with self._cond:
+            self.usage = usage
+            self.evictor = True
+        log_proxy.info(f"💾 Save directory holds {usage // MB} MB"
+                       + (f" of a {self.limit // MB} MB quota." if self.limit else "."))
+
+    def _loop(self):
+        while True:
+            if self._evictor_lock is None:
+                self._try_become_evictor()
+            usage = self._shared.get()      # Picks up what the other processes wrote or evicted.
+            with self._cond:
+                self.usage = usage
+                self._cond.wait_for(lambda: self._closed or (self._needs_eviction() and time.monotonic() >= self._retry_at),
+                                    timeout=FREE_CHECK_SECONDS)
+                if self._closed:
+                    return
+            self.free_bytes()
+            with self._cond:
+                needed = self._bytes_to_free() if time.monotonic() >= self._retry_at else 0
+            if needed > 0:
+                try:
+                    self._evict(needed)
+                except Exception as e:
+                    log_proxy.error(f"❌ Eviction failed: {e}")
+
+    def _bytes_to_free(self) -> int:
+        if not self._needs_eviction():
+            return 0
+        over_quota = self.usage - int(self.limit * LOW_WATER) if self.limit else 0
+        short_of_free = self.min_free - (self._free - self._written_since_check)
+        return max(over_quota, short_of_free + (self.min_free - int(self.min_free * LOW_WATER)))
+
+    def _scan_usage(self) -> int:
+        total = 0
+        for root, dirs, files in os.walk(self.save_dir):
+            if Path(root) == self.save_dir:
+                dirs[:] = [d for d in dirs if d != SPOOL_DIR_NAME]
+                files = [f for f in files if f not in (USAGE_FILE, EVICTOR_LOCK_FILE)]
+            for name in files:
+                try:
+                    total += os.stat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def _candidates(self) -> list[_Candidate]:
+        """Evictable saves, first to go first."""
+        lru = self.evict == LRU
+        found = []
+        inside = f"{self.save_dir}{os.sep}"
+        # Pack members ("<segment>#<offset>:<size>") are not files and go with their segment below.
+        for name in set(self.saved_files() if self.saved_files else ()):
+            if not name.startswith(inside):
+                continue
+            path = Path(name)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                found.append(_Candidate([path], st.st_size, max(st.st_atime, st.st_mtime) if lru else st.st_mtime))
+        for segment in sorted((self.save_dir / PACK_DIR_NAME).glob("*.tar")):
+            if not _segment_closed(segment):
+                continue
+            try:
+                st = segment.stat()
+                index = index_path(segment)
+                size = st.st_size + (index.stat().st_size if index.exists() else 0)
+            except OSError:
+                continue
+            found.append(_Candidate([segment, index], size, max(st.st_atime, st.st_mtime) if lru else st.st_mtime))
+        found.sort(key=lambda c: c.stamp)
+        return found
+
+    def _evict(self, needed: int):
+        start = time.perf_counter()
+        freed, gone = 0, []
+        for candidate in self._candidates():
+            if freed >= needed:
+                break
+            for path in candidate.paths:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    log_proxy.warning(f"⚠ Could not evict {path}: {e}")
+                    break
+            else:
+                freed += candidate.size
+                gone.append(str(candidate.paths[0]))
+        usage = self._shared.add(-freed)
+        with self._cond:
+            self.usage = usage
+            self.evicted_files += len(gone)
+            self.evicted_bytes += freed
+            self._free_at = 0.0          # Re-read free space on the next check.
+            if freed < needed:
+                self._retry_at = time.monotonic() + EVICT_RETRY_SECONDS
+        if gone and self.on_evicted:
+            self.on_evicted(gone)
+        level = log_proxy.info if freed >= needed else log_proxy.warning
+        level(f"🧹 Evicted {len(gone)} save(s) ({freed // MB} MB of {needed // MB} MB needed, by {self.evict}) "
+              f"in {time.perf_counter() - start:.2f}s.")
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"usage": self.usage, "limit": self.limit, "free": self._free - self._written_since_check,
+                    "evicted_files": self.evicted_files, "evicted_bytes": self.evicted_bytes,
+                    "refused": self.refused, "evictor": self.evictor}
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self._evictor_lock is not None:
+            self._evictor_lock.close()     # Lets another process take over.
+            self._evictor_lock = None
+        self._shared.close()
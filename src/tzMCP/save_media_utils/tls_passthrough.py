@@ -0,0 +1,140 @@
+# pylint: disable=logging-fstring-interpolation,broad-exception-caught
+"""
+Automatic TLS passthrough for hosts that never yield media.
+
+``HostStats`` counts saved and rejected responses per host.  From those
+counts and the configured domain lists, ``passthrough_patterns`` builds
+mitmproxy ``ignore_hosts`` / ``allow_hosts`` regexes so unproductive or
+blocked hosts are tunnelled without TLS interception on their next
+connection.  A tunnelled host sends no more flows, so its counters stop
+changing; ``expire`` forgets them after a while and the host is
+intercepted and judged again.
+"""
+import json
+import re
+import time
+from pathlib import Path
+from tzMCP.common_utils.log_config import log_proxy
+
+BARE_DOMAIN = re.compile(r"[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*")
+
+
+def _stats_fingerprint(config) -> str:
+    """Settings that decide whether a host's responses are saved.
+
+    Changing any of them can turn an unproductive host into a productive
+    one, so recorded statistics are discarded when the fingerprint changes.
+    """
+    return json.dumps([
+        sorted(getattr(config, "allowed_mime_groups", []) or []),
+        getattr(config, "filter_file_size", {}),
+        getattr(config, "filter_pixel_dimensions", {}),
+    ], sort_keys=True, default=str)
+
+
+class HostStats:
+    """Saved / rejected response counters per host, persisted as JSON."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.fingerprint = ""
+        self.counts: dict[str, list] = {}   # host -> [saved, rejected, last counted (epoch s)]
+        self._dirty = False
+
+    def load(self, config):
+        """Load counters recorded under the same filter settings, if any."""
+        self.fingerprint = _stats_fingerprint(config)
+        self.counts = {}
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("fingerprint") == self.fingerprint:
+                now = time.time()
+                self.counts = {host: [*counts[:2], counts[2] if len(counts) > 2 else now]
+                               for host, counts in data.get("hosts", {}).items()}
+            else:
+                log_proxy.info("Capture filters changed; host statistics were reset.")
+        except Exception as e:
+            log_proxy.warning(f"⚠ Ignoring unreadable host statistics {self.path}: {e}")
+
+    def sync(self, config):
+        """Reset the counters if the capture filters changed since they were recorded."""
+        fingerprint = _stats_fingerprint(config)
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.counts = {}
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"fingerprint": self.fingerprint, "hosts": self.counts}), encoding="utf-8")
+            self._dirty = False
+        except Exception as e:
+            log_proxy.warning(f"⚠ Failed to save host statistics {self.path}: {e}")
+
+    def record(self, host: str, saved: bool, min_flows: int) -> bool:
+        """Count one response; return True if the host just crossed the passthrough threshold."""
+        if not host:
+            return False
+        counts = self.counts.setdefault(host, [0, 0, 0.0])
+        was_unproductive = counts[0] == 0 and counts[1] >= min_flows
+        counts[0 if saved else 1] += 1
+        counts[2] = time.time()
+        self._dirty = True
+        return was_unproductive != (counts[0] == 0 and counts[1] >= min_flows)
+
+    def expire(self, max_age: float, now: float | None = None) -> bool:
+        """Forget hosts not counted for ``max_age`` seconds (0 keeps them); True if any were dropped."""
+        if not max_age:
+            return False
+        cutoff = (time.time() if now is None else now) - max_age
+        stale = [host for host, counts in self.counts.items() if counts[2] < cutoff]
+        for host in stale:
+            del self.counts[host]
+        self._dirty |= bool(stale)
+        return bool(stale)
+
+    def unproductive_hosts(self, min_flows: int) -> list[str]:
+        """Hosts that have never produced a save in at least ``min_flows`` responses."""
+        return sorted(host for host, (saved, rejected, _) in self.counts.items()
+                      if saved == 0 and rejected >= min_flows)
+
+
+def _domain_rule_pattern(entry: str) -> str:
+    """Translate a whitelist/blacklist entry into a mitmproxy ``host:port`` regex.
+
+    Regex entries are written against the bare host (as the save filters
+    match them), so every end-of-string ``$`` also accepts a ``:port``.
+    """
+    if BARE_DOMAIN.fullmatch(entry):
+        return rf"^(?:.+\.)?{re.escape(entry.lower())}:\d+$"
+    out, i, in_class = [], 0, False
+    while i < len(entry):
+        char = entry[i]
+        if char == "\\":
+            out.append(entry[i:i + 2])
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        out.append(r"(?::\d+)?$" if char == "$" and not in_class else char)
+        i += 1
+    return "".join(out)
+
+
+def passthrough_patterns(config, stats: HostStats) -> tuple[list[str], list[str]]:
+    """Return ``(ignore_hosts, allow_hosts)`` for the current config and statistics."""
+    settings = getattr(config, "tls_passthrough", {}) or {}
+    if not settings.get("enabled"):
+        return [], []
+    min_flows = settings.get("min_flows", 25)
+    ignore = [_domain_rule_pattern(entry) for entry in getattr(config, "blacklist", [])]
+    ignore += [rf"^{re.escape(host)}:\d+$" for host in stats.unproductive_hosts(min_flows)]
+    allow = [_domain_rule_pattern(entry) for entry in getattr(config, "whitelist", [])]
+    return ignore, allow
@@ -0,0 +1,121 @@
+# pylint: disable=logging-fstring-interpolation
+"""
+URL + validator memo for repeated fetches.
+
+Browsers refetch the same URL constantly (SPA navigation, revalidation).
+When a response carries the same ETag / Last-Modified / Content-Length as a
+body we already saved or rejected as a duplicate, the earlier verdict still
+holds, so the flow can be decided from its headers alone and the body is
+never buffered, sniffed or hashed.
+
+Only dedup outcomes are remembered: they do not depend on the capture
+filters, so a config reload cannot make them stale.  URLs carrying
+credentials in their query (``SENSITIVE_KEYS``) are remembered in memory
+only and never written to the database.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+MEMO_KEY = "tzmcp_memo_verdict"
+SAVED = "saved"
+DUPLICATE = "duplicate"
+SENSITIVE_KEYS = {"token", "access_token", "auth", "session", "key"}
+
+
+def normalize_url(url: str) -> str:
+    """Case-fold scheme and host and drop the fragment; path and query are kept verbatim."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+
+def has_credentials(url: str) -> bool:
+    """Whether ``url``'s query carries a token or session parameter that must not be persisted."""
+    query = urlsplit(url).query
+    return bool(query) and any(k.lower() in SENSITIVE_KEYS for k, _ in parse_qsl(query, keep_blank_values=True))
+
+
+def validators_of(headers) -> str | None:
+    """Return the validator tuple as a string, or None if the response has no strong validator.
+
+    Content-Length alone is too weak to prove two bodies are identical, so an
+    ETag or Last-Modified header is required.
+    """
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return None
+    return "\x1f".join((etag or "", last_modified or "", headers.get("Content-Length") or ""))
+
+
+@dataclass
+class MemoEntry:
+    validators: str
+    verdict: str
+    path: str | None
+    seen_at: float
+
+
+class UrlMemo:
+    """Bounded LRU of ``normalized url -> MemoEntry`` with a time-to-live."""
+
+    def __init__(self, max_entries: int = 50_000, ttl_seconds: float = 86_400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, MemoEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty: set[str] = set()     # Keys changed since the last ``take_dirty``.
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def unsaved(self) -> int:
+        return len(self._dirty)
+
+    def lookup(self, url: str, headers) -> MemoEntry | None:
+        """Return the remembered entry if the validators still match and it has not expired."""
+        validators = validators_of(headers)
+        key = normalize_url(url)
+        entry = self._entries.get(key)
+        if (validators is None or entry is None or entry.validators != validators
+                or time.time() - entry.seen_at > self.ttl_seconds):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def remember(self, url: str, headers, verdict: str, path: str | None = None):
+        """Record the verdict for this URL's current validators (no-op without validators)."""
+        validators = validators_of(headers)
+        if validators is None:
+            return
+        key = normalize_url(url)
+        self._entries[key] = MemoEntry(validators, verdict, path, time.time())
+        self._entries.move_to_end(key)
+        self._dirty.add(key)
+        while len(self._entries) > self.max_entries:
+            self._dirty.discard(self._entries.popitem(last=False)[0])
+
+    def rows(self) -> list[tuple]:
+        """Entries as ``(url, validators, verdict, path, seen_at)`` rows, oldest first."""
+        return [(url, e.validators, e.verdict, e.path, e.seen_at) for url, e in self._entries.items()]
+
+    def take_dirty(self) -> list[tuple]:
+        """Rows (as in ``rows()``) changed since the last call and safe to persist."""
+        rows = [(url, e.validators, e.verdict, e.path, e.seen_at)
+                for url, e in self._entries.items() if url in self._dirty and not has_credentials(url)]
+        self._dirty.clear()
+        return rows
+
+    def load_rows(self, rows):
+        """Restore entries from ``rows()`` output, skipping expired ones."""
+        cutoff = time.time() - self.ttl_seconds
+        for url, validators, verdict, path, seen_at in rows:
+            if seen_at >= cutoff:
+                self._entries[url] = MemoEntry(validators, verdict, path, seen_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
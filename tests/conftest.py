@@ -6,6 +6,8 @@ between tests, and no test can touch the real config/logs/cache directories.
 from io import BytesIO
 from pathlib import Path
 from types import SimpleNamespace
+from urllib.parse import urlsplit
+from uuid import uuid4
 
 import pytest
 import yaml
@@ -95,7 +97,7 @@ def isolated_config(tmp_path):
 
 @pytest.fixture
 def make_flow():
-    def _make(url, content, content_length="auto", extra_headers=None):
+    def _make(url, content, content_length="auto", extra_headers=None, request_headers=None):
         if content_length == "auto":
             content_length = str(len(content))
         headers = {}
@@ -104,8 +106,11 @@ def make_flow():
         if extra_headers:
             headers.update(extra_headers)
         return SimpleNamespace(
-            request=SimpleNamespace(pretty_url=url),
+            id=str(uuid4()),
+            request=SimpleNamespace(pretty_url=url, pretty_host=urlsplit(url).hostname or "",
+                                    method="GET", headers=request_headers or {}),
             response=SimpleNamespace(content=content, headers=headers),
+            metadata={},
         )
     return _make
 
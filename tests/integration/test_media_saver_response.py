@@ -7,7 +7,7 @@ from tzMCP.save_media_utils import config_provider, hash_tracker
 @pytest.fixture
 def saver(isolated_config, make_png):
     """A MediaSaver wired to an isolated config, with permissive filters
-    and no watchdog/observer or real hash DB."""
+    and no watchdog/observer or real hash DB (running() is never called)."""
     cfg = isolated_config(
         allowed_mime_groups=["image"],
         whitelist=[],
@@ -19,13 +19,13 @@ def saver(isolated_config, make_png):
     config_provider.set_config(cfg)
     hash_tracker.init_hash_db(persist=False)
 
-    instance = MediaSaver.__new__(MediaSaver)  # skip __init__ side effects
+    instance = MediaSaver()
     instance.config = cfg
     return instance
 
 
 def _saved_files(saver):
-    return [p for p in saver.config.save_dir.iterdir() if p.is_file()]
+    return [p for p in saver.config.save_dir.iterdir() if p.is_file() and not p.name.startswith(".")]
 
 
 def test_allowed_image_is_saved(saver, make_flow, make_png):
@@ -79,3 +79,303 @@ def test_content_length_mismatch_is_skipped(saver, make_flow, make_png):
                      content_length="999999")
     saver.response(flow)
     assert _saved_files(saver) == []
+
+
+def test_request_phase_blacklist_skips_response_processing(saver, make_flow, make_png, monkeypatch):
+    saver.config.blacklist = ["blocked.com"]
+    config_provider.set_config(saver.config)
+    flow = make_flow("http://cdn.blocked.com/pic.png", make_png(500, 500))
+
+    saver.request(flow)
+    saver.responseheaders(flow)
+    monkeypatch.setattr(saver.pipeline, "rejects", lambda ctx: pytest.fail("pipeline ran"))
+    saver.response(flow)
+
+    assert flow.response.stream is True
+    assert _saved_files(saver) == []
+
+
+def test_request_phase_allowed_host_is_processed(saver, make_flow, make_png):
+    flow = make_flow("http://site.com/pic.png", make_png(500, 500))
+    saver.request(flow)
+    saver.responseheaders(flow)
+    saver.response(flow)
+    assert not getattr(flow.response, "stream", False)
+    assert len(_saved_files(saver)) == 1
+
+
+def test_repeat_fetch_with_same_validators_is_decided_from_headers(saver, make_flow, make_png):
+    content = make_png(500, 500)
+    headers = {"ETag": '"v1"'}
+    first = make_flow("http://site.com/pic.png", content, extra_headers=headers)
+    saver.responseheaders(first)
+    saver.response(first)
+
+    again = make_flow("http://site.com/pic.png", content, extra_headers=headers)
+    saver.responseheaders(again)
+    assert again.response.stream is True
+    saver.response(again)
+    assert len(_saved_files(saver)) == 1
+
+
+def test_repeat_request_is_served_from_archive(saver, make_flow, make_png):
+    saver.config.serve_from_archive = True
+    content = make_png(500, 500)
+    first = make_flow("http://site.com/pic.png", content,
+                      extra_headers={"Cache-Control": "max-age=3600", "Content-Type": "image/png"})
+    saver.request(first)
+    saver.response(first)
+    assert len(_saved_files(saver)) == 1
+
+    repeat = make_flow("http://site.com/pic.png", b"")
+    saver.request(repeat)
+    assert repeat.response.status_code == 200
+    assert repeat.response.content == content
+    assert repeat.response.headers["X-tzMCP-Cache"] == "HIT"
+    saver.response(repeat)
+    assert len(_saved_files(saver)) == 1
+
+
+def test_saved_file_is_recorded_in_catalog(saver, make_flow, make_png, tmp_path):
+    from tzMCP.save_media_utils.catalog import MediaCatalog
+
+    saver.catalog = MediaCatalog(tmp_path / "catalog.sqlite")
+    try:
+        saver.response(make_flow("http://img.site.com/pic.png?token=secret", make_png(640, 480)))
+        saver.catalog.flush()
+        [entry] = saver.catalog.query(host="site.com")
+        assert entry.path == str(_saved_files(saver)[0])
+        assert (entry.mime, entry.width, entry.height) == ("image/png", 640, 480)
+        assert "secret" not in entry.url
+    finally:
+        saver.catalog.close()
+
+
+def test_small_files_go_to_pack_segments(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.pack_store import PackWriter, iter_members, pack_dir, read_saved
+
+    body = make_png(500, 500)
+    saver.config.pack_storage = {"enabled": True, "max_object_kb": 1024, "segment_mb": 1}
+    saver.packs = PackWriter(pack_dir(saver.config.save_dir))
+    try:
+        saver.response(make_flow("http://site.com/pic.png", body))
+    finally:
+        saver.packs.close()
+    assert _saved_files(saver) == []
+    [member] = iter_members(pack_dir(saver.config.save_dir))
+    assert member.name == "pic.png" and read_saved(member.ref) == body
+
+
+def test_queued_save_is_written_by_the_writer_thread(saver, make_flow, make_png):
+    saver.config.save_queue = {"enabled": True, "spool": True}
+    saver._start_writer()
+    try:
+        saver.response(make_flow("http://site.com/pic.png", make_png(500, 500), extra_headers={"ETag": '"v1"'}))
+        saver.writer.drain()
+        assert [p.name for p in _saved_files(saver)] == ["pic.png"]
+        saver._apply_saved()
+        assert saver.url_memo.rows()[0][3] == str(_saved_files(saver)[0])
+    finally:
+        saver.writer.close()
+        saver.journal.close()
+    assert not any(saver.journal.directory.iterdir())
+
+
+def test_spooled_saves_are_replayed_once_after_a_crash(saver, make_png):
+    import hashlib
+    from tzMCP.save_media_utils.save_queue import SaveJob
+    from tzMCP.save_media_utils.spool import SpoolJournal, spool_dir
+
+    done_body, lost_body = make_png(500, 500), make_png(600, 600)
+    save_dir = saver.config.save_dir
+    (save_dir / "done.png").write_bytes(done_body)   # Saved, but the crash beat the done record.
+    crashed = SpoolJournal(spool_dir(save_dir))
+    for name, body in (("done.png", done_body), ("lost.png", lost_body)):
+        job = SaveJob(save_dir / name, body, f"http://site.com/{name}", "site.com", "image/png",
+                      hashlib.sha256(body).hexdigest())
+        crashed.append(job.meta(), body)
+    crashed.close()
+
+    saver.config.save_queue = {"enabled": True, "spool": True}
+    saver._start_writer()
+    saver.writer.close()
+    saver.journal.close()
+    assert sorted(p.name for p in _saved_files(saver)) == ["done.png", "lost.png"]
+    assert (save_dir / "lost.png").read_bytes() == lost_body
+    assert not any(spool_dir(save_dir).iterdir())
+
+
+def test_queued_saves_of_a_killed_worker_are_replayed(saver, make_flow, make_png):
+    import threading
+    saver.config.save_queue = {"enabled": True, "spool": True}
+    killed = threading.Event()
+    saver._write_job = lambda job: killed.wait() and None     # The writer never gets to a job.
+    saver._start_writer()
+    for name, size in (("a.png", 500), ("b.png", 600)):
+        saver.response(make_flow(f"http://site.com/{name}", make_png(size, size)))
+    assert saver.writer.pending == 2
+    saver.journal.close()     # Killed: no done records, no drain.
+    killed.set()
+    saver.writer.close()
+    assert _saved_files(saver) == []
+
+    revived = MediaSaver()
+    revived.config = saver.config
+    revived._start_writer()
+    revived.writer.close()
+    revived.journal.close()
+    assert sorted(p.name for p in _saved_files(revived)) == ["a.png", "b.png"]
+
+
+def test_large_response_over_budget_passes_through(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.admission import MemoryBudget
+
+    saver.config.memory_budget = {"enabled": True, "max_mb": 1, "large_mb": 1,
+                                  "over_budget": "passthrough"}
+    saver.budget = MemoryBudget(ceiling=1000, large=100)
+    flow = make_flow("http://site.com/pic.png", make_png(500, 500))
+    saver.responseheaders(flow)
+    assert flow.response.stream is True
+    saver.response(flow)
+    assert _saved_files(saver) == [] and saver.budget.stats()["refused"] == 1
+
+
+def test_large_response_over_budget_is_spilled_and_saved(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.admission import MemoryBudget
+
+    body = make_png(500, 500)
+    saver.config.memory_budget = {"enabled": True, "max_mb": 1, "large_mb": 1,
+                                  "over_budget": "spill"}
+    saver.budget = MemoryBudget(ceiling=1000, large=100)
+    flow = make_flow("http://site.com/pic.png", body)
+    saver.responseheaders(flow)
+    spill = flow.response.stream
+    for start in range(0, len(body), 4096):
+        spill(body[start:start + 4096])
+    spill(b"")
+    flow.response.content = None             # Streamed bodies are not buffered.
+    saver.response(flow)
+    [saved] = _saved_files(saver)
+    assert saved.read_bytes() == body
+    assert not spill.path.exists()
+    assert saver.budget.stats()["reserved"] == 0
+
+
+def test_parallel_chunked_responses_stay_within_the_budget(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.admission import MemoryBudget
+
+    saver.config.memory_budget = {"enabled": True, "max_mb": 1, "large_mb": 1, "over_budget": "spill"}
+    saver.budget = MemoryBudget(ceiling=len(make_png(500, 500)) + 1000, large=10 ** 9)
+    bodies = {name: make_png(500 + i, 500) for i, name in enumerate(("a.png", "b.png", "c.png"))}
+    flows = {name: make_flow(f"http://site.com/{name}", body, content_length=None) for name, body in bodies.items()}
+    for flow in flows.values():
+        saver.responseheaders(flow)
+    for start in range(0, max(map(len, bodies.values())), 4096):     # Interleaved like parallel streams.
+        for name, flow in flows.items():
+            if chunk := bodies[name][start:start + 4096]:
+                flow.response.stream(chunk)
+                assert saver.budget.in_use() <= saver.budget.ceiling
+    for name, flow in flows.items():
+        flow.response.stream(b"")
+        flow.response.content = b""          # Streamed bodies are not buffered by mitmproxy.
+        saver.response(flow)
+    assert {p.name: p.read_bytes() for p in _saved_files(saver)} == bodies
+    assert saver.budget.stats()["reserved"] == 0
+
+
+def test_response_over_max_bytes_is_never_buffered(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.admission import MemoryBudget
+
+    saver.config.filter_file_size = {"enabled": True, "min_bytes": 0, "max_bytes": 100}
+    config_provider.set_config(saver.config)
+    saver.budget = MemoryBudget(ceiling=10_000_000, large=1_000_000)
+    flow = make_flow("http://site.com/pic.png", make_png(500, 500))
+    saver.responseheaders(flow)
+    assert flow.response.stream is True
+    saver.response(flow)
+    assert _saved_files(saver) == [] and saver.budget.stats()["admitted"] == 0
+
+
+def test_admitted_response_releases_its_reservation(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.admission import MemoryBudget
+
+    saver.budget = MemoryBudget(ceiling=10_000_000, large=1_000_000)
+    flow = make_flow("http://site.com/pic.png", make_png(500, 500))
+    saver.responseheaders(flow)
+    assert saver.budget.stats()["reserved"] > 0
+    saver.response(flow)
+    assert saver.budget.stats()["reserved"] == 0 and len(_saved_files(saver)) == 1
+
+
+def _overloaded(saver, load):
+    from tzMCP.save_media_utils.overload import Backpressure
+
+    saver.backpressure = Backpressure(lambda: load, degrade_at=0.5, passthrough_at=1.0,
+                                      shed_mime_groups=["video"], skip_stages=["pixel_dimensions"])
+    return saver.backpressure
+
+
+def test_degraded_proxy_sheds_low_priority_groups_before_buffering(saver, make_flow):
+    bp = _overloaded(saver, 0.7)
+    flow = make_flow("http://site.com/clip.mp4", b"\0" * 64, extra_headers={"Content-Type": "video/mp4"})
+    saver.responseheaders(flow)
+    assert flow.response.stream is True
+    saver.response(flow)
+    assert _saved_files(saver) == [] and bp.stats()["shed"] == {"mime:video": 1}
+
+
+def test_degraded_proxy_skips_image_validation(saver, make_flow, make_png):
+    saver.config.filter_pixel_dimensions = {"min_width": 1000, "min_height": 1000}
+    config_provider.set_config(saver.config)
+    bp = _overloaded(saver, 0.7)
+    flow = make_flow("http://site.com/pic.png", make_png(500, 500), extra_headers={"Content-Type": "image/png"})
+    saver.responseheaders(flow)
+    saver.response(flow)
+    assert len(_saved_files(saver)) == 1
+    assert bp.stats()["shed"] == {"skipped:pixel_dimensions": 1}
+
+
+def test_saturated_proxy_passes_everything_through(saver, make_flow, make_png):
+    bp = _overloaded(saver, 1.5)
+    flow = make_flow("http://site.com/pic.png", make_png(500, 500))
+    saver.responseheaders(flow)
+    assert flow.response.stream is True
+    saver.response(flow)
+    assert _saved_files(saver) == [] and bp.stats()["events"] == 1
+
+
+def test_saves_stop_cleanly_when_the_disk_is_nearly_full(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.storage_quota import StorageManager
+
+    saver.storage = StorageManager(saver.config.save_dir, min_free=2 ** 60)
+    saver.response(make_flow("http://site.com/pic.png", make_png(500, 500)))
+    assert _saved_files(saver) == [] and saver.storage.stats()["refused"] == 1
+
+
+def test_only_filter_rejections_count_toward_tls_passthrough(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.storage_quota import StorageManager
+
+    saver.config.tls_passthrough = {"enabled": True, "min_flows": 1}
+    body = make_png(500, 500)
+    saver.response(make_flow("http://media.com/a.png", body))
+    saver.response(make_flow("http://media.com/b.png", body))        # Duplicate content.
+    saver.storage = StorageManager(saver.config.save_dir, min_free=2 ** 60)
+    saver.response(make_flow("http://full.com/c.png", make_png(600, 600)))   # Refused by the quota.
+    saver.storage = None
+    saver.response(make_flow("http://ads.com/d.bin", b"not media"))
+    assert saver.host_stats.unproductive_hosts(1) == ["ads.com"]
+    assert "full.com" not in saver.host_stats.counts
+
+
+def test_buffered_body_does_not_count_against_its_own_overload_check(saver, make_flow, make_png):
+    from tzMCP.save_media_utils.admission import MemoryBudget
+    from tzMCP.save_media_utils.overload import Backpressure
+
+    body = make_png(500, 500)
+    saver.budget = MemoryBudget(ceiling=len(body), large=10 * len(body))
+    saver.backpressure = Backpressure(saver._pressure, degrade_at=0.5, passthrough_at=1.0)
+    flow = make_flow("http://site.com/pic.png", body)
+    saver.responseheaders(flow)
+    assert saver.budget.stats()["reserved"] == len(body)
+    saver.response(flow)
+    assert len(_saved_files(saver)) == 1 and saver.backpressure.stats()["events"] == 0
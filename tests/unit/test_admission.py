@@ -0,0 +1,90 @@
+import os
+import time
+
+from tzMCP.save_media_utils.admission import (
+    MemoryBudget, MeteredBody, SpillFile, clear_stale_spills, expected_size, map_file, release_spill
+)
+
+
+def test_large_bodies_are_refused_once_the_budget_is_spent():
+    budget = MemoryBudget(ceiling=100, large=50)
+    assert budget.try_reserve(60)
+    assert not budget.try_reserve(50)
+    assert budget.try_reserve(49)          # Small bodies are always admitted.
+    budget.release(60)
+    assert budget.try_reserve(50)
+    assert budget.stats()["refused"] == 1 and budget.stats()["peak"] == 109
+
+
+def test_queued_bytes_count_against_the_budget():
+    queued = [80]
+    budget = MemoryBudget(ceiling=100, large=10, queued=lambda: queued[0])
+    assert not budget.try_reserve(30)
+    queued[0] = 0
+    assert budget.try_reserve(30)
+    assert budget.in_use() == 30
+
+
+def test_expected_size_is_none_for_missing_or_bad_lengths():
+    assert expected_size({"Content-Length": "123"}) == 123
+    assert expected_size({}) is None
+    assert expected_size({"Content-Length": "abc"}) is None
+
+
+def test_metered_body_charges_each_chunk_and_spills_at_the_ceiling(tmp_path):
+    budget = MemoryBudget(ceiling=10, large=100)
+    other = MeteredBody(budget)
+    other(b"abcd")                         # A parallel stream holding part of the budget.
+    body = MeteredBody(budget, spill_to=lambda: SpillFile(tmp_path))
+    assert body(b"1234") == b"1234" and budget.reserved == 8
+    assert body(b"5678") == b"5678"        # Would pass the ceiling: moves to disk.
+    body(b"")
+    assert budget.reserved == 4 and body.spill.usable
+    assert body.spill.path.read_bytes() == b"12345678"
+    other(b"")
+    assert other.content == b"abcd"
+    other.release()
+    assert budget.reserved == 0
+
+
+def test_metered_body_gives_up_without_a_spill_file():
+    budget = MemoryBudget(ceiling=6, large=100)
+    body = MeteredBody(budget)
+    body(b"1234")
+    assert body(b"5678") == b"5678"        # The client still gets every chunk.
+    body(b"")
+    assert body.abandoned == "over memory budget" and body.content == b"" and budget.reserved == 0
+    capped = MeteredBody(budget, max_bytes=3)
+    capped(b"1234")
+    assert capped.abandoned == "over max_bytes"
+
+
+def test_spill_file_tees_chunks_to_disk(tmp_path):
+    spill = SpillFile(tmp_path)
+    assert spill(b"abc") == b"abc" and spill(b"def") == b"def"
+    assert not spill.usable
+    spill(b"")
+    assert spill.usable and spill.size == 6
+    content = map_file(spill.path)
+    assert content[:] == b"abcdef"
+    release_spill(content, spill.path)
+    assert not spill.path.exists()
+
+
+def test_spill_file_gives_up_past_max_bytes(tmp_path):
+    spill = SpillFile(tmp_path, max_bytes=4)
+    assert spill(b"abc") == b"abc"
+    assert spill(b"def") == b"def"         # Still forwarded to the client.
+    spill(b"")
+    assert not spill.usable and not spill.path.exists()
+
+
+def test_stale_spills_are_cleared_unless_kept(tmp_path):
+    old, kept, fresh = (SpillFile(tmp_path) for _ in range(3))
+    for spill in (old, kept, fresh):
+        spill(b"")
+    an_hour_ago = time.time() - 2 * 60 * 60
+    for spill in (old, kept):
+        os.utime(spill.path, (an_hour_ago, an_hour_ago))
+    assert clear_stale_spills(tmp_path, keep=[str(kept.path)]) == 1
+    assert not old.path.exists() and kept.path.exists() and fresh.path.exists()
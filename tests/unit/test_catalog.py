@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from tzMCP.save_media_utils.catalog import CatalogEntry, MediaCatalog, _since
+
+
+def _entry(host="a.com", mime="image/png", saved_at=None, path="f"):
+    return CatalogEntry(path, "d" * 64, f"http://{host}/{path}", host, mime, 10, 1, 1,
+                        saved_at if saved_at is not None else time.time())
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    instance = MediaCatalog(tmp_path / "catalog.sqlite")
+    yield instance
+    instance.close()
+
+
+def test_query_filters_by_host_mime_and_time(catalog):
+    catalog.record(_entry("a.com", "image/png", 100, "old.png"))
+    catalog.record(_entry("cdn.a.com", "image/jpeg", 200, "new.jpg"))
+    catalog.record(_entry("b.com", "video/mp4", 300, "clip.mp4"))
+    catalog.flush()
+
+    assert [e.path for e in catalog.query(host="a.com")] == ["new.jpg", "old.png"]
+    assert [e.path for e in catalog.query(mime="image/")] == ["new.jpg", "old.png"]
+    assert [e.path for e in catalog.query(mime="video/mp4")] == ["clip.mp4"]
+    assert [e.path for e in catalog.query(since=150)] == ["clip.mp4", "new.jpg"]
+    assert catalog.count(host="a.com", since=150) == 1
+
+
+def test_query_pages_newest_first(catalog):
+    for i in range(5):
+        catalog.record(_entry(saved_at=i, path=str(i)))
+    catalog.flush()
+    assert [e.path for e in catalog.query(limit=2, offset=1)] == ["3", "2"]
+
+
+def test_keyset_pages_follow_query_order(catalog):
+    for i in range(5):
+        catalog.record(_entry(path=str(i), saved_at=float(i // 2)))   # Ties on saved_at break by id.
+    catalog.flush()
+    first, key = catalog.page(limit=2)
+    second, _ = catalog.page(after=key, limit=2)
+    assert [e.path for e in first + second] == [e.path for e in catalog.query(limit=4)]
+    assert catalog.key_at(offset=1) == key
+
+
+def test_forget_drops_files_and_pack_members(catalog):
+    for path in ("/s/a.png", "/s/b.png", "/s/.packs/seg.tar#512:10", "/s/.packs/seg.tar#1024:10",
+                 "/s/.packs/other.tar#512:10"):
+        catalog.record(_entry(path=path))
+    catalog.forget(["/s/a.png", "/s/.packs/seg.tar"])
+    catalog.flush()
+    assert sorted(e.path for e in catalog.query()) == ["/s/.packs/other.tar#512:10", "/s/b.png"]
+    assert sorted(catalog.paths()) == ["/s/.packs/other.tar#512:10", "/s/b.png"]
+
+
+def test_since_parses_relative_and_iso_values():
+    assert abs(_since("2h") - (time.time() - 7200)) < 5
+    assert _since("2024-01-02") < time.time()
+
+
+def test_writes_racing_close_are_committed_or_refused(tmp_path):
+    import threading
+    instance = MediaCatalog(tmp_path / "catalog.sqlite")
+    futures, started = [], threading.Event()
+
+    def submit():
+        started.set()
+        for _ in range(200):
+            futures.append(instance.submit(lambda conn: None))
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+    started.wait()
+    instance.close()
+    thread.join()
+    for future in futures:
+        assert future.exception(timeout=5) is None or isinstance(future.exception(), RuntimeError)
+    with pytest.raises(RuntimeError):
+        instance.flush()
@@ -12,7 +12,9 @@ def _args(tmp_path, **overrides):
         save_dir=None, mime_groups=None, whitelist=None, blacklist=None,
         min_bytes=None, max_bytes=None, min_width=None, max_width=None,
         min_height=None, max_height=None, log_to_file=False, log_level=None,
-        dedup=False, auto_reload=True,
+        dedup=False, auto_reload=True, tls_passthrough=False,
+        serve_from_archive=False, shared_dedup=False,
+        write_rate=None, domain_write_rate=None,
     )
     base.update(overrides)
     return Namespace(**base)
@@ -41,6 +43,11 @@ def test_build_config_applies_overrides(tmp_path):
         log_level="DEBUG",
         dedup=True,
         auto_reload=False,
+        tls_passthrough=True,
+        serve_from_archive=True,
+        shared_dedup=True,
+        write_rate=20.0,
+        domain_write_rate=5,
     ))
     assert cfg.save_dir == Path(tmp_path / "custom").resolve()
     assert cfg.allowed_mime_groups == ["image", "video"]
@@ -57,9 +64,33 @@ def test_build_config_applies_overrides(tmp_path):
     assert cfg.enable_persistent_dedup is True
     assert cfg.proxy_port == 9876
     assert cfg.auto_reload_config is False
+    assert cfg.tls_passthrough["enabled"] is True
+    assert cfg.serve_from_archive is True
+    assert cfg.shared_dedup is True
+    assert cfg.write_rate_limit["enabled"] is True
+    assert (cfg.write_rate_limit["global_mb_s"], cfg.write_rate_limit["domain_mb_s"]) == (20.0, 5)
 
 
 def test_build_config_min_bytes_zero_is_applied(tmp_path):
     # min_bytes=0 is falsy but must still be applied (guarded by `is not None`).
     cfg = cli.build_config(_args(tmp_path, min_bytes=0))
     assert cfg.filter_file_size["min_bytes"] == 0
+
+
+def test_flags_reach_the_addon_config(tmp_path, monkeypatch):
+    from mitmproxy.test import taddons
+    from tzMCP.gui_bits.config_manager import ConfigManager
+    from tzMCP.save_media import CONFIG_OPTION, MediaSaver
+
+    monkeypatch.setenv("TZMCP_DATA_DIR", str(tmp_path / "data"))
+    cfg = cli.build_config(_args(tmp_path, write_rate=20.0, tls_passthrough=True, serve_from_archive=True))
+    session = cli.write_session_config(cfg)
+    saver = MediaSaver()
+    with taddons.context(saver) as tctx:
+        tctx.configure(saver, **{CONFIG_OPTION: str(session)})
+    saver.cfg_manager = ConfigManager(saver.config_path)     # As running() does.
+    saver._load_config()
+    assert saver.config_path == session.resolve()
+    assert saver.config.write_rate_limit["global_mb_s"] == 20.0
+    assert saver.config.tls_passthrough["enabled"] is True
+    assert saver.config.serve_from_archive is True
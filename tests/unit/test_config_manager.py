@@ -120,3 +120,98 @@ def test_validate_rejects_invalid_proxy_port(tmp_path):
     cfg = Config(save_dir=tmp_path / "cache", proxy_port=70000)
     with pytest.raises(ValueError, match="proxy_port"):
         mgr._validate_config(cfg)
+
+
+def test_validate_clamps_proxy_workers(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.proxy_workers = 0
+    assert mgr._validate_config(cfg).proxy_workers == 1
+    cfg.proxy_workers = 1000
+    assert mgr._validate_config(cfg).proxy_workers == 32
+
+
+def test_validate_normalizes_durability(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.durability = {"mode": "STRICT", "batch_files": 0}
+    assert mgr._validate_config(cfg).durability == {"mode": "strict", "batch_files": 1, "batch_ms": 200}
+    cfg.durability = {"mode": "paranoid"}
+    assert mgr._validate_config(cfg).durability["mode"] == "none"
+
+
+def test_save_queue_follows_the_spool_unless_set(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    assert mgr._validate_config(cfg).save_queue == {"enabled": False, "spool": False}
+    cfg.save_queue = {"spool": True}
+    assert mgr._validate_config(cfg).save_queue == {"enabled": True, "spool": True}
+    cfg.save_queue = {"enabled": True}
+    assert mgr._validate_config(cfg).save_queue == {"enabled": True, "spool": False}
+
+
+def test_validate_normalizes_dedup_retention(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.dedup_retention = {"enabled": 1, "max_age_days": "30", "max_rows": "-5", "by": "oldest"}
+    assert mgr._validate_config(cfg).dedup_retention == {
+        "enabled": True, "max_age_days": 30.0, "max_rows": 0, "by": "last_seen"}
+
+
+def test_validate_normalizes_memory_budget(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.memory_budget = {"max_mb": 0, "over_budget": "PASSTHROUGH"}
+    assert mgr._validate_config(cfg).memory_budget == {
+        "enabled": True, "max_mb": 1, "large_mb": 8, "over_budget": "passthrough"}
+    cfg.memory_budget = {"over_budget": "drop"}
+    assert mgr._validate_config(cfg).memory_budget["over_budget"] == "spill"
+
+
+def test_validate_normalizes_overload(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.overload = {"degrade_at": 2, "passthrough_at": 0.5, "shed_mime_groups": ["video", "hologram"]}
+    ovl = mgr._validate_config(cfg).overload
+    assert (ovl["degrade_at"], ovl["passthrough_at"]) == (1.0, 1.0)
+    assert ovl["shed_mime_groups"] == ["video"]
+    assert ovl["skip_stages"] == ["pixel_dimensions"]
+    assert ovl["enabled"] is False      # Shedding captures is opt-in.
+
+
+def test_validate_normalizes_save_scheduler(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.save_scheduler = {"quantum_kb": 0, "classes": [{"groups": ["image", "hologram"], "weight": 0}, "junk"]}
+    sched = mgr._validate_config(cfg).save_scheduler
+    assert sched["quantum_kb"] == 1
+    assert sched["classes"] == [{"name": "class0", "groups": ["image"], "max_kb": 0, "weight": 1}]
+    cfg.save_scheduler = {"classes": []}
+    assert [c["name"] for c in mgr._validate_config(cfg).save_scheduler["classes"]][0] == "small_images"
+
+
+def test_validate_normalizes_write_rate_limit(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.write_rate_limit = {"enabled": 1, "global_mb_s": "2.5", "domain_mb_s": -1, "burst_s": 0}
+    assert mgr._validate_config(cfg).write_rate_limit == {
+        "enabled": True, "global_mb_s": 2.5, "domain_mb_s": 0.0, "burst_s": 0.1}
+
+
+def test_validate_normalizes_storage_quota(tmp_path):
+    mgr = _mgr(tmp_path)
+    cfg = Config()
+    cfg.save_dir = tmp_path / "cache"
+    cfg.storage_quota = {"enabled": True, "max_gb": "1.5", "max_percent": 150, "evict": "LRU"}
+    assert mgr._validate_config(cfg).storage_quota == {
+        "enabled": True, "max_gb": 1.5, "max_percent": 100.0, "min_free_mb": 1024, "evict": "lru"}
+    cfg.storage_quota = {"evict": "random"}
+    assert mgr._validate_config(cfg).storage_quota["evict"] == "age"
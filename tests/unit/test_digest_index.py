@@ -0,0 +1,50 @@
+import hashlib
+
+from tzMCP.save_media_utils import digest_index
+from tzMCP.save_media_utils.dedup_store import SqliteDedupStore
+from tzMCP.save_media_utils.digest_index import SortedDigestIndex, WarmDedupStore
+
+
+def _digest(i: int) -> bytes:
+    return hashlib.sha256(str(i).encode()).digest()
+
+
+def test_sorted_index_finds_loaded_and_added_digests():
+    index = SortedDigestIndex(sorted(_digest(i) for i in range(100)))
+    assert all(_digest(i) in index for i in range(100))
+    assert _digest(100) not in index
+
+    index.add(_digest(100))
+    assert _digest(100) in index
+    assert len(index) == 101
+
+
+def test_merge_folds_delta_into_sorted_buffer():
+    index = SortedDigestIndex(sorted(_digest(i) for i in range(0, 50, 2)))
+    for i in range(1, 50, 2):
+        index.add(_digest(i))
+    index.merge()
+    assert len(index._delta) == 0
+    assert len(index._sorted) == 50 * digest_index.DIGEST_SIZE
+    assert all(_digest(i) in index for i in range(50))
+    chunks = [index._sorted[i:i + 32] for i in range(0, len(index._sorted), 32)]
+    assert chunks == sorted(chunks)
+
+
+def test_warm_store_answers_known_digests_without_sqlite(tmp_path):
+    store = SqliteDedupStore(tmp_path / "hashes.sqlite")
+    known = _digest(1).hex()
+    store.check_and_add(known)
+
+    warm = WarmDedupStore(store)
+    calls = []
+    original = store.check_and_add
+    store.check_and_add = lambda d: calls.append(d) or original(d)
+    try:
+        assert warm.check_and_add(known) is True
+        assert calls == []
+        assert warm.check_and_add(_digest(2).hex()) is False
+        assert warm.check_and_add(_digest(2).hex()) is True
+        assert calls == [_digest(2).hex()]
+    finally:
+        warm.close()
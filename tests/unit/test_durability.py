@@ -0,0 +1,62 @@
+import os
+import threading
+
+from tzMCP.save_media_utils import durability
+from tzMCP.save_media_utils.durability import Durability, FsyncBatcher
+from tzMCP.save_media_utils.save_media_utils import atomic_save
+
+
+def _record_fsyncs(monkeypatch):
+    synced = []
+    lock = threading.Lock()
+
+    def fake(path, directory=False):
+        with lock:
+            synced.append((str(path), directory))
+    monkeypatch.setattr(durability, "fsync_path", fake)
+    return synced
+
+
+def test_batcher_groups_files_and_directories(tmp_path, monkeypatch):
+    synced = _record_fsyncs(monkeypatch)
+    batcher = FsyncBatcher(max_files=100, max_delay_ms=60_000)
+    try:
+        for name in ("a", "b", "a"):
+            batcher.add(tmp_path / name)
+        assert synced == []                      # Below both limits: nothing yet.
+        batcher.flush()
+        assert sorted(synced) == [(str(tmp_path), True), (str(tmp_path / "a"), False), (str(tmp_path / "b"), False)]
+    finally:
+        batcher.close()
+
+
+def test_batcher_syncs_when_count_or_delay_is_reached(tmp_path, monkeypatch):
+    synced = _record_fsyncs(monkeypatch)
+    by_count = FsyncBatcher(max_files=2, max_delay_ms=60_000)
+    by_count.add(tmp_path / "a")
+    by_count.add(tmp_path / "b")
+    by_count.close()
+    assert len(synced) == 3
+
+    by_time = FsyncBatcher(max_files=100, max_delay_ms=10)
+    by_time.add(tmp_path / "c")
+    threading.Event().wait(0.5)
+    assert (str(tmp_path / "c"), False) in synced
+    by_time.close()
+
+
+def test_strict_fsyncs_before_rename_and_directory_after(tmp_path, monkeypatch):
+    synced = _record_fsyncs(monkeypatch)
+    fsynced_fds = []
+    monkeypatch.setattr(os, "fsync", fsynced_fds.append)
+    saved = atomic_save(b"data", tmp_path / "f.bin", 4, Durability("strict"))
+    assert saved.read_bytes() == b"data"
+    assert len(fsynced_fds) == 1
+    assert synced == [(str(tmp_path), True)]
+
+
+def test_none_never_fsyncs(tmp_path, monkeypatch):
+    synced = _record_fsyncs(monkeypatch)
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd))
+    atomic_save(b"data", tmp_path / "f.bin", 4, Durability("none"))
+    assert synced == []
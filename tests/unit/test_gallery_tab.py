@@ -0,0 +1,50 @@
+import time
+
+from tzMCP.gui_bits.gallery_tab import CatalogPager
+from tzMCP.save_media_utils.catalog import CatalogEntry, MediaCatalog
+
+
+def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not (result := predicate()):
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+    return result
+
+
+def test_pager_loads_keyset_pages_off_the_calling_thread(tmp_path):
+    catalog = MediaCatalog(tmp_path / "catalog.sqlite")
+    pager = None
+    try:
+        for i in range(25):
+            host = "a.com" if i % 2 else "b.com"
+            catalog.record(CatalogEntry(str(i), None, "", host, "image/png", 1, 1, 1, float(i)))
+        catalog.flush()
+
+        starts, seeks = [], []
+        page, key_at = catalog.page, catalog.key_at
+        catalog.page = lambda *a: starts.append(a[3]) or page(*a)
+        catalog.key_at = lambda *a: seeks.append(a[4]) or key_at(*a)
+        pager = CatalogPager(catalog, page_size=10, max_pages=2)
+        _until(lambda: pager.counted)
+        assert pager.count == 25
+        assert pager.entry(0) is None                       # Requested, not loaded yet.
+        assert _until(lambda: pager.entry(0)).path == "24"
+        assert _until(lambda: pager.entry(24)).path == "0"  # Jumps past page 1 via the index.
+        assert pager.entry(25) is None
+        assert pager.entry(9).path == "15"
+        assert starts == [None, (5.0, 6)]    # Key of row 19, the last of the skipped page.
+        assert seeks == [9]
+
+        catalog.record(CatalogEntry("new", None, "", "a.com", "image/png", 1, 1, 1, 1e12))
+        catalog.flush()
+        assert pager.entry(0).path == "24"   # Later saves wait for the next refresh.
+
+        pager.set_filter(host="a.com")
+        _until(lambda: pager.counted)
+        assert pager.count == 12
+        assert _until(lambda: pager.entry(0)).path == "23"
+    finally:
+        if pager:
+            pager.close()
+        catalog.close()
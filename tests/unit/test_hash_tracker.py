@@ -1,4 +1,10 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
 from tzMCP.save_media_utils import hash_tracker
+from tzMCP.save_media_utils.dedup_store import SqliteDedupStore, rebalance, shard_paths, stored_shard_count
 
 
 def test_in_memory_dedup():
@@ -28,3 +34,176 @@ def test_sqlite_creates_file(tmp_path):
     hash_tracker.is_duplicate(b"x")
     assert db_path.exists()
     hash_tracker.shutdown_hash_db()
+
+
+def test_url_memo_rows_persist_in_sqlite(tmp_path):
+    db_path = tmp_path / "hashes.sqlite"
+    row = ("http://x.com/a.png", '"e"\x1f\x1f10', "saved", "/tmp/a.png", 123.0)
+
+    hash_tracker.init_hash_db(persist=True, db_path=db_path)
+    hash_tracker.store_url_memo([row])
+    hash_tracker.shutdown_hash_db()
+
+    hash_tracker.init_hash_db(persist=True, db_path=db_path)
+    assert hash_tracker.load_url_memo(10) == [row]
+    hash_tracker.shutdown_hash_db()
+
+
+def test_url_memo_is_not_persisted_in_memory_mode():
+    hash_tracker.init_hash_db(persist=False)
+    hash_tracker.store_url_memo([("u", "v", "saved", None, 1.0)])
+    assert hash_tracker.load_url_memo(10) == []
+
+
+def test_concurrent_check_and_add_claims_each_digest_once(tmp_path):
+    hash_tracker.init_hash_db(persist=True, db_path=tmp_path / "hashes.sqlite")
+    payloads = [f"item-{i % 50}".encode() for i in range(400)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(hash_tracker.is_duplicate, payloads))
+    # Exactly one caller wins each of the 50 distinct payloads.
+    assert results.count(False) == 50
+
+
+def test_in_memory_store_is_atomic_across_threads():
+    hash_tracker.init_hash_db(persist=False)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(hash_tracker.is_duplicate, [b"same"] * 200))
+    assert results.count(False) == 1
+
+
+def test_writes_after_shutdown_are_rejected(tmp_path):
+    store = SqliteDedupStore(tmp_path / "hashes.sqlite")
+    store.close()
+    store.close()  # idempotent
+    with pytest.raises(RuntimeError):
+        store.write(lambda conn: None)
+
+
+def test_stores_sharing_one_file_claim_each_digest_once(tmp_path):
+    # Two stores on one file stand in for two proxy processes.
+    db_path = tmp_path / "shared.sqlite"
+    first, second = SqliteDedupStore(db_path), SqliteDedupStore(db_path)
+    digests = [f"{i % 40:064x}" for i in range(200)]
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: (first, second)[i % 2].check_and_add(digests[i]), range(200)))
+    finally:
+        first.close()
+        second.close()
+    assert results.count(False) == 40
+
+
+def test_url_memo_store_merges_rows_from_other_instances(tmp_path):
+    db_path = hash_tracker.shared_db_path(tmp_path)
+    mine = ("http://x.com/a.png", "v", "saved", None, 2.0)
+    theirs = ("http://x.com/b.png", "v", "saved", None, 1.0)
+
+    other = SqliteDedupStore(db_path)
+    other.write(lambda conn: conn.execute("INSERT INTO url_memo VALUES (?, ?, ?, ?, ?)", theirs))
+    other.close()
+
+    hash_tracker.init_hash_db(persist=True, db_path=db_path)
+    hash_tracker.store_url_memo([mine], keep=10)
+    assert hash_tracker.load_url_memo(10) == [theirs, mine]
+
+
+def test_sharded_store_spreads_digests_and_dedups(tmp_path):
+    db_path = tmp_path / "hashes.sqlite"
+    hash_tracker.init_hash_db(persist=True, db_path=db_path, shards=4)
+    payloads = [f"payload-{i}".encode() for i in range(200)]
+    assert not any(hash_tracker.is_duplicate(p) for p in payloads)
+    assert all(hash_tracker.is_duplicate(p) for p in payloads)
+    hash_tracker.shutdown_hash_db()
+
+    assert stored_shard_count(db_path) == 4
+    assert all(path.exists() for path in shard_paths(db_path, 4))
+
+
+def test_existing_index_migrates_between_shard_counts(tmp_path):
+    db_path = tmp_path / "hashes.sqlite"
+    payloads = [f"payload-{i}".encode() for i in range(100)]
+
+    hash_tracker.init_hash_db(persist=True, db_path=db_path)
+    for p in payloads:
+        hash_tracker.is_duplicate(p)
+    hash_tracker.store_url_memo([("http://x.com/a.png", "v", "saved", None, 1.0)])
+    hash_tracker.shutdown_hash_db()
+
+    for shards in (4, 3, 1):
+        rebalance(db_path, shards)
+        hash_tracker.init_hash_db(persist=True, db_path=db_path, shards=shards)
+        assert all(hash_tracker.is_duplicate(p) for p in payloads)
+        assert len(hash_tracker.load_url_memo(10)) == 1
+        hash_tracker.shutdown_hash_db()
+        assert stored_shard_count(db_path) == shards
+
+    # Old shard files are removed once their digests have moved.
+    assert not list(tmp_path.glob("*.shard*"))
+
+
+def test_proxy_start_keeps_the_stored_shard_count(tmp_path):
+    db_path = tmp_path / "hashes.sqlite"
+    rebalance(db_path, 8)     # As `tzMCP-dedup-shards --shards 8` would.
+    hash_tracker.init_hash_db(persist=True, db_path=db_path, shards=1)
+    assert not hash_tracker.is_duplicate(b"payload")
+    assert hash_tracker.is_duplicate(b"payload")
+    hash_tracker.shutdown_hash_db()
+    assert stored_shard_count(db_path) == 8
+
+
+def test_rebalance_is_a_no_op_when_already_at_target(tmp_path):
+    db_path = tmp_path / "hashes.sqlite"
+    assert rebalance(db_path, 2) == 0
+    assert rebalance(db_path, 2) == 0
+    with pytest.raises(ValueError):
+        rebalance(db_path, 0)
+
+
+def test_expire_by_age_and_row_cap_uses_last_seen(tmp_path):
+    store = SqliteDedupStore(tmp_path / "hashes.sqlite")
+    try:
+        for i, digest in enumerate(("a" * 64, "b" * 64, "c" * 64)):
+            store.check_and_add(digest)
+            store.write(lambda conn, d=digest, t=i: conn.execute(
+                "UPDATE hashes SET first_seen = ?, last_seen = ? WHERE hash = ?", (t, t, d)))
+        store.check_and_add("a" * 64)        # Seen again: now most recent.
+        store.write(lambda conn: None)       # Wait for the queued touch.
+
+        assert store.expire(max_rows=2) == 1
+        assert not store.contains("b" * 64)
+        assert store.expire(older_than=2.5) == 1
+        assert not store.contains("c" * 64)
+        assert store.contains("a" * 64)
+    finally:
+        store.close()
+
+
+def test_legacy_hash_table_gains_seen_columns(tmp_path):
+    db_path = tmp_path / "hashes.sqlite"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE hashes (hash TEXT PRIMARY KEY)")
+        conn.execute("INSERT INTO hashes VALUES (?)", ("d" * 64,))
+
+    store = SqliteDedupStore(db_path)
+    try:
+        first_seen, last_seen = store.read(lambda conn: conn.execute(
+            "SELECT first_seen, last_seen FROM hashes").fetchone())
+        assert first_seen is not None and last_seen == first_seen
+        assert store.check_and_add("d" * 64) is True
+    finally:
+        store.close()
+
+
+def test_compaction_rebuilds_warm_index(tmp_path):
+    hash_tracker.init_hash_db(persist=True, db_path=tmp_path / "hashes.sqlite")
+    assert hash_tracker.is_duplicate(b"old") is False
+    hash_tracker.get_store().write(lambda conn: conn.execute("UPDATE hashes SET last_seen = 0"))
+
+    assert hash_tracker.compact_hash_db(max_age_days=1) == 1
+    # The expired digest is forgotten by both the store and the in-memory index.
+    assert hash_tracker.is_duplicate(b"old") is False
+
+
+def test_compaction_is_a_no_op_in_memory_mode():
+    hash_tracker.init_hash_db(persist=False)
+    assert hash_tracker.compact_hash_db(max_age_days=1) == 0
@@ -0,0 +1,36 @@
+from tzMCP.save_media_utils.host_policy import (
+    HostVerdicts, BLOCKED_BY_BLACKLIST, BLOCKED_BY_WHITELIST,
+)
+
+
+def test_allowed_host_has_no_verdict(isolated_config):
+    isolated_config(whitelist=[], blacklist=["doubleclick.net"])
+    assert HostVerdicts().verdict("example.com") is None
+
+
+def test_blacklisted_host(isolated_config):
+    isolated_config(whitelist=[], blacklist=["doubleclick.net"])
+    assert HostVerdicts().verdict("ads.doubleclick.net") == BLOCKED_BY_BLACKLIST
+
+
+def test_host_outside_whitelist(isolated_config):
+    isolated_config(whitelist=["example.com"], blacklist=[])
+    verdicts = HostVerdicts()
+    assert verdicts.verdict("other.org") == BLOCKED_BY_WHITELIST
+    assert verdicts.verdict("CDN.Example.com") is None
+
+
+def test_cache_follows_config_reload(isolated_config):
+    isolated_config(whitelist=[], blacklist=[])
+    verdicts = HostVerdicts()
+    assert verdicts.verdict("tracker.net") is None
+    isolated_config(whitelist=[], blacklist=["tracker.net"])  # installs a new Config
+    assert verdicts.verdict("tracker.net") == BLOCKED_BY_BLACKLIST
+
+
+def test_cache_is_bounded(isolated_config):
+    isolated_config(whitelist=[], blacklist=[])
+    verdicts = HostVerdicts(max_hosts=3)
+    for i in range(10):
+        verdicts.verdict(f"h{i}.example.com")
+    assert len(verdicts._verdicts) <= 3
@@ -0,0 +1,90 @@
+import time
+from email.utils import formatdate
+
+from tzMCP.save_media_utils.http_cache import (
+    ArchiveCache, bypasses_cache, cached_response, freshness_lifetime, is_storable,
+)
+
+
+def test_freshness_prefers_max_age_minus_age():
+    assert freshness_lifetime({"Cache-Control": "public, max-age=600", "Age": "100"}) == 500
+
+
+def test_freshness_from_expires():
+    now = time.time()
+    headers = {"Date": formatdate(now, usegmt=True), "Expires": formatdate(now + 300, usegmt=True)}
+    assert 299 <= freshness_lifetime(headers, now) <= 301
+
+
+def test_freshness_heuristic_from_last_modified_is_capped():
+    now = time.time()
+    headers = {"Date": formatdate(now, usegmt=True),
+               "Last-Modified": formatdate(now - 10 * 86_400 * 365, usegmt=True)}
+    assert freshness_lifetime(headers, now) == 86_400
+
+
+def test_no_cache_and_invalid_expires_are_not_fresh():
+    assert freshness_lifetime({"Cache-Control": "no-cache, max-age=600"}) == 0
+    assert freshness_lifetime({"Expires": "0"}) == 0
+
+
+def test_storability_rules():
+    assert is_storable({}, {"Vary": "Accept-Encoding"}) is True
+    assert is_storable({}, {"Vary": "Cookie"}) is False
+    assert is_storable({}, {"Cache-Control": "no-store"}) is False
+    assert is_storable({}, {"Set-Cookie": "a=b"}) is False
+    assert is_storable({"Authorization": "Bearer x"}, {}) is False
+
+
+def test_forced_reloads_bypass_the_cache():
+    assert bypasses_cache("GET", {}) is False
+    assert bypasses_cache("POST", {}) is True
+    assert bypasses_cache("GET", {"Cache-Control": "no-cache"}) is True
+    assert bypasses_cache("GET", {"Pragma": "no-cache"}) is True
+
+
+def _stored(tmp_path, **response_headers):
+    path = tmp_path / "pic.png"
+    path.write_bytes(b"PNGDATA")
+    cache = ArchiveCache()
+    cache.store("http://x.com/pic.png", path, "image/png", {},
+                {"Cache-Control": "max-age=600", **response_headers})
+    return cache
+
+
+def test_hit_serves_body_with_headers(tmp_path):
+    entry = _stored(tmp_path, ETag='"v1"').lookup("http://X.com/pic.png")
+    status, body, headers = cached_response(entry, {})
+    assert (status, body) == (200, b"PNGDATA")
+    assert headers["Content-Type"] == "image/png"
+    assert headers["ETag"] == '"v1"'
+    assert headers["Content-Length"] == "7"
+
+
+def test_files_over_the_serve_limit_go_upstream(tmp_path):
+    entry = _stored(tmp_path, ETag='"v1"').lookup("http://x.com/pic.png")
+    assert cached_response(entry, {}, max_bytes=6) is None
+    assert cached_response(entry, {"If-None-Match": '"v1"'}, max_bytes=6)[0] == 304
+
+
+def test_conditional_request_gets_304(tmp_path):
+    entry = _stored(tmp_path, ETag='"v1"').lookup("http://x.com/pic.png")
+    status, body, _ = cached_response(entry, {"If-None-Match": '"v0", "v1"'})
+    assert (status, body) == (304, b"")
+
+
+def test_missing_file_or_unreusable_response_is_a_miss(tmp_path):
+    cache = _stored(tmp_path)
+    (tmp_path / "pic.png").unlink()
+    assert cache.lookup("http://x.com/pic.png") is None
+
+    cache.store("http://x.com/other.png", tmp_path / "other.png", "image/png", {}, {})
+    assert len(cache) == 0  # no freshness information
+
+
+def test_hit_counts_its_age_against_the_full_lifetime(tmp_path):
+    entry = _stored(tmp_path).lookup("http://x.com/pic.png")
+    entry.stored_at -= 100
+    entry.expires_at -= 100
+    _, _, headers = cached_response(entry, {})
+    assert freshness_lifetime(headers) in (499, 500)
@@ -0,0 +1,52 @@
+"""Import-time budget for the modules mitmdump loads on every proxy start."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parents[2] / "src"
+
+# Generous enough for a cold Windows CI runner; a regression that pulls
+# mitmproxy, Pillow or requests back in at import time blows well past it.
+IMPORT_BUDGET_SECONDS = 0.5
+
+HEAVY_MODULES = ("PIL", "filetype", "requests", "watchdog", "mitmproxy")
+
+LIGHT_MODULES = (
+    "tzMCP.cli",
+    "tzMCP.save_media",
+    "tzMCP.save_media_utils.save_media_utils",
+    "tzMCP.save_media_utils.hash_tracker",
+)
+
+
+def _run(tmp_path, *args):
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR), TZMCP_DATA_DIR=str(tmp_path))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True,
+                          env=env, check=True, timeout=60)
+
+
+def _cumulative_import_seconds(importtime_output: str, module: str) -> float:
+    """Parse ``-X importtime`` output: ``import time: self | cumulative | name``."""
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1_000_000
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_module_imports_within_budget(tmp_path, module):
+    result = _run(tmp_path, "-X", "importtime", "-c", f"import {module}")
+    assert _cumulative_import_seconds(result.stderr, module) < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_module_defers_heavy_dependencies(tmp_path, module):
+    probe = (f"import sys, {module}; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    assert _run(tmp_path, "-c", probe).stdout.strip() == ""
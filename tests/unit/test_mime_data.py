@@ -0,0 +1,26 @@
+from tzMCP.save_media_utils import mime_categories, mime_data_minimal
+
+
+def test_table_maps_mime_to_extensions_in_order():
+    table = mime_data_minimal.mime_to_extensions()
+    assert table["image/png"][0] == ".png"
+    assert table["application/octet-stream"][0] == ".bin"
+
+
+def test_extension_index_is_inverted_table():
+    index = mime_data_minimal.extension_to_mime()
+    assert index[".png"] == "image/png"
+    assert index[".pdf"] == "application/pdf"
+
+
+def test_legacy_module_attributes_resolve_lazily():
+    assert mime_data_minimal.MIME_TO_EXTENSIONS is mime_data_minimal.mime_to_extensions()
+    assert "image/png" in mime_categories.IMAGE_TYPES
+    assert set(mime_categories.MIME_GROUPS) == set(mime_categories.MIME_GROUP_NAMES)
+
+
+def test_allowed_mime_types_unions_selected_groups():
+    allowed = mime_categories.allowed_mime_types(("image", "document"))
+    assert "image/png" in allowed
+    assert "application/pdf" in allowed
+    assert "video/mp4" not in allowed
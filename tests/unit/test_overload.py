@@ -0,0 +1,34 @@
+from tzMCP.save_media_utils.overload import Backpressure, NORMAL, DEGRADED, SATURATED
+
+
+def _backpressure(load):
+    return Backpressure(lambda: load[0], degrade_at=0.5, passthrough_at=1.0,
+                        shed_mime_groups=["video"], skip_stages=["pixel_dimensions"])
+
+
+def test_levels_follow_pressure_with_hysteresis():
+    load = [0.1]
+    bp = _backpressure(load)
+    assert bp.level() == NORMAL
+    load[0] = 0.6
+    assert bp.level() == DEGRADED
+    load[0] = 0.45                    # Below degrade_at but above 80% of it.
+    assert bp.level() == DEGRADED
+    load[0] = 1.2
+    assert bp.level() == SATURATED
+    load[0] = 0.9
+    assert bp.level() == SATURATED
+    load[0] = 0.7
+    assert bp.level() == DEGRADED
+    load[0] = 0.3
+    assert bp.level() == NORMAL
+    assert bp.stats()["events"] == 2
+
+
+def test_shed_counts_are_reported():
+    bp = _backpressure([0.0])
+    assert bp.sheds_group("video") and not bp.sheds_group("image")
+    bp.shed("mime:video")
+    bp.shed("mime:video")
+    bp.shed("passthrough")
+    assert bp.stats() == {"level": NORMAL, "events": 0, "shed": {"mime:video": 2, "passthrough": 1}}
@@ -0,0 +1,64 @@
+import gzip
+import tarfile
+
+from tzMCP.save_media_utils import pack_store
+from tzMCP.save_media_utils.pack_store import (
+    PackWriter, export_warc, extract, index_path, iter_members, read_saved, saved_exists, segments
+)
+
+
+def _write(directory, objects, segment_bytes=pack_store.DEFAULT_SEGMENT_BYTES):
+    writer = PackWriter(directory, segment_bytes)
+    refs = [writer.append(name, data, f"http://site.com/{name}", "image/png", name * 4) for name, data in objects]
+    writer.close()
+    return refs
+
+
+def test_refs_read_back_and_segments_are_plain_tar(tmp_path):
+    refs = _write(tmp_path, [("a.png", b"alpha"), ("b.png", b"b" * 1000)])
+    assert [read_saved(r) for r in refs] == [b"alpha", b"b" * 1000]
+    assert saved_exists(refs[0]) and not saved_exists(refs[0].replace("#", "x.tar#"))
+
+    [segment] = segments(tmp_path)
+    with tarfile.open(segment) as tar:
+        members = tar.getmembers()
+        assert [m.name for m in members] == ["a.png", "b.png"]
+        assert tar.extractfile(members[1]).read() == b"b" * 1000
+        assert members[0].pax_headers[pack_store.PAX_URL] == "http://site.com/a.png"
+
+
+def test_segments_rotate_at_size_limit(tmp_path):
+    _write(tmp_path, [(f"{i}.png", b"x" * 3000) for i in range(4)], segment_bytes=10_000)
+    assert len(segments(tmp_path)) == 2
+    assert [m.name for m in iter_members(tmp_path)] == ["0.png", "1.png", "2.png", "3.png"]
+
+
+def test_missing_or_stale_sidecar_falls_back_to_the_tar(tmp_path):
+    refs = _write(tmp_path, [("a.png", b"alpha"), ("b.png", b"bravo")])
+    [segment] = segments(tmp_path)
+    index = index_path(segment)
+
+    lines = index.read_text().splitlines(keepends=True)
+    index.write_text(lines[0])                     # Crash between data and sidecar append.
+    assert [m.ref for m in iter_members(tmp_path)] == refs
+
+    index.unlink()
+    members = list(iter_members(tmp_path))
+    assert [(m.name, m.url, m.digest) for m in members] == [
+        ("a.png", "http://site.com/a.png", "a.png" * 4), ("b.png", "http://site.com/b.png", "b.png" * 4)]
+    assert index.exists()
+
+
+def test_extract_and_warc_export(tmp_path):
+    _write(tmp_path / "packs", [("a.png", b"alpha"), ("a.png", b"again")])
+    members = list(iter_members(tmp_path / "packs"))
+
+    assert extract(members, tmp_path / "out") == 2
+    assert (tmp_path / "out" / "a.png").read_bytes() == b"alpha"
+    assert (tmp_path / "out" / "a_1.png").read_bytes() == b"again"
+
+    assert export_warc(members, tmp_path / "out.warc.gz") == 2
+    warc = gzip.decompress((tmp_path / "out.warc.gz").read_bytes())
+    assert warc.count(b"WARC/1.0\r\n") == 3
+    assert b"WARC-Target-URI: http://site.com/a.png\r\n" in warc
+    assert b"Content-Length: 5\r\n\r\nagain\r\n\r\n" in warc
@@ -1,5 +1,5 @@
 from tzMCP.gui_bits.config_manager import Config, ConfigManager
-from tzMCP.paths import config_dir, data_dir, logs_dir, profiles_dir
+from tzMCP.paths import config_dir, data_dir, logs_dir, profiles_dir, thumbnails_dir
 
 
 def test_runtime_paths_use_configured_data_directory(tmp_path, monkeypatch):
@@ -10,6 +10,7 @@ def test_runtime_paths_use_configured_data_directory(tmp_path, monkeypatch):
     assert config_dir() == expected / "config"
     assert logs_dir() == expected / "logs"
     assert profiles_dir() == expected / "profiles"
+    assert thumbnails_dir() == expected / "thumbnails"
 
 
 def test_config_defaults_and_location_use_data_directory(tmp_path, monkeypatch):
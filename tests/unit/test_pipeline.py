@@ -0,0 +1,76 @@
+from tzMCP.save_media_utils.pipeline import CheckPipeline, FlowContext, Stage
+
+
+class _FakeStage(Stage):
+    def __init__(self, name, rejects, cost=0.0):
+        super().__init__()
+        self.name = name
+        self._rejects = rejects
+        self._cost = cost
+
+    def check(self, ctx):
+        return self._rejects
+
+    def run(self, ctx):
+        rejected = super().run(ctx)
+        self.seconds += self._cost  # deterministic "measured" cost
+        return rejected
+
+
+def test_flow_context_parses_url_once():
+    ctx = FlowContext(url="https://CDN.Example.com/img/pic.png?token=abc", content=b"x" * 10)
+    assert ctx.host == "cdn.example.com"
+    assert ctx.path == "/img/pic.png"
+    assert ctx.basename == "pic.png"
+    assert ctx.size == 10
+    assert "abc" not in ctx.safe_url
+
+
+def test_cheap_rejection_does_not_sniff_content(isolated_config):
+    isolated_config(filter_file_size={"enabled": True, "min_bytes": 100, "max_bytes": 1000})
+    ctx = FlowContext(url="http://site.com/pic", content=b"tiny")
+    assert CheckPipeline.default().rejects(ctx) is True
+    assert "mime_and_ext" not in ctx.__dict__
+
+
+def test_accepted_flow_runs_every_stage(isolated_config, make_png):
+    isolated_config(allowed_mime_groups=["image"], whitelist=[], blacklist=[],
+                    filter_file_size={"enabled": True, "min_bytes": 0, "max_bytes": 10_000_000},
+                    filter_pixel_dimensions={})
+    pipeline = CheckPipeline.default()
+    ctx = FlowContext(url="http://site.com/pic.png", content=make_png(50, 50))
+    assert pipeline.rejects(ctx) is False
+    assert all(stats["calls"] == 1 for stats in pipeline.stats().values())
+
+
+def test_reorder_moves_cheap_frequent_rejector_first():
+    slow_pass = _FakeStage("slow_pass", rejects=False, cost=0.01)
+    cheap_reject = _FakeStage("cheap_reject", rejects=True, cost=0.0001)
+    pipeline = CheckPipeline([slow_pass, cheap_reject], reorder_every=0)
+    ctx = FlowContext(url="http://x/y", content=b"")
+    for _ in range(10):
+        pipeline.rejects(ctx)
+    pipeline.reorder()
+    assert [stage.name for stage in pipeline.stages] == ["cheap_reject", "slow_pass"]
+    assert cheap_reject.calls == 5  # stats decay after each reorder
+
+
+def test_unmeasured_stage_gets_a_neutral_rank():
+    slow_pass = _FakeStage("slow_pass", rejects=False, cost=0.01)
+    cheap_reject = _FakeStage("cheap_reject", rejects=True, cost=0.0001)
+    unreached = _FakeStage("unreached", rejects=False)
+    pipeline = CheckPipeline([slow_pass, cheap_reject, unreached], reorder_every=0)
+    ctx = FlowContext(url="http://x/y", content=b"")
+    for _ in range(10):
+        pipeline.rejects(ctx)
+    assert unreached.rank is None
+    pipeline.reorder()
+    assert [stage.name for stage in pipeline.stages] == ["cheap_reject", "unreached", "slow_pass"]
+
+
+def test_skipped_stages_are_not_run():
+    veto = _FakeStage("veto", rejects=True)
+    pipeline = CheckPipeline([veto], reorder_every=0)
+    ctx = FlowContext(url="http://x/y", content=b"")
+    assert pipeline.rejects(ctx, skip=frozenset({"veto"})) is False
+    assert veto.calls == 0
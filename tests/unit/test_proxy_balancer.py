@@ -0,0 +1,185 @@
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+from tzMCP.gui_bits import proxy_control
+from tzMCP.gui_bits.proxy_balancer import TcpBalancer
+from tzMCP.gui_bits.proxy_control import ProxyController, _free_loopback_port
+
+
+def _tagged_echo_server(tag: bytes):
+    """A loopback server that answers each connection with ``tag`` + the bytes it received."""
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                data = conn.recv(1024)
+                if data:
+                    conn.sendall(tag + data)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server, port
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _roundtrip(port: int, payload: bytes) -> bytes:
+    with socket.create_connection(("127.0.0.1", port), timeout=2) as sock:
+        sock.sendall(payload)
+        return sock.recv(1024)
+
+
+def test_balancer_relays_to_healthy_workers_and_skips_dead_ones():
+    server_a, port_a = _tagged_echo_server(b"A:")
+    dead_port = _free_loopback_port()
+    balancer = TcpBalancer(_free_loopback_port(), [port_a, dead_port])
+    balancer.start()
+    try:
+        assert _wait_for(lambda: balancer.stats()["healthy"] == 1)
+        for _ in range(3):
+            assert _roundtrip(balancer.listen_port, b"ping") == b"A:ping"
+        stats = balancer.stats()
+        assert stats["workers"] == 2
+        assert stats["total"] == 3
+    finally:
+        balancer.stop()
+        server_a.close()
+
+
+def test_client_half_close_still_gets_the_reply():
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def answer_after_eof():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                received = b""
+                while chunk := conn.recv(1024):
+                    received += chunk
+                if received:
+                    conn.sendall(b"got:" + received)
+
+    threading.Thread(target=answer_after_eof, daemon=True).start()
+    balancer = TcpBalancer(_free_loopback_port(), [server.getsockname()[1]])
+    balancer.start()
+    try:
+        with socket.create_connection(("127.0.0.1", balancer.listen_port), timeout=2) as sock:
+            sock.sendall(b"request")
+            sock.shutdown(socket.SHUT_WR)
+            reply = b""
+            while chunk := sock.recv(1024):
+                reply += chunk
+        assert reply == b"got:request"
+    finally:
+        balancer.stop()
+        server.close()
+
+
+def test_clients_wait_for_a_worker_that_is_still_starting():
+    port = _free_loopback_port()
+    balancer = TcpBalancer(_free_loopback_port(), [port])
+    balancer.start()
+    servers = []
+
+    def start_late():
+        time.sleep(0.3)
+        server = socket.create_server(("127.0.0.1", port))
+        servers.append(server)
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                if data := conn.recv(1024):
+                    conn.sendall(b"B:" + data)
+
+    threading.Thread(target=start_late, daemon=True).start()
+    try:
+        assert _roundtrip(balancer.listen_port, b"early") == b"B:early"
+    finally:
+        balancer.stop()
+        for server in servers:
+            server.close()
+
+
+def test_pick_prefers_least_loaded_backend():
+    balancer = TcpBalancer(0, [1, 2, 3])
+    for backend, active in zip(balancer.backends, (4, 1, 2)):
+        backend.healthy = True
+        backend.active = active
+    assert balancer.pick().port == 2
+    balancer.backends[1].healthy = False
+    assert balancer.pick().port == 3
+
+
+def test_controller_restarts_exited_workers(monkeypatch):
+    launched = []
+    monkeypatch.setattr(ProxyController, "_launch",
+                        lambda self, port: launched.append(port) or SimpleNamespace(poll=lambda: None))
+    controller = ProxyController("save_media.py", proxy_port=1, workers=2)
+    controller.worker_processes = {
+        10: SimpleNamespace(poll=lambda: None),
+        11: SimpleNamespace(poll=lambda: 1, returncode=1),
+    }
+    assert controller._ensure_worker(10) is False
+    assert controller._ensure_worker(11) is True
+    assert launched == [11]
+
+
+def test_crashing_worker_restarts_back_off(monkeypatch):
+    launched = []
+    clock = [1000.0]
+    monkeypatch.setattr(proxy_control.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(ProxyController, "_launch",
+                        lambda self, port: launched.append(clock[0]) or SimpleNamespace(poll=lambda: 1, returncode=1))
+    controller = ProxyController("save_media.py", proxy_port=1, workers=2)
+    controller.worker_processes = {10: SimpleNamespace(poll=lambda: 1, returncode=1)}
+    while clock[0] < 1030:
+        controller._ensure_worker(10)
+        clock[0] += 1
+    assert launched == [1000, 1002, 1006, 1014]
+
+    clock[0] = launched[-1] + proxy_control.WORKER_STABLE_AFTER    # Stayed up long enough: no wait.
+    assert controller._ensure_worker(10) is True
+
+
+def test_controller_starts_pool_behind_balancer(monkeypatch):
+    monkeypatch.setattr(ProxyController, "_launch", lambda self, port: SimpleNamespace(
+        poll=lambda: None, terminate=lambda: None, returncode=0))
+    started = []
+
+    class FakeBalancer:
+        def __init__(self, listen_port, ports, check_worker=None):
+            started.append((listen_port, ports))
+        def start(self):
+            pass
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(proxy_control, "TcpBalancer", FakeBalancer)
+    controller = ProxyController("save_media.py", proxy_port=_free_loopback_port(), workers=3)
+    controller.start_proxy()
+    assert controller.is_running()
+    assert len(controller.worker_processes) == 3
+    assert started == [(controller.proxy_port, list(controller.worker_processes))]
+    controller.stop_proxy()
+    assert not controller.is_running()
+    assert controller.worker_processes == {}
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+from tzMCP.save_media_utils.rate_limit import TokenBucket, WriteThrottle
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _job(host, size):
+    return SimpleNamespace(host=host, size=size)
+
+
+def test_bucket_allows_bursts_then_paces_by_rate():
+    bucket = TokenBucket(rate=100, burst=100, now=0)
+    assert bucket.charge(100, 0) == 0
+    assert bucket.charge(50, 0) == 0.5
+    assert bucket.wait_time(0.5) == 0
+    assert bucket.full(2.0)
+
+
+def test_global_limit_sleeps_off_debt_before_the_next_write():
+    clock = _Clock()
+    throttle = WriteThrottle(global_rate=64 * 1024, clock=clock, sleep=clock.sleep)
+    throttle.acquire(_job("a", 64 * 1024 * 3))     # Written at once, leaving two seconds of debt.
+    throttle.acquire(_job("a", 10))
+    assert clock.slept == [2.0]
+    assert throttle.stats()["throttled_seconds"] == 2.0
+
+
+def test_domain_limit_holds_back_only_that_domain():
+    clock = _Clock()
+    throttle = WriteThrottle(domain_rate=64 * 1024, clock=clock, sleep=clock.sleep)
+    throttle.acquire(_job("big.example", 64 * 1024 * 3))
+    assert not throttle.ready(_job("big.example", 1))
+    assert throttle.ready(_job("small.example", 1))
+    clock.now = 2.0
+    assert throttle.ready(_job("big.example", 1))
+    assert throttle.stats()["domain_throttled_seconds"] == {"big.example": 2.0}
+    assert clock.slept == []
+
+
+def test_unlimited_throttle_never_waits():
+    throttle = WriteThrottle(sleep=lambda s: (_ for _ in ()).throw(AssertionError("slept")))
+    throttle.acquire(_job("a", 10 ** 9))
+    assert throttle.ready(_job("a", 1))
+
+
+def test_a_large_file_is_paced_chunk_by_chunk(tmp_path):
+    from tzMCP.save_media_utils.save_media_utils import WRITE_CHUNK, atomic_save
+    clock = _Clock()
+    throttle = WriteThrottle(global_rate=WRITE_CHUNK, clock=clock, sleep=clock.sleep)
+    job = _job("a", 4 * WRITE_CHUNK)
+    path = atomic_save(b"x" * job.size, tmp_path / "big.bin", job.size,
+                       pace=lambda nbytes: throttle.acquire(job, nbytes))
+    assert path.stat().st_size == job.size
+    assert clock.slept == [1.0, 1.0]    # The burst covers two chunks; each later one waits.
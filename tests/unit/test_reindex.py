@@ -0,0 +1,74 @@
+import hashlib
+import os
+
+from tzMCP.save_media_utils import reindex
+from tzMCP.save_media_utils.dedup_store import SqliteDedupStore, ShardedDedupStore
+
+
+def _populate(root):
+    (root / "sub").mkdir(parents=True)
+    (root / "a.jpg").write_bytes(b"alpha")
+    (root / "sub" / "b.png").write_bytes(b"bravo")
+    (root / "sub" / "copy.png").write_bytes(b"alpha")
+    (root / ".tzmcp_dedup.sqlite").write_bytes(b"not media")
+
+
+def test_iter_files_walks_tree_and_skips_dot_entries(tmp_path):
+    _populate(tmp_path)
+    found = {os.path.relpath(path, tmp_path) for path, _, _ in reindex.iter_files(tmp_path)}
+    assert found == {"a.jpg", os.path.join("sub", "b.png"), os.path.join("sub", "copy.png")}
+
+
+def test_hash_file_matches_sha256(tmp_path):
+    (tmp_path / "f").write_bytes(b"payload")
+    (tmp_path / "empty").write_bytes(b"")
+    assert reindex.hash_file(str(tmp_path / "f")) == hashlib.sha256(b"payload").hexdigest()
+    assert reindex.hash_file(str(tmp_path / "empty")) == hashlib.sha256(b"").hexdigest()
+    assert reindex.hash_file(str(tmp_path / "missing")) is None
+
+
+def test_reindex_adds_digests_and_skips_unchanged_files(tmp_path):
+    save_dir = tmp_path / "media"
+    _populate(save_dir)
+    store = SqliteDedupStore(tmp_path / "hashes.sqlite")
+    try:
+        stats = reindex.reindex(save_dir, store, workers=2)
+        assert (stats.scanned, stats.hashed, stats.added) == (3, 3, 2)
+        assert store.contains(hashlib.sha256(b"bravo").hexdigest())
+
+        again = reindex.reindex(save_dir, store, workers=2)
+        assert (again.unchanged, again.hashed) == (3, 0)
+
+        (save_dir / "a.jpg").write_bytes(b"alpha, edited")
+        os.utime(save_dir / "a.jpg", ns=(1, 1))
+        changed = reindex.reindex(save_dir, store, workers=2)
+        assert (changed.hashed, changed.added) == (1, 1)
+    finally:
+        store.close()
+
+
+def test_reindex_routes_digests_to_shards(tmp_path):
+    save_dir = tmp_path / "media"
+    _populate(save_dir)
+    store = ShardedDedupStore(tmp_path / "hashes.sqlite", 3)
+    try:
+        assert reindex.reindex(save_dir, store, workers=1).added == 2
+        assert store.contains(hashlib.sha256(b"alpha").hexdigest())
+    finally:
+        store.close()
+
+
+def test_reindex_adds_packed_digests_without_reading_them(tmp_path):
+    from tzMCP.save_media_utils.pack_store import PackWriter, pack_dir
+
+    save_dir = tmp_path / "media"
+    writer = PackWriter(pack_dir(save_dir))
+    writer.append("p.png", b"packed", digest=hashlib.sha256(b"packed").hexdigest())
+    writer.close()
+    store = SqliteDedupStore(tmp_path / "hashes.sqlite")
+    try:
+        stats = reindex.reindex(save_dir, store, workers=1)
+        assert (stats.scanned, stats.packed, stats.added) == (0, 1, 1)
+        assert store.contains(hashlib.sha256(b"packed").hexdigest())
+    finally:
+        store.close()
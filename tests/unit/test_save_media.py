@@ -0,0 +1,46 @@
+from tzMCP import save_media
+from tzMCP.save_media_utils import hash_tracker
+
+
+def test_constructing_addon_has_no_side_effects(tmp_path, monkeypatch):
+    monkeypatch.setenv("TZMCP_DATA_DIR", str(tmp_path / "data"))
+    saver = save_media.MediaSaver()
+    assert not (tmp_path / "data").exists()
+    assert saver._observer is None
+    assert hash_tracker._db is None
+
+
+def test_make_addons_returns_one_inert_instance(tmp_path, monkeypatch):
+    monkeypatch.setenv("TZMCP_DATA_DIR", str(tmp_path / "data"))
+    addons = save_media.make_addons()
+    assert len(addons) == 1
+    assert isinstance(addons[0], save_media.MediaSaver)
+    assert addons[0]._started is False
+
+
+def test_running_starts_up_exactly_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("TZMCP_DATA_DIR", str(tmp_path / "data"))
+    calls = []
+    monkeypatch.setattr(save_media, "init_hash_db", lambda persist, *args, **kwargs: calls.append(persist))
+    saver = save_media.MediaSaver()
+    monkeypatch.setattr(saver, "_start_passthrough", lambda: None)  # needs a live mitmproxy
+
+    saver.running()
+    saver.running()
+    assert len(calls) == 1
+
+    saver.done()
+    assert saver._started is False
+
+
+def test_config_reload_clears_host_verdicts(tmp_path, monkeypatch, write_config_file):
+    monkeypatch.setenv("TZMCP_DATA_DIR", str(tmp_path / "data"))
+    path = write_config_file({"save_dir": str(tmp_path / "cache"), "blacklist": []})
+    saver = save_media.MediaSaver()
+    saver.cfg_manager = save_media.ConfigManager(path)
+    saver._load_config()
+    assert saver.host_verdicts.verdict("tracker.net") is None
+
+    write_config_file({"save_dir": str(tmp_path / "cache"), "blacklist": ["tracker.net"]})
+    saver._load_config()
+    assert saver.host_verdicts.verdict("tracker.net") == "blacklist"
@@ -262,8 +262,8 @@ def test_atomic_save_collision_suffix(isolated_config):
     cfg = isolated_config()
     cfg.save_dir.mkdir(parents=True, exist_ok=True)
     target = cfg.save_dir / "out.txt"
-    smu.atomic_save(b"first", target, 5)
-    smu.atomic_save(b"second", target, 6)
+    assert smu.atomic_save(b"first", target, 5) == target
+    assert smu.atomic_save(b"second", target, 6) == cfg.save_dir / "out_1.txt"
     assert (cfg.save_dir / "out.txt").read_bytes() == b"first"
     assert (cfg.save_dir / "out_1.txt").read_bytes() == b"second"
 
@@ -0,0 +1,84 @@
+import threading
+from types import SimpleNamespace
+
+from tzMCP.save_media_utils.scheduler import SaveScheduler
+
+
+def _job(host, mime, size, name=""):
+    return SimpleNamespace(host=host, mime=mime, size=size, name=name)
+
+
+def _drain(scheduler):
+    scheduler.close()
+    jobs = []
+    while (job := scheduler.get()) is not None:
+        jobs.append(job)
+    return jobs
+
+
+def test_jobs_are_classified_by_group_and_size():
+    scheduler = SaveScheduler()
+    assert scheduler.classify(_job("a", "image/png", 10_000)) == "small_images"
+    assert scheduler.classify(_job("a", "image/png", 10_000_000)) == "images"
+    assert scheduler.classify(_job("a", "video/mp4", 10_000)) == "video_audio"
+    assert scheduler.classify(_job("a", "application/x-unknown", 10)) == "other"
+
+
+def test_a_catch_all_class_is_always_present():
+    scheduler = SaveScheduler([{"name": "images", "groups": ["image"], "weight": 3}])
+    assert scheduler.classify(_job("a", "video/mp4", 10)) == "other"
+
+
+def test_classes_share_bandwidth_by_weight():
+    scheduler = SaveScheduler([{"name": "fast", "groups": ["image"], "weight": 2},
+                               {"name": "slow", "groups": [], "weight": 1}], quantum=100)
+    for i in range(6):
+        scheduler.put(_job("a", "video/mp4", 100, f"v{i}"))
+        scheduler.put(_job("a", "image/png", 100, f"i{i}"))
+    order = [job.name[0] for job in _drain(scheduler)]
+    assert order[:9] == ["v", "i", "i", "v", "i", "i", "v", "i", "i"]
+    assert scheduler.stats()["served"] == {"fast": 6, "slow": 6}
+
+
+def test_a_busy_domain_does_not_starve_others_in_its_class():
+    scheduler = SaveScheduler(quantum=1024 * 1024)
+    for i in range(5):
+        scheduler.put(_job("videos.example", "video/mp4", 300 * 1024 * 1024, f"big{i}"))
+    scheduler.put(_job("other.example", "video/mp4", 2 * 1024 * 1024, "small"))
+    names = [job.name for job in _drain(scheduler)]
+    assert names.index("small") <= 1
+
+
+def test_small_images_overtake_queued_videos():
+    scheduler = SaveScheduler()
+    for i in range(3):
+        scheduler.put(_job("videos.example", "video/mp4", 200 * 1024 * 1024, f"video{i}"))
+    scheduler.put(_job("pics.example", "image/jpeg", 50_000, "thumb"))
+    assert _drain(scheduler)[0].name == "thumb"
+
+
+def test_get_blocks_until_a_job_arrives_and_returns_none_when_closed():
+    scheduler = SaveScheduler()
+    got = []
+    thread = threading.Thread(target=lambda: got.extend([scheduler.get(), scheduler.get()]))
+    thread.start()
+    scheduler.put(_job("a", "image/png", 1, "only"))
+    scheduler.close()
+    thread.join(5)
+    assert [getattr(job, "name", None) for job in got] == ["only", None]
+
+
+def test_jobs_that_are_not_ready_are_passed_over():
+    blocked = {"slow.example"}
+    scheduler = SaveScheduler(ready=lambda job: job.host not in blocked)
+    scheduler.put(_job("slow.example", "image/png", 10, "slow"))
+    scheduler.put(_job("fast.example", "image/png", 10, "fast"))
+    assert scheduler.get().name == "fast"
+    blocked.clear()
+    assert scheduler.get().name == "slow"
+
+
+def test_close_flushes_jobs_that_are_not_ready():
+    scheduler = SaveScheduler(ready=lambda job: False)
+    scheduler.put(_job("a", "image/png", 10, "held"))
+    assert [job.name for job in _drain(scheduler)] == ["held"]
@@ -0,0 +1,87 @@
+import threading
+
+from tzMCP.save_media_utils.save_queue import SaveJob, SaveWriter
+from tzMCP.save_media_utils.spool import SpoolJournal, read_journal
+
+
+def _job(tmp_path, body=b"body"):
+    return SaveJob(tmp_path / "out" / "f.bin", body, "http://a.com/f.bin", "a.com", "image/png", "d" * 64)
+
+
+def test_done_entries_are_not_replayed_and_torn_tail_is_ignored(tmp_path):
+    journal = SpoolJournal(tmp_path)
+    first = journal.append({"n": 1}, b"one")
+    journal.append({"n": 2}, b"two")
+    journal.done(first)
+    path = journal.path
+    journal.close()
+
+    with open(path, "ab") as f:
+        f.write(b"\x10\x00\x00\x00garbage")    # A record cut short by the crash.
+    [(meta, body)] = read_journal(path.read_bytes())
+    assert (meta["n"], body) == (2, b"two")
+
+
+def test_orphans_are_replayed_once_and_deleted(tmp_path):
+    crashed = SpoolJournal(tmp_path)
+    crashed.append({"n": 1}, b"one")
+    crashed.close()                            # Outstanding entry: the file stays.
+
+    live = SpoolJournal(tmp_path)
+    live.append({"n": 2}, b"two")              # Held by a running owner: never replayed.
+    replayed = []
+    assert SpoolJournal(tmp_path).replay_orphans(lambda meta, body: replayed.append(body)) == 1
+    assert replayed == [b"one"]
+    assert SpoolJournal(tmp_path).replay_orphans(lambda meta, body: replayed.append(body)) == 0
+    live.close()
+
+
+def test_finished_journals_are_removed(tmp_path):
+    journal = SpoolJournal(tmp_path, rotate_bytes=1)
+    for body in (b"a", b"b", b"c"):
+        journal.done(journal.append({}, body))
+    journal.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_writer_stores_in_background_and_marks_done(tmp_path):
+    journal = SpoolJournal(tmp_path / "spool")
+    gate = threading.Event()
+    stored = []
+
+    def store(job):
+        gate.wait(5)
+        stored.append(job.content)
+        return "where"
+    writer = SaveWriter(store, journal, on_saved=lambda job, path: stored.append(path))
+    writer.submit(_job(tmp_path))
+    assert writer.stats()["pending"] == 1 and writer.stats()["pending_bytes"] == 4
+    gate.set()
+    writer.close()
+    assert stored == [b"body", "where"]
+    assert writer.stats() == {"pending": 0, "pending_bytes": 0, "pending_memory": 0, "saved": 1, "failed": 0}
+    journal.close()
+    assert list((tmp_path / "spool").iterdir()) == []
+
+
+def test_spilled_jobs_are_not_counted_as_memory(tmp_path):
+    gate = threading.Event()
+    writer = SaveWriter(lambda job: gate.wait(5) and "where")
+    writer.submit(_job(tmp_path))
+    spilled = _job(tmp_path)
+    spilled.spill = str(tmp_path / "spill-1.part")    # Body is a mapped file, not heap.
+    writer.submit(spilled)
+    assert writer.stats()["pending_bytes"] == 8 and writer.stats()["pending_memory"] == 4
+    gate.set()
+    writer.close()
+    assert writer.stats()["pending_memory"] == 0
+
+
+def test_failed_saves_stay_in_the_spool(tmp_path):
+    journal = SpoolJournal(tmp_path / "spool")
+    writer = SaveWriter(lambda job: None, journal)
+    writer.submit(_job(tmp_path))
+    writer.close()
+    journal.close()
+    [(meta, body)] = read_journal(next((tmp_path / "spool").iterdir()).read_bytes())
+    assert SaveJob.from_meta(meta, body).save_path == tmp_path / "out" / "f.bin"
@@ -0,0 +1,111 @@
+import os
+import time
+
+from tzMCP.save_media_utils.file_lock import try_lock
+from tzMCP.save_media_utils.storage_quota import StorageManager, GB
+
+
+def _file(path, size, age):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_usage_is_scanned_once_then_tracked_incrementally(tmp_path):
+    _file(tmp_path / "a.png", 1000, 10)
+    _file(tmp_path / "sub" / "b.png", 500, 10)
+    _file(tmp_path / ".spool" / "journal-1.wal", 9999, 10)
+    manager = StorageManager(tmp_path).start()
+    try:
+        _until(lambda: manager.usage is not None)
+        assert manager.usage == 1500
+        manager.added(250)
+        assert manager.stats()["usage"] == 1750
+    finally:
+        manager.close()
+
+
+def test_oldest_saves_are_evicted_below_the_quota(tmp_path):
+    user_file = _file(tmp_path / "notes.txt", 100, 900)     # Not saved by tzMCP: never evicted.
+    old = _file(tmp_path / "old.png", 400, 300)
+    middle = _file(tmp_path / "middle.png", 400, 200)
+    new = _file(tmp_path / "new.png", 400, 100)
+    _file(tmp_path / ".tzmcp_catalog.sqlite", 100, 400)
+    saved = [str(p.resolve()) for p in (old, middle, new)] + [f"{tmp_path.resolve()}/.packs/pack-1.tar#0:10"]
+    evicted = []
+    manager = StorageManager(tmp_path, max_bytes=900, on_evicted=evicted.extend, saved_files=lambda: saved).start()
+    try:
+        _until(lambda: manager.usage is not None)
+        manager.added(0)
+        _until(lambda: manager.stats()["evicted_files"] == 2)
+    finally:
+        manager.close()
+    assert not old.exists() and not middle.exists() and new.exists() and user_file.exists()
+    assert (tmp_path / ".tzmcp_catalog.sqlite").exists()
+    assert evicted == [str(old.resolve()), str(middle.resolve())]
+    assert manager.usage == 600
+
+
+def test_locked_pack_segment_is_never_evicted(tmp_path):
+    packs = tmp_path / ".packs"
+    closed = _file(packs / "pack-1.tar", 600, 300)
+    _file(packs / "pack-1.tar.idx", 10, 300)
+    current = _file(packs / "pack-2.tar", 600, 400)
+    writer = open(current, "ab")     # As a PackWriter in any worker holds its open segment.
+    assert try_lock(writer)
+    manager = StorageManager(tmp_path, max_bytes=1000).start()
+    try:
+        _until(lambda: manager.usage is not None)
+        manager.added(0)
+        _until(lambda: manager.stats()["evicted_files"] == 1)
+    finally:
+        manager.close()
+        writer.close()
+    assert not closed.exists() and not (packs / "pack-1.tar.idx").exists() and current.exists()
+
+
+def test_workers_share_usage_and_one_evicts(tmp_path):
+    _file(tmp_path / "a.png", 1000, 10)
+    first = StorageManager(tmp_path, max_bytes=10_000).start()
+    _until(lambda: first.stats()["evictor"])
+    second = StorageManager(tmp_path, max_bytes=10_000).start()
+    try:
+        _until(lambda: second.usage is not None)
+        second.added(_file(tmp_path / "b.png", 500, 5).stat().st_size)
+        first.added(_file(tmp_path / "c.png", 250, 5).stat().st_size)
+        assert first.usage == 1750
+        assert not second.stats()["evictor"]
+    finally:
+        first.close()
+    try:
+        _until(lambda: second.stats()["evictor"])     # Takes over once the first one exits.
+        assert second.usage == 1750
+    finally:
+        second.close()
+
+
+def test_saves_stop_before_the_disk_fills(tmp_path):
+    manager = StorageManager(tmp_path, min_free=1024 * GB * 1024)   # More than any disk has.
+    assert not manager.admit(1)
+    assert manager.stats()["refused"] == 1
+
+
+def test_quota_without_eviction_refuses_saves(tmp_path):
+    _file(tmp_path / "a.png", 900, 10)
+    manager = StorageManager(tmp_path, max_bytes=1000, evict="none").start()
+    try:
+        _until(lambda: manager.usage is not None)
+        assert manager.admit(50)
+        assert not manager.admit(200)
+    finally:
+        manager.close()
+    assert (tmp_path / "a.png").exists()
@@ -0,0 +1,51 @@
+import threading
+from io import BytesIO
+
+from PIL import Image
+
+from tzMCP.gui_bits.thumbnails import NO_THUMBNAIL, ThumbnailCache, render_thumbnail, thumbnail_key
+
+
+def _request(cache, key, source):
+    done = threading.Event()
+    result = []
+    cache.request(key, source, lambda k, data: (result.append(data), done.set()))
+    assert done.wait(5)
+    return result[0]
+
+
+def test_render_thumbnail_fits_size(tmp_path, make_png):
+    source = tmp_path / "big.png"
+    source.write_bytes(make_png(800, 400))
+    with Image.open(BytesIO(render_thumbnail(source, 64))) as thumb:
+        assert thumb.size == (64, 32)
+
+
+def test_thumbnails_are_cached_on_disk_and_in_memory(tmp_path, make_png):
+    source = tmp_path / "pic.png"
+    source.write_bytes(make_png(300, 300))
+    cache = ThumbnailCache(tmp_path / "thumbs", size=32, memory_items=1)
+    try:
+        data = _request(cache, "ab" * 32, source)
+        assert cache.disk_path("ab" * 32).read_bytes() == data
+        assert cache.get("ab" * 32) == data
+
+        _request(cache, "cd" * 32, source)
+        assert cache.get("ab" * 32) is None           # Evicted from memory ...
+        source.unlink()
+        assert _request(cache, "ab" * 32, source) == data  # ... but still on disk.
+    finally:
+        cache.close()
+
+
+def test_non_images_are_remembered_without_a_thumbnail(tmp_path, not_an_image):
+    source = tmp_path / "clip.mp4"
+    source.write_bytes(not_an_image)
+    cache = ThumbnailCache(tmp_path / "thumbs")
+    try:
+        key = thumbnail_key(None, str(source))
+        assert _request(cache, key, source) == NO_THUMBNAIL
+        assert cache.get(key) == NO_THUMBNAIL
+        assert not cache.disk_path(key).exists()
+    finally:
+        cache.close()
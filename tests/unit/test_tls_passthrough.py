@@ -0,0 +1,83 @@
+import re
+
+from tzMCP.save_media_utils.tls_passthrough import HostStats, passthrough_patterns
+
+
+def _matches(patterns, address):
+    return any(re.search(p, address, re.IGNORECASE) for p in patterns)
+
+
+def test_record_reports_threshold_crossings(tmp_path):
+    stats = HostStats(tmp_path / "host_stats.json")
+    assert stats.record("t.net", saved=False, min_flows=2) is False
+    assert stats.record("t.net", saved=False, min_flows=2) is True   # now unproductive
+    assert stats.record("t.net", saved=False, min_flows=2) is False
+    assert stats.record("t.net", saved=True, min_flows=2) is True    # productive again
+    assert stats.unproductive_hosts(2) == []
+
+
+def test_stats_persist_under_same_filters(tmp_path, isolated_config):
+    cfg = isolated_config()
+    stats = HostStats(tmp_path / "host_stats.json")
+    stats.load(cfg)
+    stats.record("t.net", saved=False, min_flows=1)
+    stats.save()
+
+    reloaded = HostStats(tmp_path / "host_stats.json")
+    reloaded.load(cfg)
+    assert reloaded.unproductive_hosts(1) == ["t.net"]
+
+
+def test_stats_reset_when_filters_change(tmp_path, isolated_config):
+    cfg = isolated_config(allowed_mime_groups=["image"])
+    stats = HostStats(tmp_path / "host_stats.json")
+    stats.load(cfg)
+    stats.record("t.net", saved=False, min_flows=1)
+    cfg.allowed_mime_groups = ["image", "video"]
+    stats.sync(cfg)
+    assert stats.unproductive_hosts(1) == []
+
+
+def test_patterns_empty_when_disabled(tmp_path, isolated_config):
+    cfg = isolated_config(blacklist=["doubleclick.net"])
+    assert passthrough_patterns(cfg, HostStats(tmp_path / "s.json")) == ([], [])
+
+
+def test_patterns_cover_blacklist_unproductive_hosts_and_whitelist(tmp_path, isolated_config):
+    cfg = isolated_config(blacklist=["doubleclick.net", r"ads\..*"], whitelist=["example.com"],
+                          tls_passthrough={"enabled": True, "min_flows": 1})
+    stats = HostStats(tmp_path / "s.json")
+    stats.record("api.example.com", saved=False, min_flows=1)
+    ignore, allow = passthrough_patterns(cfg, stats)
+
+    assert _matches(ignore, "ad.doubleclick.net:443")
+    assert not _matches(ignore, "notdoubleclick.net:443")
+    assert _matches(ignore, "ads.tracker.com:443")
+    assert _matches(ignore, "api.example.com:443")
+    assert not _matches(ignore, "img.example.com:443")
+    assert _matches(allow, "img.example.com:443")
+    assert not _matches(allow, "other.org:443")
+
+
+def test_anchored_regex_entries_match_host_and_port(tmp_path, isolated_config):
+    cfg = isolated_config(blacklist=[r"tracker\.net$"], whitelist=[r"^img\d*\.example\.com$", r"cdn[$]"],
+                          tls_passthrough={"enabled": True})
+    ignore, allow = passthrough_patterns(cfg, HostStats(tmp_path / "s.json"))
+
+    assert _matches(ignore, "ads.tracker.net:443")
+    assert not _matches(ignore, "tracker.network:443")
+    assert _matches(allow, "img2.example.com:443")
+    assert _matches(allow, "img.example.com")
+    assert not _matches(allow, "img.example.com.evil.org:443")
+    assert allow[1] == "cdn[$]"
+
+
+def test_hosts_not_counted_for_a_while_are_forgotten(tmp_path):
+    stats = HostStats(tmp_path / "host_stats.json")
+    stats.record("tunnelled.net", saved=False, min_flows=1)
+    stats.record("busy.net", saved=True, min_flows=1)
+    stats.counts["tunnelled.net"][2] -= 3600       # No flows since it was tunnelled.
+    assert stats.expire(1800) is True
+    assert list(stats.counts) == ["busy.net"]
+    assert stats.unproductive_hosts(1) == []
+    assert stats.expire(0) is False
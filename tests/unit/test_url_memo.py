@@ -0,0 +1,58 @@
+import time
+
+from tzMCP.save_media_utils.url_memo import UrlMemo, normalize_url, DUPLICATE, SAVED
+
+HEADERS = {"ETag": '"abc"', "Content-Length": "10"}
+
+
+def test_normalize_url_folds_case_and_drops_fragment():
+    assert normalize_url("HTTP://Example.COM/Pic.png?a=1#top") == "http://example.com/Pic.png?a=1"
+
+
+def test_lookup_hits_only_with_matching_validators():
+    memo = UrlMemo()
+    memo.remember("http://x.com/a.png", HEADERS, SAVED, "/tmp/a.png")
+    assert memo.lookup("http://x.com/a.png", HEADERS).verdict == SAVED
+    assert memo.lookup("http://x.com/a.png", {"ETag": '"changed"', "Content-Length": "10"}) is None
+
+
+def test_responses_without_strong_validators_are_not_memoised():
+    memo = UrlMemo()
+    memo.remember("http://x.com/a.png", {"Content-Length": "10"}, DUPLICATE)
+    assert len(memo) == 0
+
+
+def test_entries_expire_and_lru_is_bounded():
+    memo = UrlMemo(max_entries=2, ttl_seconds=60)
+    for name in ("a", "b", "c"):
+        memo.remember(f"http://x.com/{name}", HEADERS, DUPLICATE)
+    assert memo.lookup("http://x.com/a", HEADERS) is None
+    memo._entries["http://x.com/c"].seen_at = time.time() - 120
+    assert memo.lookup("http://x.com/c", HEADERS) is None
+    assert memo.lookup("http://x.com/b", HEADERS) is not None
+
+
+def test_rows_roundtrip():
+    memo = UrlMemo()
+    memo.remember("http://x.com/a.png", HEADERS, SAVED, "/tmp/a.png")
+    restored = UrlMemo()
+    restored.load_rows(memo.rows())
+    assert restored.lookup("http://x.com/a.png", HEADERS).path == "/tmp/a.png"
+
+
+def test_only_changed_entries_are_taken_for_persisting():
+    memo = UrlMemo()
+    memo.remember("http://x.com/a.png", HEADERS, SAVED, "/tmp/a.png")
+    assert [row[0] for row in memo.take_dirty()] == ["http://x.com/a.png"]
+    memo.remember("http://x.com/b.png", HEADERS, DUPLICATE)
+    assert memo.unsaved == 1
+    assert [row[0] for row in memo.take_dirty()] == ["http://x.com/b.png"]
+    assert memo.take_dirty() == []
+
+
+def test_urls_with_credentials_are_never_persisted():
+    memo = UrlMemo()
+    memo.remember("http://x.com/a.png?session=s3cret", HEADERS, SAVED, "/tmp/a.png")
+    memo.remember("http://x.com/b.png?w=100", HEADERS, SAVED, "/tmp/b.png")
+    assert memo.lookup("http://x.com/a.png?session=s3cret", HEADERS) is not None
+    assert [row[0] for row in memo.take_dirty()] == ["http://x.com/b.png?w=100"]